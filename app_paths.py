@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+应用路径
+定位程序所在目录及数据文件位置
+"""
+
+import os
+import sys
+
+def get_app_dir():
+    # 打包后（PyInstaller）使用可执行文件所在目录，否则使用源码目录
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(os.path.abspath(sys.executable))
+    return os.path.dirname(os.path.abspath(__file__))
+
+def get_data_path(filename):
+    # 数据文件与程序放在一起
+    return os.path.join(get_app_dir(), filename)
\ No newline at end of file
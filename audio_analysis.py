@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音内容分析
+按块解码音频，计算每 20 毫秒一帧的能量（dBFS）和有声帧比例，用于识别空白录音、只有底噪或长时间静音的无效通话；
+WAV 直接读取，其他格式使用 register_decoder 注册的解码器（找到 ffmpeg 时默认注册）；
+用 NumPy 向量化计算；未安装 NumPy 时退回纯 Python 计算，结果相同
+"""
+
+import math
+import operator
+import os
+import shutil
+import subprocess
+import sys
+import wave
+from array import array
+from collections import namedtuple
+
+# 分析结果：有声帧比例、静音帧比例、平均能量、峰值帧能量（dBFS）
+AudioFeatures = namedtuple('AudioFeatures', ['voice_ratio', 'silence_ratio', 'mean_db', 'peak_db'])
+
+FRAME_SECONDS = 0.02
+CHUNK_FRAMES = 64 * 1024  # 每次解码的采样帧数
+SILENCE_DB = -50.0  # 低于此能量的帧视为静音
+VOICE_MARGIN_DB = 12.0  # 高出底噪这么多的帧视为有声
+NOISE_PERCENTILE = 0.1  # 底噪取能量排在 10% 处的帧
+MIN_POWER = 1e-10  # 避免 log(0)
+FLOOR_DB = -100.0  # 帧能量下限（全零帧）
+
+# 判为无效通话的阈值
+MIN_VOICE_RATIO = 0.1
+MIN_PEAK_DB = -40.0
+
+# 8 位 WAV 为无符号，翻转最高位即转成有符号
+FLIP_SIGN = bytes(value ^ 0x80 for value in range(256))
+ARRAY_TYPES = {1: 'b', 2: 'h', 4: 'i' if array('i').itemsize == 4 else 'l'}
+NUMPY_TYPES = {1: '<i1', 2: '<i2', 4: '<i4'}
+
+_numpy = None
+
+def load_numpy():
+    # 第一次分析时才导入 NumPy，未安装时返回 None
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def decode_wav(file_path):
+    # 解码器：先产出 (采样率, 声道数, 采样字节数)，之后逐块产出小端 PCM 数据
+    with wave.open(file_path, 'rb') as wav:
+        yield wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        while True:
+            data = wav.readframes(CHUNK_FRAMES)
+            if not data:
+                break
+            yield data
+
+def decode_ffmpeg(file_path):
+    # 由 ffmpeg 转成 8kHz 单声道 16 位 PCM，通话录音足够
+    process = subprocess.Popen(
+        [FFMPEG_PATH, '-v', 'error', '-i', file_path, '-f', 's16le', '-ac', '1', '-ar', '8000', '-'],
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    try:
+        yield 8000, 1, 2
+        while True:
+            data = process.stdout.read(CHUNK_FRAMES * 2)
+            if not data:
+                break
+            yield data
+        if process.wait() != 0:
+            raise OSError(f'ffmpeg 解码失败：{file_path}')
+    finally:
+        if process.poll() is None:
+            process.kill()  # 提前停止读取
+        process.stdout.close()
+        process.wait()
+
+# 扩展名 -> 解码器列表，依次尝试
+DECODERS = {'.wav': [decode_wav]}
+
+def register_decoder(extensions, decoder):
+    for extension in extensions:
+        DECODERS.setdefault(extension.lower(), []).append(decoder)
+
+FFMPEG_PATH = shutil.which('ffmpeg')
+if FFMPEG_PATH:
+    register_decoder(('.wav', '.amr', '.mp3', '.m4a'), decode_ffmpeg)
+
+class FrameMeter:
+    # 逐块累积每帧的能量；不满一帧的数据留到下一块
+    def __init__(self, sample_rate, channels, sample_width, numpy=None):
+        if sample_width not in ARRAY_TYPES:
+            raise ValueError(f'不支持 {sample_width * 8} 位采样')
+        self.sample_width = sample_width
+        self.frame_samples = max(1, int(sample_rate * FRAME_SECONDS)) * channels
+        self.frame_bytes = self.frame_samples * sample_width
+        self.full_scale_db = 20 * math.log10(2 ** (8 * sample_width - 1))
+        self.numpy = numpy
+        self.pending = b''
+        self.levels = []  # 每帧 dBFS
+
+    def feed(self, data):
+        data = self.pending + data
+        usable = len(data) - len(data) % self.frame_bytes
+        self.pending = data[usable:]
+        if usable:
+            self.levels.extend(self.frame_levels(data[:usable]))
+
+    def frame_levels(self, data):
+        if self.sample_width == 1:
+            data = data.translate(FLIP_SIGN)
+        if self.numpy is not None:
+            np = self.numpy
+            samples = np.frombuffer(data, dtype=NUMPY_TYPES[self.sample_width]).astype(np.float64)
+            power = np.square(samples).reshape(-1, self.frame_samples).mean(axis=1)
+            return np.maximum(10 * np.log10(np.maximum(power, MIN_POWER)) - self.full_scale_db, FLOOR_DB).tolist()
+        samples = array(ARRAY_TYPES[self.sample_width])
+        samples.frombytes(data)
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        n = self.frame_samples
+        levels = []
+        for start in range(0, len(samples), n):
+            frame = samples[start:start + n]
+            power = sum(map(operator.mul, frame, frame)) / n
+            levels.append(max(10 * math.log10(max(power, MIN_POWER)) - self.full_scale_db, FLOOR_DB))
+        return levels
+
+def summarize(levels):
+    # 由每帧能量得到 AudioFeatures；没有完整的一帧时视为全静音
+    if not levels:
+        return AudioFeatures(0.0, 1.0, FLOOR_DB, FLOOR_DB)
+    ordered = sorted(levels)
+    count = len(ordered)
+    noise_floor = ordered[int(count * NOISE_PERCENTILE)]
+    voice_threshold = max(noise_floor + VOICE_MARGIN_DB, SILENCE_DB)
+    voiced = sum(1 for level in levels if level > voice_threshold)
+    silent = sum(1 for level in levels if level <= SILENCE_DB)
+    mean_power = math.fsum(10 ** (level / 10) for level in levels) / count
+    return AudioFeatures(voiced / count, silent / count, 10 * math.log10(mean_power), ordered[-1])
+
+def analyze_file(file_path, numpy=None):
+    # 返回 AudioFeatures；没有可用的解码器或解码失败时返回 None
+    for decoder in DECODERS.get(os.path.splitext(file_path)[1].lower(), []):
+        stream = decoder(file_path)
+        try:
+            meter = FrameMeter(*next(stream), numpy=numpy)
+            for data in stream:
+                meter.feed(data)
+        except (OSError, EOFError, ValueError, wave.Error, StopIteration):
+            continue  # 换下一个解码器
+        finally:
+            stream.close()
+        return summarize(meter.levels)
+    return None
+
+def analyze_files(file_paths):
+    # 进程池任务：分析一批文件，返回 [(路径, AudioFeatures 或 None)]
+    numpy = load_numpy()
+    return [(file_path, analyze_file(file_path, numpy)) for file_path in file_paths]
+
+def is_empty_call(features):
+    # 几乎没有高出底噪的声音（空白、只有底噪、长时间静音）的录音
+    return features.voice_ratio < MIN_VOICE_RATIO or features.peak_db < MIN_PEAK_DB
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+音频时长解析
+直接读取 AMR 帧头和 M4A 的 mvhd/mdhd 原子计算时长，只读取需要的字节
+"""
+
+import mmap
+import struct
+
+# AMR 文件头
+AMR_NB_MAGIC = b'#!AMR\n'
+AMR_WB_MAGIC = b'#!AMR-WB\n'
+AMR_FRAME_SECONDS = 0.02  # 每帧 20 毫秒
+
+# 各帧类型（帧头第 3-6 位）的帧长，含 1 字节帧头；无数据帧只有帧头
+AMR_NB_FRAME_SIZES = (13, 14, 16, 18, 20, 21, 27, 32, 6, 1, 1, 1, 1, 1, 1, 1)
+AMR_WB_FRAME_SIZES = (18, 24, 33, 37, 41, 47, 51, 59, 61, 6, 1, 1, 1, 1, 1, 1)
+
+# 连续相同帧类型时一次比较这么多个帧头
+AMR_RUN_FRAMES = 32
+
+# 帧头字节 -> 帧长，省去每帧的位运算
+AMR_NB_HEADER_SIZES = [AMR_NB_FRAME_SIZES[(header >> 3) & 0x0F] for header in range(256)]
+AMR_WB_HEADER_SIZES = [AMR_WB_FRAME_SIZES[(header >> 3) & 0x0F] for header in range(256)]
+# 帧头字节 -> 一整段相同帧头
+AMR_RUNS = [bytes([header]) * AMR_RUN_FRAMES for header in range(256)]
+
+# moov 原子通常只有几十 KB，超过这个大小视为损坏
+MAX_MOOV_SIZE = 64 * 1024 * 1024
+
+def amr_duration(file_path):
+    # 逐帧读取帧头累计帧数；不是 AMR 文件时返回 None
+    with open(file_path, 'rb') as f:
+        head = f.read(len(AMR_WB_MAGIC))
+        if head.startswith(AMR_NB_MAGIC):
+            offset, sizes = len(AMR_NB_MAGIC), AMR_NB_HEADER_SIZES
+        elif head.startswith(AMR_WB_MAGIC):
+            offset, sizes = len(AMR_WB_MAGIC), AMR_WB_HEADER_SIZES
+        else:
+            return None
+        if f.seek(0, 2) <= offset:
+            return 0.0
+        # 帧长由帧头决定，只能顺序跳读；用 mmap 避免整份文件复制到内存
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = len(data)
+            frames = 0
+            while offset < end:
+                header = data[offset]
+                size = sizes[header]
+                # 固定码率的录音帧类型都相同，按帧长步进切片，一次确认一整段
+                run_end = offset + size * AMR_RUN_FRAMES
+                if run_end <= end and data[offset:run_end:size] == AMR_RUNS[header]:
+                    offset = run_end
+                    frames += AMR_RUN_FRAMES
+                    continue
+                # 帧类型有变化（如静音帧），逐帧前进这一段
+                for _ in range(AMR_RUN_FRAMES):
+                    if offset >= end:
+                        break
+                    offset += sizes[data[offset]]
+                    frames += 1
+    return frames * AMR_FRAME_SECONDS
+
+def iter_boxes(data, start, end):
+    # 遍历内存中 [start, end) 范围内的原子，返回 (类型, 内容起点, 内容终点)
+    while start + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, start)
+        header_size = 8
+        if size == 1:
+            if start + 16 > end:
+                return
+            size = struct.unpack_from('>Q', data, start + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - start
+        if size < header_size or start + size > end:
+            return
+        yield box_type, start + header_size, start + size
+        start += size
+
+def find_box(data, start, end, box_type):
+    for child_type, child_start, child_end in iter_boxes(data, start, end):
+        if child_type == box_type:
+            return child_start, child_end
+    return None
+
+def header_duration(data, start, end):
+    # mvhd/mdhd 共同的版本、时间刻度和时长字段；时长未知时返回 None
+    if end - start < 4:
+        return None
+    if data[start] == 1:
+        if end - start < 32:
+            return None
+        timescale, duration = struct.unpack_from('>IQ', data, start + 20)
+        unknown = 0xFFFFFFFFFFFFFFFF
+    else:
+        if end - start < 20:
+            return None
+        timescale, duration = struct.unpack_from('>II', data, start + 12)
+        unknown = 0xFFFFFFFF
+    if timescale == 0 or duration == 0 or duration == unknown:
+        return None
+    return duration / float(timescale)
+
+def read_moov(f):
+    # 只读取顶层原子的头部并跳过，mdat 在 moov 之前也不必读取音频数据
+    file_size = f.seek(0, 2)
+    position = 0
+    while position + 8 <= file_size:
+        f.seek(position)
+        header = f.read(16)
+        if len(header) < 8:
+            return None
+        size, box_type = struct.unpack_from('>I4s', header)
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                return None
+            size = struct.unpack_from('>Q', header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - position
+        if size < header_size:
+            return None
+        if box_type == b'moov':
+            if size > MAX_MOOV_SIZE:
+                return None
+            f.seek(position + header_size)
+            return f.read(size - header_size)
+        position += size
+    return None
+
+def mp4_duration(file_path):
+    # 优先取音频轨道 mdhd 的时长，没有时取 mvhd；无法解析时返回 None
+    with open(file_path, 'rb') as f:
+        moov = read_moov(f)
+    if not moov:
+        return None
+    end = len(moov)
+    for box_type, start, box_end in iter_boxes(moov, 0, end):
+        if box_type != b'trak':
+            continue
+        mdia = find_box(moov, start, box_end, b'mdia')
+        if mdia is None:
+            continue
+        hdlr = find_box(moov, mdia[0], mdia[1], b'hdlr')
+        mdhd = find_box(moov, mdia[0], mdia[1], b'mdhd')
+        # hdlr 内容：版本和标志 4 字节、预定义 4 字节、处理类型 4 字节
+        if hdlr is None or mdhd is None or moov[hdlr[0] + 8:hdlr[0] + 12] != b'soun':
+            continue
+        duration = header_duration(moov, *mdhd)
+        if duration is not None:
+            return duration
+    mvhd = find_box(moov, 0, end, b'mvhd')
+    return header_duration(moov, *mvhd) if mvhd else None
\ No newline at end of file
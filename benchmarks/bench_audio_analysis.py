@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容分析性能测试
+在合成的 8kHz 16 位 WAV 录音上比较 NumPy 向量化与纯 Python 的帧能量计算，以及进程池与单进程的分析耗时
+
+用法：python benchmarks/bench_audio_analysis.py --count 32 --seconds 120
+"""
+
+import argparse
+import math
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_analysis import analyze_file, analyze_files, load_numpy, is_empty_call
+
+SAMPLE_RATE = 8000
+
+def make_wav(file_path, seconds, voiced):
+    # 有声录音：每秒前半秒为 300Hz 正弦波；空白录音：只有很弱的底噪
+    period = [int(8000 * math.sin(2 * math.pi * 300 * i / SAMPLE_RATE)) if voiced and i < SAMPLE_RATE // 2
+              else (i * 7919) % 7 - 3 for i in range(SAMPLE_RATE)]
+    second = struct.pack(f'<{SAMPLE_RATE}h', *period)
+    with wave.open(file_path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(second * seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description='比较内容分析的计算方式和并发方式')
+    parser.add_argument('--count', type=int, default=32, help='录音数量')
+    parser.add_argument('--seconds', type=int, default=120, help='每条录音的秒数')
+    args = parser.parse_args()
+
+    numpy = load_numpy()
+    work_dir = tempfile.mkdtemp(prefix='recording_analysis_')
+    try:
+        paths = []
+        for i in range(args.count):
+            path = os.path.join(work_dir, f'录音_{i:04d}.wav')
+            make_wav(path, args.seconds, voiced=i % 2 == 0)
+            paths.append(path)
+
+        if numpy is None:
+            print('未安装 NumPy，只测试纯 Python')
+        else:
+            start = time.perf_counter()
+            vectorized = [analyze_file(path, numpy) for path in paths]
+            numpy_time = time.perf_counter() - start
+            print(f'NumPy     {numpy_time:6.2f}s  ({numpy_time / args.count * 1000:7.1f}ms/条)')
+        start = time.perf_counter()
+        pure = [analyze_file(path) for path in paths]
+        pure_time = time.perf_counter() - start
+        print(f'纯 Python {pure_time:6.2f}s  ({pure_time / args.count * 1000:7.1f}ms/条)')
+        if numpy is not None:
+            same = all(abs(a - b) < 1e-6 for x, y in zip(vectorized, pure) for a, b in zip(x, y))
+            print(f'结果一致：{same}，向量化快 {pure_time / numpy_time:.1f} 倍')
+
+        workers = os.cpu_count() or 1
+        chunks = [paths[i:i + 4] for i in range(0, len(paths), 4)]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(analyze_files, chunks))
+        pool_time = time.perf_counter() - start
+        start = time.perf_counter()
+        analyze_files(paths)
+        serial_time = time.perf_counter() - start
+        print(f'进程池（{workers} 进程） {pool_time:6.2f}s  单进程 {serial_time:6.2f}s')
+        empty = sum(1 for features in pure if is_empty_call(features))
+        print(f'空白录音 {empty} / {args.count}')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+时长解析性能测试
+在合成的 AMR-NB/AMR-WB/M4A 录音上比较内置解析器与 mutagen 的速度和结果
+
+用法：python benchmarks/bench_duration_parsers.py --count 2000 --seconds 60
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mutagen import File as MutagenFile
+from mutagen.mp4 import MP4
+
+from audio_duration import amr_duration, mp4_duration, AMR_NB_MAGIC, AMR_WB_MAGIC
+
+# AMR 帧：帧头 (帧类型 << 3) | 0x04，后接对应长度的数据
+AMR_NB_SPEECH = bytes([7 << 3 | 0x04]) + b'\x00' * 31  # 12.2 kbps
+AMR_NB_SID = bytes([8 << 3 | 0x04]) + b'\x00' * 5  # 静音描述帧
+AMR_NB_NO_DATA = bytes([15 << 3 | 0x04])
+AMR_WB_SPEECH = bytes([2 << 3 | 0x04]) + b'\x00' * 32  # 12.65 kbps
+AMR_WB_NO_DATA = bytes([15 << 3 | 0x04])
+
+def box(box_type, payload):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+def full_box(box_type, payload):
+    return box(box_type, b'\x00\x00\x00\x00' + payload)
+
+def make_amr(file_path, magic, frames):
+    with open(file_path, 'wb') as f:
+        f.write(magic)
+        f.write(b''.join(frames))
+
+def make_amr_nb(file_path, seconds):
+    # 每秒 50 帧；每秒末尾 10 帧为静音（DTX：一帧静音描述，其余无数据）
+    pattern = [AMR_NB_SPEECH] * 40 + [AMR_NB_SID] + [AMR_NB_NO_DATA] * 9
+    make_amr(file_path, AMR_NB_MAGIC, pattern * seconds)
+
+def make_amr_nb_cbr(file_path, seconds):
+    # 不开 DTX 的固定码率录音
+    make_amr(file_path, AMR_NB_MAGIC, [AMR_NB_SPEECH] * (seconds * 50))
+
+def make_amr_wb(file_path, seconds):
+    pattern = [AMR_WB_SPEECH] * 45 + [AMR_WB_NO_DATA] * 5
+    make_amr(file_path, AMR_WB_MAGIC, pattern * seconds)
+
+def make_m4a(file_path, seconds, rate=8000):
+    # 手机录音常见的布局：mdat 在 moov 之前
+    mvhd = full_box(b'mvhd', struct.pack('>IIII', 0, 0, 1000, seconds * 1000) + b'\x00' * 80)
+    mdhd = full_box(b'mdhd', struct.pack('>IIIIHH', 0, 0, rate, seconds * rate, 0, 0))
+    hdlr = full_box(b'hdlr', struct.pack('>I4s', 0, b'soun') + b'\x00' * 12 + b'SoundHandler\x00')
+    # AAC-LC, 8kHz, 单声道
+    decoder_info = bytes([0x05, 2, 0x15, 0x88])
+    decoder_config = bytes([0x04, 13 + len(decoder_info), 0x40, 0x15, 0, 0, 0]) + struct.pack('>II', 32000, 32000) + decoder_info
+    es_descriptor = bytes([0x03, 3 + len(decoder_config) + 3, 0, 1, 0]) + decoder_config + bytes([0x06, 1, 2])
+    mp4a = box(b'mp4a', b'\x00' * 6 + struct.pack('>H', 1) + b'\x00' * 8
+               + struct.pack('>HHHHI', 1, 16, 0, 0, rate << 16) + full_box(b'esds', es_descriptor))
+    stsd = full_box(b'stsd', struct.pack('>I', 1) + mp4a)
+    trak = box(b'trak', box(b'mdia', mdhd + hdlr + box(b'minf', box(b'stbl', stsd))))
+    with open(file_path, 'wb') as f:
+        f.write(box(b'ftyp', b'M4A \x00\x00\x00\x00M4A mp42isom'))
+        f.write(box(b'mdat', b'\x00' * (seconds * 4000)))
+        f.write(box(b'moov', mvhd + trak))
+
+def mutagen_amr_duration(file_path):
+    audio = MutagenFile(file_path)
+    return audio.info.length if audio is not None else None
+
+def mutagen_mp4_duration(file_path):
+    return MP4(file_path).info.length
+
+# 格式 -> (生成函数, 扩展名, 内置解析器, mutagen 解析)
+FORMATS = {
+    'amr-nb': (make_amr_nb, '.amr', amr_duration, mutagen_amr_duration),
+    'amr-cbr': (make_amr_nb_cbr, '.amr', amr_duration, mutagen_amr_duration),
+    'amr-wb': (make_amr_wb, '.amr', amr_duration, mutagen_amr_duration),
+    'm4a': (make_m4a, '.m4a', mp4_duration, mutagen_mp4_duration),
+}
+
+def time_parser(parser, paths):
+    results = []
+    start = time.perf_counter()
+    for file_path in paths:
+        try:
+            results.append(parser(file_path))
+        except Exception:
+            results.append(None)
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='比较内置时长解析器与 mutagen 的速度')
+    parser.add_argument('--count', type=int, default=2000, help='每种格式的合成录音数量')
+    parser.add_argument('--seconds', type=int, default=60, help='每个录音的最长时长（秒）')
+    parser.add_argument('--dir', help='生成录音的目录（默认使用临时目录）')
+    parser.add_argument('--keep', action='store_true', help='保留生成的录音')
+    args = parser.parse_args()
+
+    base_dir = args.dir or tempfile.mkdtemp(prefix='duration_bench_')
+    print(f'目录: {base_dir}')
+    try:
+        for name, (make, extension, native_parser, mutagen_parser) in FORMATS.items():
+            folder = os.path.join(base_dir, name)
+            os.makedirs(folder, exist_ok=True)
+            paths = []
+            expected = []
+            for i in range(args.count):
+                seconds = 1 + i % args.seconds
+                file_path = os.path.join(folder, f'{i:06d}{extension}')
+                if not os.path.exists(file_path):
+                    make(file_path, seconds)
+                paths.append(file_path)
+                expected.append(seconds)
+
+            native_results, native_elapsed = time_parser(native_parser, paths)
+            mutagen_results, mutagen_elapsed = time_parser(mutagen_parser, paths)
+            native_ok = sum(1 for result, seconds in zip(native_results, expected)
+                            if result is not None and abs(result - seconds) < 0.05)
+            mutagen_ok = sum(1 for result, seconds in zip(mutagen_results, expected)
+                             if result is not None and abs(result - seconds) < 0.05)
+            print(f'{name:<8} 内置  {native_elapsed:8.3f}s  {args.count / native_elapsed:10.0f} 个/秒  正确 {native_ok}/{args.count}')
+            print(f'{name:<8} mutagen {mutagen_elapsed:6.3f}s  {args.count / mutagen_elapsed:10.0f} 个/秒  正确 {mutagen_ok}/{args.count}')
+    finally:
+        if not args.keep and not args.dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
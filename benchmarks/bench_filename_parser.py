@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件名解析性能测试
+在合成的各应用格式文件名上比较原来的 re.search + strptime 与预编译格式 + 按位置切数字的解析速度
+
+用法：python benchmarks/bench_filename_parser.py --count 1000000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filename_schemes import FilenameParser
+from recording_store import to_epoch
+
+# 每种格式的文件名模板，与 DEFAULT_SCHEMES 的顺序一致
+TEMPLATES = [
+    lambda phone, t: f'录音_{phone}_{t:%Y%m%d_%H%M%S}.m4a',
+    lambda phone, t: f'张三({phone})_{t:%Y%m%d%H%M%S}.mp3',
+    lambda phone, t: f'{phone}_{t:%Y%m%d%H%M%S}.amr',
+    lambda phone, t: f'Call recording {phone}_{t:%y%m%d_%H%M%S}.m4a',
+    lambda phone, t: f'{t:%Y-%m-%d %H-%M-%S} (in) {phone}.m4a',
+    lambda phone, t: f'Call@{phone}(张三)_{t:%Y_%m_%d_%H_%M_%S}.amr',
+]
+FILES_PER_DIRECTORY = 500
+
+class NoPreference(dict):
+    # 不记住文件夹的格式，每个文件名都从第一个格式开始尝试
+    def get(self, key, default=None):
+        return default
+
+def legacy_parse(directory, file_name):
+    # 原来 Recording 的 extract_phone_number + extract_call_time，照搬原代码（合成的文件名没有实际文件，不含 mtime 回退）
+    file_path = directory + file_name
+    filename = os.path.basename(file_path)
+    match = re.search(r'(\d{11}|\d{7,10})', filename)
+    phone_number = match.group(1) if match else '未知'
+    filename = os.path.basename(file_path)
+    match = re.search(r'_(\d{8})_(\d{6})', filename)
+    if match:
+        date_str = match.group(1)
+        time_str = match.group(2)
+        call_time = datetime.strptime(f"{date_str}{time_str}", "%Y%m%d%H%M%S")
+    else:
+        call_time = None
+    return phone_number, call_time
+
+def make_names(count, templates):
+    # 按文件夹分组：每个文件夹来自同一个应用，文件夹之间轮换格式
+    start = datetime(2020, 1, 1)
+    names = []
+    for i in range(count):
+        directory = i // FILES_PER_DIRECTORY
+        template = templates[directory % len(templates)]
+        names.append((f'/录音/{directory:05d}/', template(f'138{i % 100000000:08d}', start + timedelta(seconds=i * 97))))
+    return names
+
+def run(parse, names):
+    start = time.perf_counter()
+    for directory, file_name in names:
+        parse(directory, file_name)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='比较文件名解析速度')
+    parser.add_argument('--count', type=int, default=1000000, help='文件名数量')
+    args = parser.parse_args()
+
+    # 只有默认格式时两者结果可比，先核对一致
+    default_names = make_names(args.count, TEMPLATES[:1])
+    filename_parser = FilenameParser()
+    for directory, file_name in default_names[:10000]:
+        phone_number, call_time = legacy_parse(directory, file_name)
+        assert filename_parser.parse(directory, file_name) == (phone_number, to_epoch(call_time)), file_name
+
+    legacy = run(legacy_parse, default_names)
+    compiled = run(FilenameParser().parse, default_names)
+    print(f'默认格式  {args.count} 个  原来 {legacy:6.2f}s ({legacy / args.count * 1e6:5.2f}us/个)  '
+          f'预编译 {compiled:6.2f}s ({compiled / args.count * 1e6:5.2f}us/个)  {legacy / compiled:4.1f}x')
+
+    # 各应用格式混合：比较按文件夹记住格式与每次从头尝试
+    mixed_names = make_names(args.count, TEMPLATES)
+    remembered = run(FilenameParser().parse, mixed_names)
+    no_memory = FilenameParser()
+    no_memory.preferred = NoPreference()
+    from_first = run(no_memory.parse, mixed_names)
+    print(f'混合格式  {args.count} 个  按文件夹记住格式 {remembered:6.2f}s  每次从头尝试 {from_first:6.2f}s')
+    unparsed = sum(1 for directory, file_name in mixed_names[::100] if FilenameParser().parse(directory, file_name)[1] is None)
+    print(f'未识别时间 {unparsed} 个（抽样 {len(mixed_names[::100])} 个）')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
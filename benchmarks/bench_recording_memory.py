@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音内存占用测试
+比较紧凑的 Recording（__slots__、共享目录前缀、整数时间、分类编码）与普通对象的内存占用
+
+用法：python benchmarks/bench_recording_memory.py --sizes 100000 1000000
+"""
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recording_manager import RecordingManager, Recording
+from search_index import SearchIndex
+
+BASE_DIR = os.path.join(os.path.expanduser('~'), '录音备份')
+
+LAYOUT_LEGACY = 'legacy'
+LAYOUT_COMPACT = 'compact'
+
+class LegacyRecording:
+    # 原来的布局：每条录音一个 __dict__，完整路径、datetime 和分类字符串
+    def __init__(self, file_path, file_size, file_mtime, phone_number, call_time, duration, classification, confirmed):
+        self.id = None
+        self.file_path = file_path
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self.phone_number = phone_number
+        self.call_time = call_time
+        self.duration = duration
+        self.classification = classification
+        self.confirmed = bool(confirmed)
+
+def build_legacy_indexes(recordings):
+    # 原来 RecordingManager 的索引：按 ID、完整路径、号码，以及号码搜索索引
+    by_id, by_path, by_phone = {}, {}, {}
+    search_index = SearchIndex()
+    for recording_id, rec in enumerate(recordings, 1):
+        rec.id = recording_id
+        by_id[rec.id] = rec
+        by_path[rec.file_path] = rec
+        if rec.phone_number not in by_phone:
+            by_phone[rec.phone_number] = {}
+            search_index.add_phone(rec.phone_number)
+        by_phone[rec.phone_number][rec.id] = rec
+    return by_id, by_path, by_phone, search_index
+
+def iter_rows(count):
+    # 模拟从缓存或会话读出的行：每行的字符串都是新对象（与 SQLite 返回的一样）
+    start = datetime(2020, 1, 1)
+    classifications = ['待确认', '重要', '不重要']
+    for i in range(count):
+        call_time = start + timedelta(seconds=i * 97)
+        phone = f'138{i % 20000:08d}'
+        file_path = os.path.join(BASE_DIR, str(call_time.year), f'{call_time.month:02d}', f'{i // 500:05d}',
+                                 f'录音_{phone}_{call_time:%Y%m%d_%H%M%S}.amr')
+        yield (file_path, 4000 + i % 100000, 1.6e9 + i, phone,
+               datetime.fromisoformat(call_time.isoformat()), float(i % 600),
+               classifications[i % 3].encode().decode(), i % 7 == 0)
+
+def measure(layout, count):
+    # 返回 (录音对象占用, 加上索引后的占用, 构建耗时)，单位字节/秒
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if layout == LAYOUT_LEGACY:
+        recordings = [LegacyRecording(*row) for row in iter_rows(count)]
+    else:
+        recordings = [Recording.from_metadata(row) for row in iter_rows(count)]
+    elapsed = time.perf_counter() - start
+    recordings_size = tracemalloc.get_traced_memory()[0]
+    if layout == LAYOUT_LEGACY:
+        indexes = build_legacy_indexes(recordings)
+    else:
+        manager = RecordingManager()
+        manager.set_recordings(recordings)
+    total_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return recordings_size, total_size, elapsed
+
+def run_child(layout, count):
+    # 每次测量在独立的进程中进行，互不影响
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', layout, str(count)],
+                            capture_output=True, text=True, check=True)
+    recordings_size, total_size, elapsed = result.stdout.split()
+    return int(recordings_size), int(total_size), float(elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description='比较紧凑录音与普通对象的内存占用')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000], help='录音数量')
+    parser.add_argument('--child', nargs=2, metavar=('LAYOUT', 'COUNT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        recordings_size, total_size, elapsed = measure(args.child[0], int(args.child[1]))
+        print(recordings_size, total_size, elapsed)
+        return
+
+    # tracemalloc 会明显拖慢构建，耗时只用于两种布局之间的比较
+    for size in args.sizes:
+        for layout, label in ((LAYOUT_LEGACY, '普通对象'), (LAYOUT_COMPACT, '紧凑录音')):
+            recordings_size, total_size, elapsed = run_child(layout, size)
+            print(f'{size:>8} 条  {label}  录音 {recordings_size / 2 ** 20:8.1f}MB ({recordings_size / size:4.0f} B/条)  '
+                  f'含索引 {total_size / 2 ** 20:8.1f}MB ({total_size / size:4.0f} B/条)  构建 {elapsed:5.1f}s')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动时间测试
+在新的解释器中多次启动主窗口，统计导入耗时、窗口构造耗时和首次绘制时间
+
+用法：python benchmarks/bench_startup.py --runs 5 --max-first-paint 1500
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程：数据文件放到指定目录，首次绘制后立即退出，不弹出使用说明
+CHILD_SCRIPT = r'''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app_paths
+app_paths.get_app_dir = lambda: sys.argv[2]
+import_start = time.perf_counter()
+import main
+import_end = time.perf_counter()
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication(sys.argv[:1])
+times = {}
+
+class PaintWatcher(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and 'first_paint' not in times:
+            times['first_paint'] = time.perf_counter()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+watcher = PaintWatcher()
+app.installEventFilter(watcher)
+window_start = time.perf_counter()
+window = main.MainWindow()
+window_end = time.perf_counter()
+window.show()
+QTimer.singleShot(10000, app.quit)
+app.exec_()
+window.duration_prober.stop()
+print(json.dumps({
+    'import': (import_end - import_start) * 1000,
+    'window': (window_end - window_start) * 1000,
+    'first_paint': (times.get('first_paint', float('nan')) - start) * 1000,
+    'modules': sorted(name for name in sys.modules if name.split('.')[0] in ('mutagen', 'pydub', 'requests')
+                      or name == 'PyQt5.QtMultimedia'),
+}))
+'''
+
+# -X importtime 输出：import time: self [us] | cumulative | imported package
+IMPORT_TIME_PATTERN = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def run_child(data_dir):
+    result = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, APP_DIR, data_dir],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def slowest_imports(count):
+    # 按累计耗时列出 main 直接和间接导入的最慢模块
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            depth = len(match.group(3)) // 2
+            if depth == 0 and match.group(4) != 'main':
+                entries = []  # 解释器启动时的导入（site 等），不属于 main
+                continue
+            entries.append((int(match.group(2)), depth, match.group(4)))
+            if depth == 0:
+                break
+    entries.sort(reverse=True)
+    return entries[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description='统计主窗口的导入耗时和首次绘制时间')
+    parser.add_argument('--runs', type=int, default=5, help='启动次数')
+    parser.add_argument('--data-dir', help='数据文件目录（含会话、缓存等，默认使用空的临时目录）')
+    parser.add_argument('--top', type=int, default=10, help='列出最慢的导入模块数量')
+    parser.add_argument('--max-import', type=float, help='导入耗时中位数超过这个毫秒数时返回非零')
+    parser.add_argument('--max-first-paint', type=float, help='首次绘制中位数超过这个毫秒数时返回非零')
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='recording_startup_')
+    try:
+        results = []
+        for run in range(args.runs):
+            result = run_child(data_dir)
+            results.append(result)
+            print(f'第 {run + 1} 次  导入 {result["import"]:7.1f}ms  窗口 {result["window"]:7.1f}ms  '
+                  f'首次绘制 {result["first_paint"]:7.1f}ms')
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    import_ms = statistics.median(result['import'] for result in results)
+    window_ms = statistics.median(result['window'] for result in results)
+    first_paint_ms = statistics.median(result['first_paint'] for result in results)
+    print(f'中位数  导入 {import_ms:7.1f}ms  窗口 {window_ms:7.1f}ms  首次绘制 {first_paint_ms:7.1f}ms')
+    # 这些模块应在第一次使用时才加载
+    if results[-1]['modules']:
+        print('启动时已加载：' + ', '.join(results[-1]['modules']))
+
+    if args.top:
+        print(f'最慢的 {args.top} 个导入（累计）：')
+        for cumulative, depth, name in slowest_imports(args.top):
+            print(f'{cumulative / 1000:8.1f}ms  {"  " * depth}{name}')
+
+    failed = False
+    if args.max_import is not None and import_ms > args.max_import:
+        print(f'导入耗时超过 {args.max_import:.0f}ms')
+        failed = True
+    if args.max_first_paint is not None and first_paint_ms > args.max_first_paint:
+        print(f'首次绘制超过 {args.max_first_paint:.0f}ms')
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通讯录快照
+以 SQLite 保存解析后的通讯录及来源 VCF 的大小/修改时间/哈希，启动时直接恢复，
+VCF 更新后只写入有变化的号码
+"""
+
+import hashlib
+import os
+import sqlite3
+
+from app_paths import get_data_path
+from sqlite_store import SQLiteStore
+
+def describe_vcf(vcf_path):
+    # 来源文件信息：路径、大小、修改时间、内容哈希
+    stat = os.stat(vcf_path)
+    sha1 = hashlib.sha1()
+    with open(vcf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return {'path': vcf_path, 'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': sha1.hexdigest()}
+
+class ContactCache(SQLiteStore):
+    TABLES = (
+        '''
+        CREATE TABLE IF NOT EXISTS contacts (
+            phone_number TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            contact_group TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS contact_source (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            vcf_path TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            file_mtime REAL NOT NULL,
+            file_hash TEXT NOT NULL
+        )
+        ''',
+    )
+
+    def __init__(self, db_path=None):
+        # 快照不可用时每次启动通讯录为空
+        super().__init__(db_path or get_data_path('contact_cache.db'))
+
+    def load_contacts(self):
+        # phone -> {'name': name, 'group': group}
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute('SELECT phone_number, name, contact_group FROM contacts').fetchall()
+        except sqlite3.Error:
+            return {}
+        return {phone: {'name': name, 'group': group} for phone, name, group in rows}
+
+    def load_source(self):
+        # 上次导入的 VCF 信息，没有快照时返回 None
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    'SELECT vcf_path, file_size, file_mtime, file_hash FROM contact_source WHERE id = 0'
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        return {'path': row[0], 'size': row[1], 'mtime': row[2], 'hash': row[3]}
+
+    def is_source_modified(self):
+        # 按大小和修改时间判断来源 VCF 是否有更新（不计算哈希）
+        source = self.load_source()
+        if source is None or not os.path.isfile(source['path']):
+            return False
+        stat = os.stat(source['path'])
+        return (stat.st_size, stat.st_mtime) != (source['size'], source['mtime'])
+
+    def store(self, contacts, source, changed_phones=None):
+        # changed_phones 为 None 时整体替换，否则只写入这些号码（新增/修改/删除）
+        if changed_phones is None:
+            removed_rows = []
+            changed_rows = [(phone, info['name'], info['group']) for phone, info in contacts.items()]
+        else:
+            removed_rows = [(phone,) for phone in changed_phones if phone not in contacts]
+            changed_rows = [(phone, contacts[phone]['name'], contacts[phone]['group'])
+                            for phone in changed_phones if phone in contacts]
+        try:
+            with self._lock, self._connect() as conn:
+                if changed_phones is None:
+                    conn.execute('DELETE FROM contacts')
+                conn.executemany('DELETE FROM contacts WHERE phone_number = ?', removed_rows)
+                conn.executemany('INSERT OR REPLACE INTO contacts VALUES (?, ?, ?)', changed_rows)
+                conn.execute('INSERT OR REPLACE INTO contact_source VALUES (0, ?, ?, ?, ?)',
+                             (source['path'], source['size'], source['mtime'], source['hash']))
+        except sqlite3.Error:
+            pass  # 快照写入失败不影响正常使用
\ No newline at end of file
@@ -2,37 +2,176 @@
 # -*- coding: utf-8 -*-
 """
 通讯录导入器
-解析.vcf文件
+逐行流式解析.vcf文件，只提取 FN/TEL/CATEGORIES，内存占用与文件大小无关
 """
 
-import vobject
+import os
+import quopri
+from phone_normalizer import normalize_phone
+
+# 需要提取的属性，其余属性（照片、地址等）连同折行一起跳过
+WANTED_PROPERTIES = ('FN', 'TEL', 'CATEGORIES')
+
+def unescape_value(value):
+    # vCard 转义：\, \; \\ \n
+    if '\\' not in value:
+        return value
+    result = []
+    chars = iter(value)
+    for ch in chars:
+        if ch == '\\':
+            ch = next(chars, '')
+            result.append('\n' if ch in ('n', 'N') else ch)
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+def split_list(value):
+    # 按未转义的逗号拆分（CATEGORIES 为逗号分隔的列表）
+    items = []
+    current = []
+    escaped = False
+    for ch in value:
+        if escaped:
+            current.append('\\' + ch)
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == ',':
+            items.append(unescape_value(''.join(current)))
+            current = []
+        else:
+            current.append(ch)
+    items.append(unescape_value(''.join(current)))
+    return [item.strip() for item in items if item.strip()]
+
+def parse_property(line):
+    # 拆分一行属性："item1.TEL;TYPE=CELL:138..." -> ('TEL', {'TYPE': 'CELL'}, '138...')
+    head, sep, value = line.partition(':')
+    if not sep:
+        return None, {}, ''
+    parts = head.split(';')
+    name = parts[0].rsplit('.', 1)[-1].strip().upper()
+    params = {}
+    for param in parts[1:]:
+        key, eq, param_value = param.partition('=')
+        if eq:
+            params[key.strip().upper()] = param_value.strip().strip('"')
+        else:
+            # vCard 2.1 允许省略参数名，如 TEL;CELL;ENCODING=...
+            params.setdefault('TYPE', key.strip())
+            if key.strip().upper() in ('QUOTED-PRINTABLE', 'BASE64', 'B'):
+                params['ENCODING'] = key.strip()
+    return name, params, value
+
+def decode_value(params, value):
+    if params.get('ENCODING', '').upper() == 'QUOTED-PRINTABLE':
+        charset = params.get('CHARSET', 'utf-8')
+        try:
+            return quopri.decodestring(value.encode('latin-1', 'replace')).decode(charset, 'replace')
+        except LookupError:
+            return quopri.decodestring(value.encode('latin-1', 'replace')).decode('utf-8', 'replace')
+    return value
+
+def iter_logical_lines(f, on_progress=None):
+    # 展开折行：以空格或制表符开头的行接在上一行后面；
+    # QUOTED-PRINTABLE 以 "=" 结尾表示软换行。不需要的属性直接丢弃，不做拼接
+    pending = None  # 正在拼接的行
+    keep = False  # 当前属性是否需要
+    quoted_printable = False
+    for raw in f:
+        if on_progress is not None:
+            on_progress(len(raw))
+        line = raw.decode('utf-8', 'replace').rstrip('\r\n').lstrip('\ufeff')
+        if pending is not None and quoted_printable and pending.endswith('='):
+            # 软换行：去掉 "=" 直接拼接
+            if keep:
+                pending = pending[:-1] + line.lstrip()
+            else:
+                pending = '=' if line.endswith('=') else ''
+            continue
+        if line[:1] in (' ', '\t'):
+            if keep and pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None and keep:
+            yield pending
+        if not line:
+            pending = None
+            keep = False
+            continue
+        name = line.split(':', 1)[0].split(';', 1)[0].rsplit('.', 1)[-1].strip().upper()
+        keep = name in WANTED_PROPERTIES or name in ('BEGIN', 'END')
+        quoted_printable = 'QUOTED-PRINTABLE' in line.split(':', 1)[0].upper()
+        pending = line if keep else ('=' if quoted_printable and line.endswith('=') else '')
+    if pending is not None and keep:
+        yield pending
+
+def diff_contacts(old_contacts, new_contacts):
+    # 新增、修改或删除的号码
+    changed_phones = [phone for phone, info in new_contacts.items() if old_contacts.get(phone) != info]
+    changed_phones.extend(phone for phone in old_contacts if phone not in new_contacts)
+    return changed_phones
 
 class ContactImporter:
     def __init__(self):
         self.contacts = {}  # phone -> {'name': name, 'group': group}
 
-    def import_vcf(self, vcf_path):
-        self.contacts = {}
-        with open(vcf_path, 'r', encoding='utf-8') as f:
-            vcf_data = f.read()
-        
-        for vcard in vobject.readComponents(vcf_data):
-            if vcard.name == 'VCARD':
-                name = ''
-                phones = []
-                groups = []
-                
-                if hasattr(vcard, 'fn'):
-                    name = vcard.fn.value
-                
-                if hasattr(vcard, 'tel_list'):
-                    for tel in vcard.tel_list:
-                        phones.append(tel.value.replace(' ', '').replace('-', ''))
-                
-                if hasattr(vcard, 'categories'):
-                    groups = vcard.categories.value
-                
-                group = groups[0] if groups else ''
-                
-                for phone in phones:
-                    self.contacts[phone] = {'name': name, 'group': group.lower()}
\ No newline at end of file
+    def import_vcf(self, vcf_path, progress_callback=None):
+        self.contacts = self.parse_vcf(vcf_path, progress_callback)
+        return self.contacts
+
+    def parse_vcf(self, vcf_path, progress_callback=None):
+        # 返回新的通讯录，不修改 self.contacts（可在后台线程调用）
+        contacts = {}
+        for name, phones, groups in self.iter_vcards(vcf_path, progress_callback):
+            group = groups[0] if groups else ''
+            for phone in phones:
+                contacts[phone] = {'name': name, 'group': group.lower()}
+        return contacts
+
+    def iter_vcards(self, vcf_path, progress_callback=None):
+        # 逐张名片产出 (name, phones, groups)
+        total_size = os.path.getsize(vcf_path) or 1
+        state = {'read': 0, 'percent': -1}
+
+        def on_progress(size):
+            state['read'] += size
+            percent = state['read'] * 100 // total_size
+            if percent != state['percent']:
+                state['percent'] = percent
+                progress_callback(percent)
+
+        with open(vcf_path, 'rb') as f:
+            in_card = False
+            name = None
+            phones = []
+            groups = None
+            for line in iter_logical_lines(f, on_progress if progress_callback else None):
+                prop, params, value = parse_property(line)
+                if prop == 'BEGIN' and value.strip().upper() == 'VCARD':
+                    in_card = True
+                    name = None
+                    phones = []
+                    groups = None
+                elif prop == 'END' and value.strip().upper() == 'VCARD':
+                    if in_card:
+                        yield name or '', phones, groups or []
+                    in_card = False
+                elif not in_card:
+                    continue
+                elif prop == 'FN':
+                    # 多个 FN 时取第一个
+                    if name is None:
+                        name = unescape_value(decode_value(params, value)).strip()
+                elif prop == 'TEL':
+                    phone = unescape_value(decode_value(params, value)).strip()
+                    if phone.lower().startswith('tel:'):
+                        phone = phone[4:]
+                    # 与录音一侧使用同一规范化，按键精确匹配
+                    phone = normalize_phone(phone)
+                    if phone:
+                        phones.append(phone)
+                elif prop == 'CATEGORIES':
+                    if groups is None:
+                        groups = split_list(decode_value(params, value))
\ No newline at end of file
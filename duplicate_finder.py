@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重复录音查找
+先按文件大小（时长都已知时再按时长）分组，组内只读首尾各一小段计算哈希，
+首尾哈希也相同的再计算完整哈希；哈希在线程池中计算，并按 路径+大小+修改时间 缓存
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+PARTIAL_SIZE = 64 * 1024  # 首尾各读取的字节数
+CHUNK_SIZE = 1024 * 1024
+
+def partial_hash(file_path, file_size):
+    # 文件不超过首尾两段时即为完整内容
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        if file_size <= 2 * PARTIAL_SIZE:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(PARTIAL_SIZE))
+            f.seek(-PARTIAL_SIZE, os.SEEK_END)
+            digest.update(f.read(PARTIAL_SIZE))
+    return digest.hexdigest()
+
+def full_hash(file_path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def group_by(recordings, key):
+    # 按 key 分组，只保留两条及以上的组
+    groups = {}
+    for rec in recordings:
+        value = key(rec)
+        if value is not None:
+            groups.setdefault(value, []).append(rec)
+    return [group for group in groups.values() if len(group) > 1]
+
+def size_buckets(recordings):
+    # 大小相同的录音为候选；组内时长都已读取时再按时长细分，未读取的不等待
+    buckets = []
+    for bucket in group_by(recordings, lambda rec: rec.file_size or None):
+        if all(rec.duration_known for rec in bucket):
+            buckets.extend(group_by(bucket, lambda rec: round(rec.duration, 1)))
+        else:
+            buckets.append(bucket)
+    return buckets
+
+def keeper_order(rec):
+    # 每组排在第一的作为保留的原件：未进入待删除区、修改时间最早、路径最短
+    return rec.confirmed, rec.file_mtime, len(rec.file_path), rec.file_path
+
+class DuplicateFinder:
+    MAX_WORKERS = 4  # 哈希主要等待磁盘读取
+
+    def __init__(self, hash_cache=None):
+        self.hash_cache = hash_cache  # 可选的 HashCache
+        self.cancelled = False
+
+    def find(self, recordings, progress=None):
+        # 返回重复录音组（每组第一条为保留的原件），按可释放的空间从大到小排列
+        buckets = size_buckets(recordings)
+        cached_entries = self.hash_cache.load_entries() if self.hash_cache is not None else {}
+        entries = {}  # 本次计算或确认有效的哈希，最后写回缓存
+
+        def cached(rec, index):
+            entry = cached_entries.get(rec.file_path)
+            if entry and entry[0] == rec.file_size and entry[1] == rec.file_mtime:
+                return entry[2 + index]
+            return None
+
+        candidates = [rec for bucket in buckets for rec in bucket]
+        partial = self.hash_files(candidates, lambda rec: partial_hash(rec.file_path, rec.file_size),
+                                  lambda rec: cached(rec, 0), progress, 0, 50)
+        groups = []
+        need_full = []
+        for bucket in buckets:
+            for group in group_by(bucket, partial.get):
+                if group[0].file_size <= 2 * PARTIAL_SIZE:
+                    groups.append(group)  # 首尾哈希已覆盖完整内容
+                else:
+                    need_full.append(group)
+        full = self.hash_files([rec for group in need_full for rec in group], lambda rec: full_hash(rec.file_path),
+                               lambda rec: cached(rec, 1), progress, 50, 100)
+        for group in need_full:
+            groups.extend(group_by(group, full.get))
+
+        for rec in candidates:
+            if rec in partial:
+                entries[rec.file_path] = (rec.file_size, rec.file_mtime, partial[rec], full.get(rec) or cached(rec, 1))
+        if self.hash_cache is not None:
+            self.hash_cache.store(entries)
+        if self.cancelled:
+            return []
+        if progress:
+            progress(100)
+
+        groups = [sorted(group, key=keeper_order) for group in groups]
+        groups.sort(key=lambda group: group[0].file_size * (len(group) - 1), reverse=True)
+        return groups
+
+    def hash_files(self, recordings, compute, lookup, progress, start_percent, end_percent):
+        # 返回 recording -> 哈希；读取失败的文件不在结果中
+        hashes = {}
+        pending = []
+        for rec in recordings:
+            value = lookup(rec)
+            if value is None:
+                pending.append(rec)
+            else:
+                hashes[rec] = value
+        if not pending:
+            return hashes
+
+        def task(rec):
+            if self.cancelled:
+                return rec, None
+            try:
+                return rec, compute(rec)
+            except OSError:
+                return rec, None  # 文件已被删除或无法读取
+
+        last_percent = -1
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(pending))) as executor:
+            for done, (rec, value) in enumerate(executor.map(task, pending), 1):
+                if value is not None:
+                    hashes[rec] = value
+                percent = start_percent + (end_percent - start_percent) * done // len(pending)
+                if progress and percent != last_percent:
+                    last_percent = percent
+                    progress(percent)
+        return hashes
\ No newline at end of file
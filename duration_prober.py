@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+时长探测器
+在后台按优先级读取录音时长：先可见行，再等待按时长分类的录音，最后其余录音
+"""
+
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from recording_manager import probe_duration
+
+# 优先级，数值越小越先探测
+PRIORITY_VISIBLE = 0  # 表格中可见的行
+PRIORITY_CLASSIFY = 1  # 分类规则需要时长的录音
+PRIORITY_BACKGROUND = 2  # 其余录音
+
+class DurationProber(QThread):
+    durations_ready = pyqtSignal(list)  # [(录音, 时长), ...]
+
+    BATCH_SIZE = 64
+    MAX_WORKERS = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.condition = threading.Condition()
+        self.queue = []  # 堆：(优先级, 序号, 录音)
+        self.queued = {}  # 录音 ID -> 已排队的最高优先级
+        self.counter = itertools.count()
+        self.stopped = False
+
+    def enqueue(self, recordings, priority):
+        # 已知时长的录音跳过；同一录音重复加入时只在优先级更高时再排一次
+        with self.condition:
+            added = False
+            for rec in recordings:
+                if rec.duration_known:
+                    continue
+                queued_priority = self.queued.get(rec.id)
+                if queued_priority is not None and queued_priority <= priority:
+                    continue
+                self.queued[rec.id] = priority
+                heapq.heappush(self.queue, (priority, next(self.counter), rec))
+                added = True
+            if added:
+                self.condition.notify()
+
+    def clear(self):
+        with self.condition:
+            self.queue.clear()
+            self.queued.clear()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.queue.clear()
+            self.queued.clear()
+            self.condition.notify()
+        self.wait()
+
+    def next_batch(self):
+        # 取出优先级最高的一批；队列为空时等待
+        with self.condition:
+            while not self.queue and not self.stopped:
+                self.condition.wait()
+            batch = []
+            while self.queue and len(batch) < self.BATCH_SIZE:
+                priority, seq, rec = heapq.heappop(self.queue)
+                # 跳过被更高优先级重新排队的旧条目
+                if self.queued.get(rec.id) != priority:
+                    continue
+                del self.queued[rec.id]
+                if not rec.duration_known:
+                    batch.append(rec)
+            return batch
+
+    def run(self):
+        # 读取文件头主要等待磁盘 IO，用线程池并发
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            while not self.stopped:
+                batch = self.next_batch()
+                if not batch:
+                    continue
+                durations = list(executor.map(probe_duration, (rec.file_path for rec in batch)))
+                if not self.stopped:
+                    self.durations_ready.emit(list(zip(batch, durations)))
\ No newline at end of file
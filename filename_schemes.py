@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音文件名格式
+各拨号应用的文件名格式预先编译成正则，时间去掉分隔符后按整数直接换算，不经过 strptime；
+同一文件夹通常来自同一个应用，上次匹配成功的格式优先尝试
+"""
+
+import re
+from datetime import date
+
+from recording_store import EPOCH
+
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+# 没有格式匹配或格式中没有号码时，取文件名中第一段可带 + 的至少 7 位连续数字
+PHONE_PATTERN = re.compile(r'\+?\d{7,}')
+# 格式中的号码：至少 5 位（含 95338、10086 这类服务号码）
+PHONE_GROUP = r'(?P<phone>\+?\d{5,})'
+
+# 时间格式中的字段（与 Android 的 SimpleDateFormat 相同的写法），须按年月日时分秒的顺序出现
+TIME_FIELDS = ('yyyy', 'yy', 'MM', 'dd', 'HH', 'mm', 'ss')
+
+def compile_time_format(time_format):
+    # 返回 (时间的正则, 年份基数, 分隔符)；去掉分隔符后为 yyyyMMddHHmmss 或 yyMMddHHmmss
+    regex = []
+    fields = []
+    separators = []
+    i = 0
+    while i < len(time_format):
+        for field in TIME_FIELDS:
+            if time_format.startswith(field, i):
+                fields.append(field)
+                regex.append(r'\d' * len(field))
+                i += len(field)
+                break
+        else:
+            regex.append(re.escape(time_format[i]))
+            if time_format[i] not in separators:
+                separators.append(time_format[i])
+            i += 1
+    if fields not in (['yyyy', 'MM', 'dd', 'HH', 'mm', 'ss'], ['yy', 'MM', 'dd', 'HH', 'mm', 'ss']):
+        raise ValueError(f'不支持的时间格式：{time_format}')
+    century = 0 if fields[0] == 'yyyy' else 2000
+    return '(?<!\\d)(?P<time>' + ''.join(regex) + ')(?!\\d)', century, tuple(separators)
+
+def parse_timestamp(text, century, separators):
+    # 去掉分隔符后整体转成整数再拆出各字段，返回相对 EPOCH 的微秒数；日期或时间不合法时返回 None
+    for separator in separators:
+        text = text.replace(separator, '')
+    day, time_of_day = divmod(int(text), 1000000)
+    try:
+        ordinal = date(century + day // 10000, day // 100 % 100, day % 100).toordinal()
+    except ValueError:
+        return None
+    hour, minute_second = divmod(time_of_day, 10000)
+    minute, second = divmod(minute_second, 100)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return ((ordinal - EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60 + second) * 1000000
+
+class FilenameScheme:
+    def __init__(self, name, pattern, time_format):
+        # pattern 中用 {phone} 和 {time} 表示号码和时间的位置，号码可以没有
+        self.name = name
+        time_regex, self.century, self.separators = compile_time_format(time_format)
+        self.regex = re.compile(pattern.format(phone=PHONE_GROUP, time=time_regex))
+        self.has_phone = 'phone' in self.regex.groupindex
+
+    def parse(self, file_name):
+        # 返回 (号码或 None, 时间戳)；不匹配时返回 None
+        match = self.regex.search(file_name)
+        if match is None:
+            return None
+        timestamp = parse_timestamp(match.group('time'), self.century, self.separators)
+        if timestamp is None:
+            return None
+        phone_number = match.group('phone') if self.has_phone else None
+        if phone_number is None:
+            # 格式中没有号码（如联系人姓名），在时间以外的部分查找
+            start, end = match.span('time')
+            phone_match = PHONE_PATTERN.search(file_name[:start] + ' ' + file_name[end:])
+            phone_number = phone_match.group(0) if phone_match else None
+        return phone_number, timestamp
+
+# 内置格式，按常见程度排列
+DEFAULT_SCHEMES = [
+    # 录音_13800138000_20231101_120000.m4a
+    FilenameScheme('默认', r'(?:{phone}_)?{time}', 'yyyyMMdd_HHmmss'),
+    # MIUI：张三(13800138000)_20231101120000.mp3
+    FilenameScheme('MIUI', r'\({phone}\)_{time}', 'yyyyMMddHHmmss'),
+    # 华为/荣耀：13800138000_20231101120000.amr、张三 13800138000 20231101120000.amr
+    FilenameScheme('华为', r'(?:{phone}[ _])?{time}', 'yyyyMMddHHmmss'),
+    # 三星：Call recording 13800138000_231101_120000.m4a
+    FilenameScheme('三星', r'(?:{phone}_)?{time}', 'yyMMdd_HHmmss'),
+    # ACR：2023-11-01 12-00-00 (in) 13800138000.m4a
+    FilenameScheme('ACR', r'{time}(?:\D*{phone})?', 'yyyy-MM-dd HH-mm-ss'),
+    # Cube ACR：Call@13800138000(张三)_2023_11_01_12_00_00.amr
+    FilenameScheme('Cube ACR', r'@{phone}?[^@]*?{time}', 'yyyy_MM_dd_HH_mm_ss'),
+]
+
+class FilenameParser:
+    def __init__(self, schemes=None):
+        self.schemes = list(DEFAULT_SCHEMES if schemes is None else schemes)
+        self.preferred = {}  # 文件夹 -> 该文件夹上次匹配的格式
+
+    def register(self, scheme, first=False):
+        # 加入自定义格式；first 为 True 时排在内置格式之前
+        if first:
+            self.schemes.insert(0, scheme)
+        else:
+            self.schemes.append(scheme)
+        self.preferred.clear()
+
+    def parse(self, directory, file_name):
+        # 返回 (号码或 None, 时间戳或 None)；先试同一文件夹上次匹配的格式
+        preferred = self.preferred.get(directory)
+        if preferred is not None:
+            result = preferred.parse(file_name)
+            if result is not None:
+                return result
+        for scheme in self.schemes:
+            if scheme is preferred:
+                continue
+            result = scheme.parse(file_name)
+            if result is not None:
+                self.preferred[directory] = scheme
+                return result
+        match = PHONE_PATTERN.search(file_name)
+        return (match.group(0) if match else None), None
+
+# 各线程共用；每个解析进程有自己的一份
+filename_parser = FilenameParser()
\ No newline at end of file
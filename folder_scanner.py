@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件夹扫描
+用 os.scandir 一次遍历取得录音文件的大小和修改时间，子文件夹并行扫描，支持包含/排除通配符和最大深度
+"""
+
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from recording_trash import TRASH_DIR_NAME
+
+AUDIO_EXTENSIONS = ('.m4a', '.mp3', '.amr', '.wav')
+
+def parse_patterns(text):
+    # 界面中以分号分隔的通配符
+    return [pattern.strip() for pattern in (text or '').split(';') if pattern.strip()]
+
+def compile_patterns(patterns):
+    # 不含 / 的通配符匹配文件（夹）名，含 / 的匹配相对路径；不区分大小写
+    # 返回 (名称正则, 路径正则)，没有对应的通配符时为 None
+    name_patterns = [fnmatch.translate(p) for p in patterns if '/' not in p]
+    path_patterns = [fnmatch.translate(p.strip('/')) for p in patterns if '/' in p]
+    return tuple(re.compile('|'.join(group), re.IGNORECASE) if group else None
+                 for group in (name_patterns, path_patterns))
+
+def matches(compiled, name, relative_path):
+    name_regex, path_regex = compiled
+    return bool((name_regex and name_regex.match(name)) or (path_regex and path_regex.match(relative_path)))
+
+class FolderScanner:
+    MAX_WORKERS = 8  # 网络共享上列目录主要是等待，并行扫描子文件夹
+
+    def __init__(self, folder_path, include=None, exclude=None, max_depth=None):
+        self.folder_path = folder_path
+        self.include = compile_patterns(include) if include else None  # 只导入匹配的文件
+        self.exclude = compile_patterns(exclude) if exclude else None  # 跳过匹配的文件和文件夹
+        self.max_depth = max_depth  # 0 表示只扫描所选文件夹本身，None 表示不限
+
+    def accepts_file(self, name, relative_path):
+        if not name.lower().endswith(AUDIO_EXTENSIONS):
+            return False
+        if self.exclude and matches(self.exclude, name, relative_path):
+            return False
+        return self.include is None or matches(self.include, name, relative_path)
+
+    def accepts_directory(self, name, relative_path, depth):
+        if name == TRASH_DIR_NAME:
+            return False
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        return not (self.exclude and matches(self.exclude, name, relative_path))
+
+    def scan_directory(self, directory, relative_dir, depth, recursive=True):
+        # 列出一个文件夹：返回 ([(path, size, mtime)], [(子文件夹, 相对路径, 深度)])
+        files = []
+        sub_directories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative_path = relative_dir + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and self.accepts_directory(entry.name, relative_path, depth + 1):
+                                sub_directories.append((entry.path, relative_path + '/', depth + 1))
+                        elif self.accepts_file(entry.name, relative_path):
+                            # Windows 下 scandir 已带有大小和修改时间，不需要再次 stat
+                            stat = entry.stat()
+                            files.append((entry.path, stat.st_size, stat.st_mtime))
+                    except OSError:
+                        continue  # 扫描期间被删除
+        except OSError:
+            pass  # 文件夹已被删除或无权限
+        return files, sub_directories
+
+    def list_directories(self, directory=None):
+        # directory（默认所选文件夹）及其下全部未被排除、不超过最大深度的文件夹，不含回收站；供文件夹监视使用
+        directory = directory or self.folder_path
+        relative = self.relative_directory(directory)
+        if relative is None:
+            return []
+        directories = []
+        pending = [(directory,) + relative]
+        while pending:
+            directory, relative_dir, depth = pending.pop()
+            directories.append(directory)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        relative_path = relative_dir + entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False) and self.accepts_directory(entry.name, relative_path, depth + 1):
+                                pending.append((entry.path, relative_path + '/', depth + 1))
+                        except OSError:
+                            continue
+            except OSError:
+                pass  # 文件夹已被删除或无权限
+        return directories
+
+    def relative_directory(self, directory):
+        # 文件夹相对所选文件夹的路径（以 / 结尾）和深度；不在所选文件夹内或被排除时返回 None
+        try:
+            relative = os.path.relpath(directory, self.folder_path)
+        except ValueError:
+            return None  # Windows 下不在同一个盘
+        if relative == os.curdir:
+            return '', 0
+        parts = relative.replace(os.sep, '/').split('/')
+        if parts[0] == os.pardir:
+            return None
+        for depth in range(1, len(parts) + 1):
+            if not self.accepts_directory(parts[depth - 1], '/'.join(parts[:depth]), depth):
+                return None
+        return '/'.join(parts) + '/', len(parts)
+
+    def scan(self, directories=None):
+        # 返回 path -> (size, mtime)；指定 directories 时只扫描这些文件夹（不递归）
+        files = {}
+        if directories is not None:
+            for directory in directories:
+                relative = self.relative_directory(directory)
+                if relative is not None:
+                    for path, size, mtime in self.scan_directory(directory, relative[0], relative[1], recursive=False)[0]:
+                        files[path] = (size, mtime)
+            return files
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            pending = {executor.submit(self.scan_directory, self.folder_path, '', 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    found, sub_directories = future.result()
+                    for path, size, mtime in found:
+                        files[path] = (size, mtime)
+                    for sub_directory in sub_directories:
+                        pending.add(executor.submit(self.scan_directory, *sub_directory))
+        return files
\ No newline at end of file
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件夹监视器
+监视录音文件夹的变化，合并短时间内的多次事件后通知界面增量导入
+"""
+
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+class FolderWatcher(QObject):
+    directories_changed = pyqtSignal(list)  # 需要重新扫描的文件夹（不递归）
+
+    def __init__(self, scanner, debounce_ms=1000, poll_interval_ms=30000, parent=None):
+        super().__init__(parent)
+        self.scanner = scanner  # FolderScanner：与导入相同的排除规则和最大深度，不监视回收站
+        self.folder_path = scanner.folder_path
+        self.pending_dirs = set()
+
+        # 系统文件监视（Linux 下为 inotify，Windows 下为 ReadDirectoryChangesW）
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
+        # 防抖：同步软件写入一批文件时会连续触发大量事件
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.flush)
+
+        # 轮询：系统监视不可用时（网络共享、inotify 数量上限等）定时扫描
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval_ms)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def start(self):
+        directories = self.scanner.list_directories()
+        failed = self.watcher.addPaths(directories) if directories else []
+        if failed or not directories:
+            self.poll_timer.start()
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.poll_timer.stop()
+        self.pending_dirs.clear()
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+
+    def on_directory_changed(self, path):
+        self.pending_dirs.add(path)
+        self.debounce_timer.start()  # 重新计时
+
+    def flush(self):
+        directories = set(self.pending_dirs)
+        self.pending_dirs.clear()
+
+        # 新建的子文件夹：加入监视，并扫描其中已有的文件
+        watched = set(self.watcher.directories())
+        for directory in list(directories):
+            if not os.path.isdir(directory):
+                continue
+            for sub_directory in self.scanner.list_directories(directory):
+                if sub_directory not in watched:
+                    directories.add(sub_directory)
+                    if not self.watcher.addPath(sub_directory):
+                        self.poll_timer.start()
+
+        if directories:
+            self.directories_changed.emit(sorted(directories))
+
+    def poll(self):
+        self.directories_changed.emit(self.scanner.list_directories())
\ No newline at end of file
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音哈希缓存
+以 SQLite 保存查找重复录音时计算的首尾哈希和完整哈希，按 路径+大小+修改时间 判断是否仍然有效
+"""
+
+import sqlite3
+
+from app_paths import get_data_path
+from sqlite_store import SQLiteStore
+
+class HashCache(SQLiteStore):
+    TABLES = (
+        '''
+        CREATE TABLE IF NOT EXISTS file_hashes (
+            file_path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            file_mtime REAL NOT NULL,
+            partial_hash TEXT,
+            full_hash TEXT
+        )
+        ''',
+    )
+
+    def __init__(self, db_path=None):
+        # 缓存不可用时每次重新计算
+        super().__init__(db_path or get_data_path('hash_cache.db'))
+
+    def load_entries(self):
+        # path -> (size, mtime, partial_hash, full_hash)，未计算的哈希为 None
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(
+                    'SELECT file_path, file_size, file_mtime, partial_hash, full_hash FROM file_hashes'
+                ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {row[0]: row[1:] for row in rows}
+
+    def store(self, entries):
+        # entries: path -> (size, mtime, partial_hash, full_hash)
+        rows = [(path,) + tuple(entry) for path, entry in entries.items()]
+        if not rows:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany('INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)', rows)
+        except sqlite3.Error:
+            pass
+
+    def remove(self, file_paths):
+        rows = [(path,) for path in file_paths]
+        if not rows:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany('DELETE FROM file_hashes WHERE file_path = ?', rows)
+        except sqlite3.Error:
+            pass
\ No newline at end of file
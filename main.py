@@ -7,89 +7,654 @@
 
 import sys
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton, QLabel, QFileDialog, QSplitter, QGroupBox, QTextEdit, QProgressBar, QSlider, QMenu, QMessageBox, QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+import time
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton, QLabel, QFileDialog, QSplitter, QGroupBox, QTextEdit, QProgressBar, QSlider, QMenu, QMessageBox, QLineEdit, QTableView, QHeaderView, QComboBox, QDialog, QTableWidget, QTableWidgetItem, QCheckBox, QDateEdit, QDialogButtonBox, QSpinBox
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QDate
 from PyQt5.QtGui import QIcon
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtCore import QUrl
 
-from recording_manager import RecordingManager, Recording
-from contact_importer import ContactImporter
+from recording_manager import RecordingManager, BACKEND_THREAD, BACKEND_PROCESS
+from folder_scanner import parse_patterns
+from recording_trash import RecordingTrash, RETENTION_DAYS
+from recording_exporter import export_recordings
+from metadata_cache import MetadataCache
+from session_store import SessionStore
+from folder_watcher import FolderWatcher
+from duplicate_finder import DuplicateFinder
+from audio_analysis import analyze_files, is_empty_call
+from hash_cache import HashCache
+from recording_model import RecordingTableModel, RecordingFilterProxyModel, ID_ROLE, SORT_ROLE, DURATION_COLUMN, CLASSIFICATION_COLUMN
+from duration_prober import DurationProber, PRIORITY_VISIBLE, PRIORITY_CLASSIFY, PRIORITY_BACKGROUND
+from contact_importer import ContactImporter, diff_contacts
+from contact_cache import ContactCache, describe_vcf
 from number_classifier import NumberClassifier
 
 class ImportWorker(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal()
+    batch_ready = pyqtSignal(list)  # 完整导入：一批已解析并分类的录音
+    duration_needed = pyqtSignal(list)  # 需要读取时长才能分类的录音
+    rescanned = pyqtSignal(list, list)  # 增量模式：新解析的录音, 已删除文件的路径
 
-    def __init__(self, folder_path, recording_manager, contact_importer, number_classifier):
+    # 每解析这么多文件或经过这么长时间就发送一批
+    BATCH_SIZE = 500
+    BATCH_INTERVAL = 0.2
+
+    def __init__(self, folder_path, recording_manager, contact_importer, number_classifier, incremental=False, directories=None,
+                 backend=BACKEND_THREAD, known_files=None):
         super().__init__()
         self.folder_path = folder_path
         self.recording_manager = recording_manager
         self.contact_importer = contact_importer
         self.number_classifier = number_classifier
+        self.incremental = incremental
+        self.directories = directories  # 增量模式下只扫描这些文件夹
+        self.backend = backend  # 多线程或多进程解析
+        self.known_files = known_files  # 增量模式：界面线程取得的已有录音快照（known_files）
 
     def run(self):
-        # 扫描文件
-        audio_files = []
-        for root, dirs, files in os.walk(self.folder_path):
-            for file in files:
-                if file.lower().endswith(('.m4a', '.mp3', '.amr', '.wav')):
-                    audio_files.append(os.path.join(root, file))
+        if self.incremental:
+            self.run_incremental()
+            return
 
-        total = len(audio_files)
-        if total == 0:
+        # 扫描文件，同时取得大小和修改时间
+        files = self.recording_manager.scan_folder(self.folder_path)
+
+        if not files:
             self.finished.emit()
             return
 
-        # 使用多线程并发处理录音文件
+        # 边解析边分批发送，界面逐批追加显示；录音列表由界面线程维护
+        recordings = self.process_files(list(files), stream=True, file_stats=files)
+        self.recording_manager.folder_path = self.folder_path
+        # 只写元信息缓存；会话日志已由界面线程的 add_recordings 记入
+        if self.recording_manager.metadata_cache is not None:
+            self.recording_manager.metadata_cache.store(recordings)
+        self.finished.emit()
+
+    def run_incremental(self):
+        # 增量重新扫描：只扫描、比较并解析新增和修改的文件；
+        # 应用变化、分类和写缓存都在主线程 on_rescan_finished 中进行，避免与界面操作同时修改录音列表
+        manager = self.recording_manager
+        files = manager.scan_folder(self.folder_path, self.directories)
+        added, removed, modified = manager.diff_files(files, self.known_files)
+        new_recordings = self.process_files(added + modified, file_stats=files)
+        self.progress.emit(100)
+        self.rescanned.emit(new_recordings, removed)
+        self.finished.emit()
+
+    def process_files(self, audio_files, stream=False, file_stats=None):
+        total = len(audio_files)
+        if total == 0:
+            return []
+
+        # 并发处理录音文件，未变化的文件直接从缓存还原
         recordings = []
-        completed = 0
-        
-        def process_file(file_path):
-            nonlocal completed
-            recording = Recording(file_path)
-            completed += 1
-            self.progress.emit(int(completed / total * 100))
-            return recording
-
-        # 使用线程池，线程数为CPU核心数的2倍
-        max_workers = min(os.cpu_count() * 2, total)
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_file = {executor.submit(process_file, file_path): file_path for file_path in audio_files}
-            
-            for future in as_completed(future_to_file):
-                recording = future.result()
-                recordings.append(recording)
+        batch = []
+        last_percent = -1
+        last_emit = time.monotonic()
+        cached_entries = self.recording_manager.load_cached_entries()
+        feature_entries = self.recording_manager.load_feature_entries()
+        for recording in self.recording_manager.iter_recordings(audio_files, cached_entries, self.backend, file_stats=file_stats):
+            self.recording_manager.attach_features((recording,), feature_entries)
+            recordings.append(recording)
+            percent = int(len(recordings) / total * 100)
+            if percent != last_percent:
+                last_percent = percent
+                self.progress.emit(percent)
+            if stream:
+                batch.append(recording)
+                now = time.monotonic()
+                if len(batch) >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL:
+                    self.emit_batch(batch)
+                    batch = []
+                    last_emit = now
+
+        if stream and batch:
+            self.emit_batch(batch)
+        return recordings
+
+    def emit_batch(self, batch):
+        # 时长由后台探测器读取，解析时不打开音频文件
+        pending = []
+        self.recording_manager.classify_recordings(self.contact_importer.contacts, self.number_classifier, batch, pending=pending)
+        self.batch_ready.emit(batch)
+        if pending:
+            self.duration_needed.emit(pending)
+
+class DeleteWorker(QThread):
+    progress = pyqtSignal(int)
+    deleted = pyqtSignal(list)  # 一批已删除（或本来就不存在）的录音
+    finished = pyqtSignal(list, bool)  # 删除失败的 (路径, 原因), 是否被取消
 
-        # 按时间排序
-        recordings.sort(key=lambda x: x.call_time, reverse=True)
-        self.recording_manager.recordings = recordings
+    BATCH_SIZE = 200
+    MAX_WORKERS = 8  # 删除主要等待磁盘/网络，线程数可多于 CPU 核心数
 
-        # 分类
-        self.recording_manager.classify_recordings(self.contact_importer.contacts, self.number_classifier)
-        self.finished.emit()
+    def __init__(self, recordings, trash=None):
+        super().__init__()
+        self.recordings = list(recordings)
+        self.trash = trash  # 指定回收站时移入回收站，否则直接删除
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def delete_file(self, rec):
+        # 返回 (回收站清单条目, 错误信息)
+        try:
+            if self.trash is not None:
+                return self.trash.move_file(rec.file_path), None
+            os.remove(rec.file_path)
+        except FileNotFoundError:
+            pass  # 文件可能已删除
+        except Exception as e:
+            return None, str(e)
+        return None, None
+
+    def run(self):
+        failed_deletions = []
+        total = len(self.recordings)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for start in range(0, total, self.BATCH_SIZE):
+                if self.cancelled:
+                    break
+                batch = self.recordings[start:start + self.BATCH_SIZE]
+                deleted = []
+                trash_entries = []
+                for rec, (trash_entry, error) in zip(batch, executor.map(self.delete_file, batch)):
+                    if error is None:
+                        deleted.append(rec)
+                        if trash_entry is not None:
+                            trash_entries.append(trash_entry)
+                    else:
+                        # 记录删除失败以便提示用户
+                        failed_deletions.append((rec.file_path, error))
+                if trash_entries:
+                    # 每批写一次清单；写入失败时文件仍在回收站目录中，不影响删除结果
+                    try:
+                        self.trash.record(trash_entries)
+                    except Exception:
+                        pass
+                done += len(batch)
+                if deleted:
+                    self.deleted.emit(deleted)
+                self.progress.emit(done * 100 // total)
+        self.finished.emit(failed_deletions, self.cancelled)
+
+class TrashPurgeWorker(QThread):
+    finished = pyqtSignal(int)  # 彻底删除的数量
+
+    def __init__(self, trash, days=RETENTION_DAYS):
+        super().__init__()
+        self.trash = trash
+        self.days = days
+
+    def run(self):
+        try:
+            purged, failures = self.trash.purge_older_than(self.days)
+        except Exception:
+            purged = 0  # 清理失败时下次再试
+        self.finished.emit(purged)
+
+class TrashDialog(QDialog):
+    restored = pyqtSignal(list)  # 已恢复的原路径
+
+    def __init__(self, trash, parent=None):
+        super().__init__(parent)
+        self.trash = trash
+        self.setWindowTitle('回收站')
+        self.resize(800, 500)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"删除的录音保留在回收站中，超过 {RETENTION_DAYS} 天自动彻底删除"))
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(['原路径', '大小', '删除时间'])
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.ExtendedSelection)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.restore_btn = QPushButton('恢复选中')
+        self.purge_btn = QPushButton('彻底删除选中')
+        self.empty_btn = QPushButton('清空回收站')
+        self.close_btn = QPushButton('关闭')
+        self.restore_btn.clicked.connect(self.restore_selected)
+        self.purge_btn.clicked.connect(self.purge_selected)
+        self.empty_btn.clicked.connect(self.empty_trash)
+        self.close_btn.clicked.connect(self.accept)
+        for button in [self.restore_btn, self.purge_btn, self.empty_btn]:
+            button_layout.addWidget(button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
+
+        self.load_entries()
+
+    def load_entries(self):
+        self.entries = self.trash.list_entries()
+        self.table.setRowCount(len(self.entries))
+        for row, (trash_name, original_path, file_size, trashed_at) in enumerate(self.entries):
+            self.table.setItem(row, 0, QTableWidgetItem(original_path))
+            self.table.setItem(row, 1, QTableWidgetItem(f"{file_size / 1024:.0f} KB"))
+            self.table.setItem(row, 2, QTableWidgetItem(datetime.fromtimestamp(trashed_at).strftime('%Y-%m-%d %H:%M:%S')))
+
+    def selected_names(self):
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.entries[row][0] for row in rows]
+
+    def restore_selected(self):
+        names = self.selected_names()
+        if not names:
+            return
+        restored, failures = self.trash.restore(names)
+        self.load_entries()
+        if restored:
+            self.restored.emit(restored)
+        self.show_failures("恢复部分失败", failures)
+
+    def purge_selected(self):
+        self.purge(self.selected_names())
+
+    def empty_trash(self):
+        self.purge([entry[0] for entry in self.entries])
+
+    def purge(self, names):
+        if not names:
+            return
+        reply = QMessageBox.question(self, "彻底删除", f"确定彻底删除 {len(names)} 个录音？此操作不可恢复。",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        purged, failures = self.trash.purge(names)
+        self.load_entries()
+        self.show_failures("删除部分失败", failures)
+
+    def show_failures(self, title, failures):
+        if not failures:
+            return
+        msg = ""
+        for fp, err in failures[:10]:
+            msg += f"{fp} -> {err}\n"
+        if len(failures) > 10:
+            msg += f"... 另外 {len(failures)-10} 项失败。\n"
+        QMessageBox.warning(self, title, msg)
+
+class ExportWorker(QThread):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(int)  # 导出的条数
+    failed = pyqtSignal(str)
+
+    PROGRESS_STEP = 1000  # 每处理这么多条报告一次进度
+
+    def __init__(self, recording_manager, file_path, classifications=None, start_time=None, end_time=None):
+        super().__init__()
+        self.recording_manager = recording_manager
+        # 只复制录音对象的引用，导出期间界面增删录音不影响遍历
+        self.recordings = list(recording_manager.recordings)
+        self.file_path = file_path
+        self.classifications = classifications
+        self.start_time = start_time
+        self.end_time = end_time
+
+    def scanned_recordings(self):
+        total = len(self.recordings)
+        for index, rec in enumerate(self.recordings, 1):
+            if index % self.PROGRESS_STEP == 0:
+                self.progress.emit(index * 100 // total)
+            yield rec
+
+    def run(self):
+        try:
+            matching = self.recording_manager.filter_recordings(
+                self.scanned_recordings(), self.classifications, self.start_time, self.end_time)
+            count = export_recordings(matching, self.file_path)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.progress.emit(100)
+        self.finished.emit(count)
+
+class DuplicateWorker(QThread):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(list)  # 重复录音组，每组第一条为保留的原件
+
+    def __init__(self, recording_manager, hash_cache):
+        super().__init__()
+        # 只复制录音对象的引用，查找期间界面增删录音不影响遍历
+        self.recordings = list(recording_manager.recordings)
+        self.finder = DuplicateFinder(hash_cache)
+
+    def run(self):
+        self.finished.emit(self.finder.find(self.recordings, self.progress.emit))
+
+class AnalysisWorker(QThread):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(list, int)  # 分析完成的 (录音, AudioFeatures), 无法解码的数量
+    failed = pyqtSignal(str)
+
+    CHUNK_SIZE = 16  # 每个进程任务分析的文件数
+
+    def __init__(self, recordings):
+        super().__init__()
+        self.recordings = list(recordings)
+        self.cancelled = False
+
+    def run(self):
+        # 解码和能量计算都占用 CPU，放到进程池中
+        by_path = {rec.file_path: rec for rec in self.recordings}
+        paths = list(by_path)
+        chunks = [paths[i:i + self.CHUNK_SIZE] for i in range(0, len(paths), self.CHUNK_SIZE)]
+        results = []
+        undecodable = 0
+        try:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(chunks))) as executor:
+                futures = [executor.submit(analyze_files, chunk) for chunk in chunks]
+                for done, future in enumerate(as_completed(futures), 1):
+                    if self.cancelled:
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                    for file_path, features in future.result():
+                        if features is None:
+                            undecodable += 1
+                        else:
+                            results.append((by_path[file_path], features))
+                    self.progress.emit(done * 100 // len(futures))
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(results, undecodable)
+
+class DuplicatesDialog(QDialog):
+    def __init__(self, groups, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('重复录音')
+        self.resize(900, 500)
+
+        layout = QVBoxLayout(self)
+        wasted = sum(group[0].file_size * (len(group) - 1) for group in groups)
+        layout.addWidget(QLabel(f"找到 {len(groups)} 组内容完全相同的录音，删除多余副本可释放 {wasted / 1024 / 1024:.1f} MB；"
+                                f"每组第一条为保留的原件，其余副本已勾选"))
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(['组', '路径', '大小', '通话时间', '分类'])
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.rows = []  # (组号, 录音)
+        for group_number, group in enumerate(groups, 1):
+            self.rows.extend((group_number, rec) for rec in group)
+        self.table.setRowCount(len(self.rows))
+        for row, (group_number, rec) in enumerate(self.rows):
+            check_item = QTableWidgetItem(str(group_number))
+            check_item.setFlags(check_item.flags() | Qt.ItemIsUserCheckable)
+            is_copy = row > 0 and self.rows[row - 1][0] == group_number
+            check_item.setCheckState(Qt.Checked if is_copy and not rec.confirmed else Qt.Unchecked)
+            self.table.setItem(row, 0, check_item)
+            self.table.setItem(row, 1, QTableWidgetItem(rec.file_path))
+            self.table.setItem(row, 2, QTableWidgetItem(f"{rec.file_size / 1024:.0f} KB"))
+            self.table.setItem(row, 3, QTableWidgetItem(rec.call_time.strftime('%Y-%m-%d %H:%M:%S')))
+            self.table.setItem(row, 4, QTableWidgetItem('待删除' if rec.confirmed else rec.classification))
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Cancel)
+        move_btn = buttons.addButton('将勾选的副本移到待删除区', QDialogButtonBox.AcceptRole)
+        move_btn.clicked.connect(self.confirm_selection)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def checked_recordings(self):
+        return [rec for row, (group_number, rec) in enumerate(self.rows)
+                if self.table.item(row, 0).checkState() == Qt.Checked]
+
+    def confirm_selection(self):
+        # 某组的全部录音都勾选时提醒，避免不留原件
+        checked = set(row for row in range(len(self.rows)) if self.table.item(row, 0).checkState() == Qt.Checked)
+        groups = {}
+        for row, (group_number, rec) in enumerate(self.rows):
+            groups.setdefault(group_number, []).append(row in checked)
+        whole_groups = sum(1 for flags in groups.values() if all(flags))
+        if whole_groups:
+            reply = QMessageBox.question(self, "重复录音", f"有 {whole_groups} 组的所有录音都已勾选，不会保留原件。确定继续？",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        self.accept()
+
+class ExportDialog(QDialog):
+    def __init__(self, default_path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('导出结果')
+
+        layout = QVBoxLayout(self)
+        path_layout = QHBoxLayout()
+        self.path_input = QLineEdit(default_path)
+        browse_btn = QPushButton('浏览...')
+        browse_btn.clicked.connect(self.browse)
+        path_layout.addWidget(QLabel('导出到:'))
+        path_layout.addWidget(self.path_input)
+        path_layout.addWidget(browse_btn)
+        layout.addLayout(path_layout)
+
+        # 分类筛选
+        classification_layout = QHBoxLayout()
+        classification_layout.addWidget(QLabel('分类:'))
+        self.classification_checks = {}
+        for classification in ['重要', '不重要', '待确认']:
+            check = QCheckBox(classification)
+            check.setChecked(True)
+            self.classification_checks[classification] = check
+            classification_layout.addWidget(check)
+        classification_layout.addStretch()
+        layout.addLayout(classification_layout)
+
+        # 通话日期筛选
+        date_layout = QHBoxLayout()
+        self.date_filter_check = QCheckBox('通话日期:')
+        self.start_date_edit = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.end_date_edit = QDateEdit(QDate.currentDate())
+        for date_edit in [self.start_date_edit, self.end_date_edit]:
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat('yyyy-MM-dd')
+            date_edit.setEnabled(False)
+            self.date_filter_check.toggled.connect(date_edit.setEnabled)
+        date_layout.addWidget(self.date_filter_check)
+        date_layout.addWidget(self.start_date_edit)
+        date_layout.addWidget(QLabel('至'))
+        date_layout.addWidget(self.end_date_edit)
+        date_layout.addStretch()
+        layout.addLayout(date_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def browse(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "选择导出文件", self.path_input.text(),
+            "NDJSON (*.ndjson *.jsonl);;CSV (*.csv);;SQLite (*.db *.sqlite)")
+        if file_path:
+            self.path_input.setText(file_path)
+
+    def options(self):
+        # (导出路径, 分类集合, 起始时间, 结束时间)；不筛选的条件为 None
+        classifications = set(name for name, check in self.classification_checks.items() if check.isChecked())
+        if len(classifications) == len(self.classification_checks):
+            classifications = None
+        start_time = end_time = None
+        if self.date_filter_check.isChecked():
+            start_time = datetime.combine(self.start_date_edit.date().toPyDate(), datetime.min.time())
+            # 包含结束日期当天
+            end_time = datetime.combine(self.end_date_edit.date().toPyDate(), datetime.min.time()) + timedelta(days=1)
+        return self.path_input.text().strip(), classifications, start_time, end_time
+
+class ScanOptionsDialog(QDialog):
+    def __init__(self, include_patterns, exclude_patterns, max_depth, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('扫描设置')
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel('多个通配符用分号分隔；含 / 的通配符匹配相对所选文件夹的路径'))
+
+        include_layout = QHBoxLayout()
+        self.include_input = QLineEdit('; '.join(include_patterns))
+        self.include_input.setPlaceholderText('全部录音，例如 *.amr;通话录音/*')
+        include_layout.addWidget(QLabel('只导入:'))
+        include_layout.addWidget(self.include_input)
+        layout.addLayout(include_layout)
+
+        exclude_layout = QHBoxLayout()
+        self.exclude_input = QLineEdit('; '.join(exclude_patterns))
+        self.exclude_input.setPlaceholderText('不排除，例如 微信*;backup/old')
+        exclude_layout.addWidget(QLabel('排除:'))
+        exclude_layout.addWidget(self.exclude_input)
+        layout.addLayout(exclude_layout)
+
+        # 最小值表示不限；0 表示只扫描所选文件夹本身
+        depth_layout = QHBoxLayout()
+        self.depth_spin = QSpinBox()
+        self.depth_spin.setRange(-1, 99)
+        self.depth_spin.setSpecialValueText('不限')
+        self.depth_spin.setValue(-1 if max_depth is None else max_depth)
+        depth_layout.addWidget(QLabel('子文件夹层数:'))
+        depth_layout.addWidget(self.depth_spin)
+        depth_layout.addStretch()
+        layout.addLayout(depth_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def options(self):
+        # (包含的通配符, 排除的通配符, 最大深度)；不限深度时为 None
+        max_depth = self.depth_spin.value()
+        return (parse_patterns(self.include_input.text()), parse_patterns(self.exclude_input.text()),
+                None if max_depth < 0 else max_depth)
+
+class ContactImportWorker(QThread):
+    progress = pyqtSignal(int)
+    contacts_ready = pyqtSignal(dict, list)  # 新的通讯录, 有变化的号码
+    failed = pyqtSignal(str)
+
+    def __init__(self, vcf_path, contact_importer, contact_cache):
+        super().__init__()
+        self.vcf_path = vcf_path
+        self.contact_importer = contact_importer
+        self.contact_cache = contact_cache
+        self.old_contacts = contact_importer.contacts  # 界面线程只会整体替换，不会修改这个字典
+
+    def run(self):
+        # 只解析，不修改当前通讯录；替换和重新分类在界面线程完成
+        try:
+            source = describe_vcf(self.vcf_path)
+            snapshot = self.contact_cache.load_source()
+            if snapshot is not None and snapshot['hash'] == source['hash']:
+                # 内容与快照相同，只更新来源信息
+                self.contact_cache.store(self.old_contacts, source, [])
+                self.progress.emit(100)
+                self.contacts_ready.emit(self.old_contacts, [])
+                return
+            contacts = self.contact_importer.parse_vcf(self.vcf_path, self.progress.emit)
+            # 快照只写入增量；原本没有通讯录时整体写入
+            changed_phones = diff_contacts(self.old_contacts, contacts)
+            self.contact_cache.store(contacts, source, changed_phones if self.old_contacts else None)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.contacts_ready.emit(contacts, changed_phones)
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.recording_manager = RecordingManager()
+        self.session_store = SessionStore()
+        self.recording_manager = RecordingManager(MetadataCache(), self.session_store)
+        self.restore_scan_options()
         self.contact_importer = ContactImporter()
+        # 从快照恢复上次导入的通讯录
+        self.contact_cache = ContactCache()
+        self.contact_importer.contacts = self.contact_cache.load_contacts()
+        self.recording_manager.set_contacts(self.contact_importer.contacts)
         self.number_classifier = NumberClassifier()
-        self.media_player = QMediaPlayer()
-        self.media_player.positionChanged.connect(self.update_position)
-        self.media_player.durationChanged.connect(self.update_duration)
-        self.media_player.stateChanged.connect(self.update_playing_status)
-        self.media_player.error.connect(self.handle_media_error)
+        self.media_player = None  # 第一次播放时才加载 QtMultimedia 并创建
         self.current_recording = None
-        # 搜索相关变量
-        self.search_highlighted_items = set()  # 高亮的项目
-        self.search_confirmed_items = set()    # 确认搜索的项目
+        self.import_worker = None
+        self.import_reset_pending = False
+        self.contact_worker = None
+        self.delete_worker = None
+        self.purge_worker = None
+        self.export_worker = None
+        self.duplicate_worker = None
+        self.analysis_worker = None
+        self.hash_cache = HashCache()
+        # 定时清理回收站中过期的录音
+        self.trash_purge_timer = QTimer(self)
+        self.trash_purge_timer.setInterval(3600 * 1000)
+        self.trash_purge_timer.timeout.connect(self.purge_old_trash)
+        self.trash_purge_timer.start()
+        # 文件夹监视
+        self.folder_watcher = None
+        self.pending_watch_dirs = set()
+        # 所有表格共用一个模型（含搜索高亮状态），各分区通过过滤代理显示
+        self.recording_model = RecordingTableModel(self.get_contact_name, self)
+        self.recording_proxy = RecordingFilterProxyModel(show_search=False, parent=self)
+        self.important_proxy = RecordingFilterProxyModel(lambda rec: not rec.confirmed and rec.classification == '重要', column_count=4, parent=self)
+        self.unimportant_proxy = RecordingFilterProxyModel(lambda rec: not rec.confirmed and rec.classification == '不重要', column_count=4, parent=self)
+        self.delete_proxy = RecordingFilterProxyModel(lambda rec: rec.confirmed, parent=self)
+        for proxy_model in [self.recording_proxy, self.important_proxy, self.unimportant_proxy, self.delete_proxy]:
+            proxy_model.setSourceModel(self.recording_model)
+        # 后台读取录音时长：可见行优先，其次是等待按时长分类的录音
+        self.duration_prober = DurationProber(self)
+        self.duration_prober.durations_ready.connect(self.on_durations_ready)
+        self.duration_prober.start()
+        # 探测结果先攒一小段时间再一起分类、写缓存和刷新表格
+        self.probed_durations = []
+        self.durations_timer = QTimer(self)
+        self.durations_timer.setSingleShot(True)
+        self.durations_timer.setInterval(200)
+        self.durations_timer.timeout.connect(self.apply_probed_durations)
+        self.visible_probe_timer = QTimer(self)
+        self.visible_probe_timer.setSingleShot(True)
+        self.visible_probe_timer.setInterval(100)
+        self.visible_probe_timer.timeout.connect(self.probe_visible_durations)
         self.init_ui()
+        # 恢复上次的会话（录音列表及分类、待删除区），不读取音频文件
+        if self.recording_manager.restore_session():
+            self.recording_model.reset_recordings(self.recording_manager.recordings)
+            self.probe_unknown_durations()
+        # 定期把会话日志合并到快照
+        self.session_checkpoint_timer = QTimer(self)
+        self.session_checkpoint_timer.setInterval(60 * 1000)
+        self.session_checkpoint_timer.timeout.connect(self.session_store.checkpoint)
+        self.session_checkpoint_timer.start()
+        # 上次导入的 VCF 已更新时，后台合并变化的号码
+        if self.contact_cache.is_source_modified():
+            self.start_contact_import(self.contact_cache.load_source()['path'])
         
         # 启动时显示使用说明弹窗
         QTimer.singleShot(500, self.show_help)
 
+    def closeEvent(self, event):
+        # 退出前把会话日志合并到快照，下次启动直接读快照
+        self.duration_prober.stop()
+        self.durations_timer.stop()
+        self.apply_probed_durations()
+        if self.duplicate_worker and self.duplicate_worker.isRunning():
+            self.duplicate_worker.finder.cancelled = True
+            self.duplicate_worker.wait()
+        if self.analysis_worker and self.analysis_worker.isRunning():
+            self.analysis_worker.cancelled = True
+            self.analysis_worker.wait()
+        self.session_store.checkpoint()
+        super().closeEvent(event)
+
     def init_ui(self):
         self.setWindowTitle('通话录音整理工具')
         self.setGeometry(100, 100, 1200, 800)
@@ -102,8 +667,20 @@ class MainWindow(QMainWindow):
         # 顶部：菜单按钮
         top_layout = QHBoxLayout()
         self.import_recordings_btn = QPushButton('导入录音')
+        self.rescan_recordings_btn = QPushButton('重新扫描')
+        self.watch_folder_btn = QPushButton('监视文件夹')
+        self.watch_folder_btn.setCheckable(True)
+        self.scan_options_btn = QPushButton('扫描设置')
+        # 解析方式：多进程适合大量文件、CPU核心较多的机器
+        self.import_backend_combo = QComboBox()
+        self.import_backend_combo.addItem('多线程解析', BACKEND_THREAD)
+        self.import_backend_combo.addItem('多进程解析', BACKEND_PROCESS)
         self.import_contacts_btn = QPushButton('导入通讯录')
+        self.import_number_db_btn = QPushButton('导入号码库')
         self.export_results_btn = QPushButton('导出结果')
+        self.find_duplicates_btn = QPushButton('查找重复')
+        self.analyze_btn = QPushButton('分析内容')
+        self.trash_btn = QPushButton('回收站')
         self.help_btn = QPushButton('使用说明')
         self.delete_unimportant_btn = QPushButton('删除不重要录音')
         
@@ -115,13 +692,28 @@ class MainWindow(QMainWindow):
         self.search_input.returnPressed.connect(self.confirm_search)
 
         self.import_recordings_btn.clicked.connect(self.import_recordings)
+        self.rescan_recordings_btn.clicked.connect(self.rescan_recordings)
+        self.watch_folder_btn.toggled.connect(self.toggle_folder_watch)
+        self.scan_options_btn.clicked.connect(self.edit_scan_options)
         self.import_contacts_btn.clicked.connect(self.import_contacts)
+        self.import_number_db_btn.clicked.connect(self.import_number_database)
         self.export_results_btn.clicked.connect(self.export_results)
+        self.find_duplicates_btn.clicked.connect(self.find_duplicates)
+        self.analyze_btn.clicked.connect(self.analyze_recordings)
+        self.trash_btn.clicked.connect(self.show_trash)
         self.help_btn.clicked.connect(self.show_help)
 
         top_layout.addWidget(self.import_recordings_btn)
+        top_layout.addWidget(self.rescan_recordings_btn)
+        top_layout.addWidget(self.watch_folder_btn)
+        top_layout.addWidget(self.scan_options_btn)
+        top_layout.addWidget(self.import_backend_combo)
         top_layout.addWidget(self.import_contacts_btn)
+        top_layout.addWidget(self.import_number_db_btn)
         top_layout.addWidget(self.export_results_btn)
+        top_layout.addWidget(self.find_duplicates_btn)
+        top_layout.addWidget(self.analyze_btn)
+        top_layout.addWidget(self.trash_btn)
         top_layout.addWidget(self.help_btn)
         top_layout.addStretch()  # 左侧按钮和右侧搜索框之间的弹性空间
         top_layout.addWidget(QLabel("搜索:"))
@@ -133,55 +725,17 @@ class MainWindow(QMainWindow):
         middle_layout = QHBoxLayout()
 
         # 左侧：录音时间线列表
-        self.recording_list = QTableWidget()
-        self.recording_list.setColumnCount(5)
-        self.recording_list.setHorizontalHeaderLabels(['时间', '号码', '联系人', '时长', '分类'])
-        self.recording_list.setSortingEnabled(True)
-        self.recording_list.setSelectionBehavior(QTableWidget.SelectRows)
-        self.recording_list.horizontalHeader().setStretchLastSection(False)
-        # 设置合理的初始列宽
-        self.recording_list.setColumnWidth(0, 130)  # 时间列
-        self.recording_list.setColumnWidth(1, 90)   # 号码列
-        self.recording_list.setColumnWidth(2, 80)   # 联系人列
-        self.recording_list.setColumnWidth(3, 60)   # 时长列
-        self.recording_list.setColumnWidth(4, 50)   # 分类列
-        self.recording_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.recording_list.customContextMenuRequested.connect(self.show_context_menu)
+        self.recording_list = self.create_recording_view(self.recording_proxy, [130, 90, 80, 60, 50])
 
         # 中间：系统分类区
         classification_group = QGroupBox("系统分类")
         classification_layout = QVBoxLayout()
-        self.important_list = QTableWidget()
-        self.important_list.setColumnCount(4)
-        self.important_list.setHorizontalHeaderLabels(['时间', '号码', '联系人', '时长'])
-        self.important_list.setSortingEnabled(True)
-        self.important_list.setSelectionBehavior(QTableWidget.SelectRows)
-        self.important_list.setSelectionMode(QTableWidget.ExtendedSelection)
-        self.important_list.horizontalHeader().setStretchLastSection(False)
-        # 设置合理的初始列宽
-        self.important_list.setColumnWidth(0, 130)  # 时间列
-        self.important_list.setColumnWidth(1, 90)   # 号码列
-        self.important_list.setColumnWidth(2, 80)   # 联系人列
-        self.important_list.setColumnWidth(3, 60)   # 时长列
-        
-        self.unimportant_list = QTableWidget()
-        self.unimportant_list.setColumnCount(4)
-        self.unimportant_list.setHorizontalHeaderLabels(['时间', '号码', '联系人', '时长'])
-        self.unimportant_list.setSortingEnabled(True)
-        self.unimportant_list.setSelectionBehavior(QTableWidget.SelectRows)
-        self.unimportant_list.setSelectionMode(QTableWidget.ExtendedSelection)
-        self.unimportant_list.horizontalHeader().setStretchLastSection(False)
-        # 设置合理的初始列宽
-        self.unimportant_list.setColumnWidth(0, 130)  # 时间列
-        self.unimportant_list.setColumnWidth(1, 90)   # 号码列
-        self.unimportant_list.setColumnWidth(2, 80)   # 联系人列
-        self.unimportant_list.setColumnWidth(3, 60)   # 时长列
-        self.important_list.cellDoubleClicked.connect(lambda: self.confirm_classification('重要'))
-        self.unimportant_list.cellDoubleClicked.connect(lambda: self.confirm_classification('不重要'))
-        self.important_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.unimportant_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.important_list.customContextMenuRequested.connect(self.show_context_menu)
-        self.unimportant_list.customContextMenuRequested.connect(self.show_context_menu)
+        self.important_list = self.create_recording_view(self.important_proxy, [130, 90, 80, 60])
+        self.important_list.setSelectionMode(QTableView.ExtendedSelection)
+        self.unimportant_list = self.create_recording_view(self.unimportant_proxy, [130, 90, 80, 60])
+        self.unimportant_list.setSelectionMode(QTableView.ExtendedSelection)
+        self.important_list.doubleClicked.connect(lambda: self.confirm_classification('重要', self.important_list))
+        self.unimportant_list.doubleClicked.connect(lambda: self.confirm_classification('不重要', self.unimportant_list))
         classification_layout.addWidget(QLabel("重要 (★)"))
         classification_layout.addWidget(self.important_list)
         classification_layout.addWidget(QLabel("不重要 (○)"))
@@ -192,28 +746,19 @@ class MainWindow(QMainWindow):
         delete_group = QGroupBox("待删除区")
         delete_layout = QVBoxLayout()
         
-        self.delete_list = QTableWidget()
-        self.delete_list.setColumnCount(5)
-        self.delete_list.setHorizontalHeaderLabels(['时间', '号码', '联系人', '时长', '分类'])
-        self.delete_list.setSortingEnabled(True)
-        self.delete_list.setSelectionBehavior(QTableWidget.SelectRows)
-        self.delete_list.setSelectionMode(QTableWidget.ExtendedSelection)  # 多选
-        self.delete_list.horizontalHeader().setStretchLastSection(False)
-        # 设置合理的初始列宽
-        self.delete_list.setColumnWidth(0, 130)  # 时间列
-        self.delete_list.setColumnWidth(1, 90)   # 号码列
-        self.delete_list.setColumnWidth(2, 80)   # 联系人列
-        self.delete_list.setColumnWidth(3, 60)   # 时长列
-        self.delete_list.setColumnWidth(4, 50)   # 分类列
-        self.delete_list.cellDoubleClicked.connect(self.undo_delete)
-        self.delete_list.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.delete_list.customContextMenuRequested.connect(self.show_context_menu)
+        self.delete_list = self.create_recording_view(self.delete_proxy, [130, 90, 80, 60, 50])
+        self.delete_list.setSelectionMode(QTableView.ExtendedSelection)  # 多选
+        self.delete_list.doubleClicked.connect(self.undo_delete)
         self.confirm_delete_btn = QPushButton('确认删除选中录音')
+        self.cancel_delete_btn = QPushButton('取消删除')
+        self.cancel_delete_btn.setVisible(False)
         delete_layout.addWidget(self.delete_list)
         delete_layout.addWidget(self.confirm_delete_btn)
+        delete_layout.addWidget(self.cancel_delete_btn)
         delete_group.setLayout(delete_layout)
 
         self.confirm_delete_btn.clicked.connect(self.confirm_delete)
+        self.cancel_delete_btn.clicked.connect(self.cancel_delete)
 
         middle_layout.addWidget(self.recording_list)
         middle_layout.addWidget(classification_group)
@@ -260,106 +805,282 @@ class MainWindow(QMainWindow):
 
         main_layout.addLayout(bottom_layout)
 
+    def create_recording_view(self, proxy_model, column_widths):
+        view = QTableView()
+        view.setModel(proxy_model)
+        view.setSortingEnabled(True)
+        view.setSelectionBehavior(QTableView.SelectRows)
+        view.horizontalHeader().setStretchLastSection(False)
+        # 设置合理的初始列宽：时间、号码、联系人、时长、分类
+        for column, width in enumerate(column_widths):
+            view.setColumnWidth(column, width)
+        view.setContextMenuPolicy(Qt.CustomContextMenu)
+        view.customContextMenuRequested.connect(self.show_context_menu)
+        # 滚动或行变化后探测新出现在视图中的行的时长
+        view.verticalScrollBar().valueChanged.connect(self.schedule_visible_probe)
+        proxy_model.rowsInserted.connect(self.schedule_visible_probe)
+        proxy_model.layoutChanged.connect(self.schedule_visible_probe)
+        proxy_model.modelReset.connect(self.schedule_visible_probe)
+        return view
+
     def import_recordings(self):
         folder = QFileDialog.getExistingDirectory(self, "选择录音文件夹")
         if folder:
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(0)
-            self.import_worker = ImportWorker(folder, self.recording_manager, self.contact_importer, self.number_classifier)
-            self.import_worker.progress.connect(self.progress_bar.setValue)
+            # 是否增量扫描在真正开始导入时再判断（可能要等正在进行的导入结束）
+            self.start_import(folder, incremental=None)
+
+    def is_current_folder(self, folder):
+        # 重新选择同一文件夹时只做增量扫描，保留已确认的状态
+        return bool(self.recording_manager.recordings) and self.recording_manager.folder_path is not None \
+            and os.path.normcase(os.path.abspath(folder)) == os.path.normcase(os.path.abspath(self.recording_manager.folder_path))
+
+    def rescan_recordings(self):
+        # 增量重新扫描当前文件夹
+        if not self.recording_manager.folder_path:
+            self.import_recordings()
+            return
+        self.start_import(self.recording_manager.folder_path, incremental=True)
+
+    def start_import(self, folder, incremental=False, directories=None):
+        # 所有导入入口都经过这里；已有导入在进行时稍后再试，避免两个导入线程同时修改录音列表
+        if self.import_worker and self.import_worker.isRunning():
+            QTimer.singleShot(500, lambda: self.start_import(folder, incremental, directories))
+            return
+        if incremental is None:
+            incremental = self.is_current_folder(folder)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        known_files = self.recording_manager.known_files(directories) if incremental else None
+        self.import_worker = ImportWorker(folder, self.recording_manager, self.contact_importer, self.number_classifier,
+                                          incremental, directories, self.import_backend_combo.currentData(), known_files)
+        self.import_worker.progress.connect(self.progress_bar.setValue)
+        if incremental:
+            self.recording_manager.folder_path = folder
+            self.import_worker.rescanned.connect(self.on_rescan_finished)
+            self.import_worker.finished.connect(lambda: self.progress_bar.setVisible(False))
+        else:
+            # 收到第一批录音时才清空旧列表，文件夹中没有录音时保持原样
+            self.import_reset_pending = True
+            self.import_worker.batch_ready.connect(self.on_import_batch)
+            self.import_worker.duration_needed.connect(self.probe_classify_durations)
             self.import_worker.finished.connect(self.on_import_finished)
-            self.import_worker.start()
+        self.import_worker.start()
+
+    def on_import_batch(self, recordings):
+        # 逐批追加，不必等待全部解析完成
+        if self.import_reset_pending:
+            self.import_reset_pending = False
+            self.recording_manager.set_recordings([])
+            self.recording_model.reset_recordings([])
+            self.duration_prober.clear()
+        self.recording_manager.add_recordings(recordings)
+        self.recording_model.append_recordings(recordings)
+        self.reapply_search()
 
     def on_import_finished(self):
         self.progress_bar.setVisible(False)
-        self.update_recording_list()
-        self.update_classification_lists()
-        self.update_delete_list()
+        self.import_reset_pending = False
+        self.recording_manager.sort_recordings()
+        self.session_store.set_value('folder_path', self.recording_manager.folder_path)
+        self.probe_unknown_durations()
+        # 导入了其他文件夹时，监视跟随切换
+        if self.folder_watcher and self.folder_watcher.folder_path != self.recording_manager.folder_path:
+            self.start_folder_watch()
+        self.purge_old_trash()
+
+    def rescan_directories(self, directories):
+        # 增量导入指定文件夹；正在导入时由 start_import 稍后再试
+        self.start_import(self.recording_manager.folder_path, incremental=True, directories=directories)
+
+    def restore_scan_options(self):
+        max_depth = self.session_store.get_value('scan_max_depth')
+        self.recording_manager.set_scan_options(
+            parse_patterns(self.session_store.get_value('scan_include')),
+            parse_patterns(self.session_store.get_value('scan_exclude')),
+            int(max_depth) if max_depth else None)
+
+    def edit_scan_options(self):
+        # 修改后在下次导入或重新扫描时生效
+        manager = self.recording_manager
+        dialog = ScanOptionsDialog(manager.include_patterns, manager.exclude_patterns, manager.max_depth, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        include_patterns, exclude_patterns, max_depth = dialog.options()
+        manager.set_scan_options(include_patterns, exclude_patterns, max_depth)
+        self.session_store.set_value('scan_include', ';'.join(include_patterns))
+        self.session_store.set_value('scan_exclude', ';'.join(exclude_patterns))
+        self.session_store.set_value('scan_max_depth', '' if max_depth is None else str(max_depth))
+        # 监视的文件夹按新的排除规则和深度重新确定
+        if self.folder_watcher:
+            self.start_folder_watch()
+
+    def toggle_folder_watch(self, checked):
+        if not checked:
+            self.stop_folder_watch()
+            return
+        if not self.recording_manager.folder_path:
+            QMessageBox.information(self, "监视文件夹", "请先导入录音文件夹")
+            self.watch_folder_btn.setChecked(False)
+            return
+        self.start_folder_watch()
+
+    def start_folder_watch(self):
+        self.stop_folder_watch()
+        self.folder_watcher = FolderWatcher(self.recording_manager.folder_scanner(self.recording_manager.folder_path), parent=self)
+        self.folder_watcher.directories_changed.connect(self.on_watched_directories_changed)
+        self.folder_watcher.start()
+
+    def stop_folder_watch(self):
+        if self.folder_watcher:
+            self.folder_watcher.stop()
+            self.folder_watcher.deleteLater()
+            self.folder_watcher = None
+        self.pending_watch_dirs.clear()
+
+    def on_watched_directories_changed(self, directories):
+        # 只增量导入发生变化的文件夹；正在导入时先记下，稍后处理
+        self.pending_watch_dirs.update(directories)
+        self.flush_watch_changes()
+
+    def flush_watch_changes(self):
+        if not self.pending_watch_dirs or not self.folder_watcher:
+            return
+        if self.import_worker and self.import_worker.isRunning():
+            QTimer.singleShot(500, self.flush_watch_changes)
+            return
+        directories = sorted(self.pending_watch_dirs)
+        self.pending_watch_dirs.clear()
+        self.start_import(self.folder_watcher.folder_path, incremental=True, directories=directories)
+
+    def on_rescan_finished(self, new_recordings, removed_paths):
+        # 在主线程应用增量：未变化录音的确认状态和分类保持不变，只对变化的录音增删表格行
+        # 先分类再加入，add_recordings 记入会话日志的就是分类后的状态；这里只需再写元信息缓存
+        manager = self.recording_manager
+        pending = []
+        manager.classify_recordings(self.contact_importer.contacts, self.number_classifier, new_recordings, pending=pending)
+        removed_recordings = manager.apply_changes(new_recordings, removed_paths)
+        self.hash_cache.remove(removed_paths)  # 已不存在的文件不再保留哈希
+        if manager.metadata_cache is not None:
+            manager.metadata_cache.store(new_recordings)
+        self.recording_model.remove_recordings(removed_recordings)
+        self.recording_model.append_recordings(new_recordings)
+        self.reapply_search()
+        if pending:
+            self.probe_classify_durations(pending)
+        self.duration_prober.enqueue(new_recordings, PRIORITY_BACKGROUND)
+
+    def schedule_visible_probe(self, *args):
+        self.visible_probe_timer.start()  # 重新计时
+
+    def probe_visible_durations(self):
+        # 各表格当前可见的行优先探测
+        visible_recordings = []
+        for view in [self.recording_list, self.important_list, self.unimportant_list, self.delete_list]:
+            model = view.model()
+            row_count = model.rowCount()
+            if row_count == 0:
+                continue
+            first_row = max(view.rowAt(0), 0)
+            last_row = view.rowAt(view.viewport().height() - 1)
+            if last_row < 0:
+                last_row = row_count - 1
+            for row in range(first_row, last_row + 1):
+                rec = self.recording_manager.get_recording(model.index(row, 0).data(ID_ROLE))
+                if rec is not None and not rec.duration_known:
+                    visible_recordings.append(rec)
+        if visible_recordings:
+            self.duration_prober.enqueue(visible_recordings, PRIORITY_VISIBLE)
+
+    def probe_classify_durations(self, recordings):
+        self.duration_prober.enqueue(recordings, PRIORITY_CLASSIFY)
+
+    def probe_unknown_durations(self):
+        # 其余未知时长的录音按时间从新到旧在后台探测
+        unknown_recordings = [rec for rec in self.recording_manager.recordings if not rec.duration_known]
+        unknown_recordings.sort(key=lambda rec: rec.call_timestamp, reverse=True)
+        self.duration_prober.enqueue(unknown_recordings, PRIORITY_BACKGROUND)
+
+    def on_durations_ready(self, results):
+        self.probed_durations.extend(results)
+        if not self.durations_timer.isActive():
+            self.durations_timer.start()  # 不重新计时，持续探测时也按固定间隔刷新
+
+    def apply_probed_durations(self):
+        # 只处理仍在列表中的录音（期间可能已被删除或重新导入）
+        results = self.probed_durations
+        self.probed_durations = []
+        probed_recordings = []
+        for rec, duration in results:
+            if self.recording_manager.get_recording(rec.id) is rec:
+                rec.duration = duration
+                probed_recordings.append(rec)
+        if not probed_recordings:
+            return
+        # 时长已知后按时长规则重新分类，并写入缓存
+        self.recording_manager.classify_recordings(self.contact_importer.contacts, self.number_classifier, probed_recordings)
+        self.recording_manager.save_to_cache(probed_recordings)
+        self.recording_model.recordings_changed(probed_recordings, DURATION_COLUMN, CLASSIFICATION_COLUMN,
+                                                [Qt.DisplayRole, SORT_ROLE])
 
     def import_contacts(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "选择通讯录文件", "", "VCF files (*.vcf)")
         if file_path:
-            self.contact_importer.import_vcf(file_path)
-            # 重新分类
-            if self.recording_manager.recordings:
-                self.recording_manager.classify_recordings(self.contact_importer.contacts, self.number_classifier)
-                self.update_recording_list()
-                self.update_classification_lists()
-
-    def update_recording_list(self):
-        self.recording_list.setRowCount(0)
-        for rec in self.recording_manager.recordings:
-            row = self.recording_list.rowCount()
-            self.recording_list.insertRow(row)
-            
-            # 时间
-            time_item = QTableWidgetItem(rec.call_time.strftime('%Y-%m-%d %H:%M:%S'))
-            self.recording_list.setItem(row, 0, time_item)
-            
-            # 号码
-            phone_item = QTableWidgetItem(rec.phone_number)
-            self.recording_list.setItem(row, 1, phone_item)
-            
-            # 联系人
-            contact_item = QTableWidgetItem(self.get_contact_name(rec.phone_number))
-            self.recording_list.setItem(row, 2, contact_item)
-            
-            # 时长
-            duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-            duration_item = QTableWidgetItem(duration_str)
-            self.recording_list.setItem(row, 3, duration_item)
-            
-            # 分类
-            classification_item = QTableWidgetItem(rec.classification)
-            self.recording_list.setItem(row, 4, classification_item)
-        
-        # 重新应用搜索高亮
-        if self.search_input.text().strip():
-            self.perform_search(self.search_input.text())
+            self.start_contact_import(file_path)
+
+    def start_contact_import(self, file_path):
+        # 大通讯录在后台线程逐行解析，界面不卡顿
+        self.import_contacts_btn.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.contact_worker = ContactImportWorker(file_path, self.contact_importer, self.contact_cache)
+        self.contact_worker.progress.connect(self.progress_bar.setValue)
+        self.contact_worker.contacts_ready.connect(self.on_contacts_imported)
+        self.contact_worker.failed.connect(self.on_contacts_import_failed)
+        self.contact_worker.start()
+
+    def on_contacts_imported(self, contacts, changed_phones):
+        self.import_contacts_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.contact_importer.contacts = contacts
+        # 只重新分类联系人有变化的号码
+        pending = []
+        affected_recordings = self.recording_manager.apply_contact_changes(
+            contacts, changed_phones, self.number_classifier, pending)
+        self.recording_manager.save_to_cache(affected_recordings)
+        self.recording_model.recordings_changed(affected_recordings)
+        self.reapply_search()
+        self.probe_classify_durations(pending)
+
+    def on_contacts_import_failed(self, message):
+        self.import_contacts_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        QMessageBox.warning(self, "导入失败", f"无法读取通讯录：\n{message}")
 
-    def update_classification_lists(self):
-        self.important_list.setRowCount(0)
-        self.unimportant_list.setRowCount(0)
-        for rec in self.recording_manager.recordings:
-            if not rec.confirmed:
-                contact_name = self.get_contact_name(rec.phone_number)
-                duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-                
-                if rec.classification == '重要':
-                    row = self.important_list.rowCount()
-                    self.important_list.insertRow(row)
-                    
-                    time_item = QTableWidgetItem(rec.call_time.strftime('%Y-%m-%d %H:%M:%S'))
-                    self.important_list.setItem(row, 0, time_item)
-                    
-                    phone_item = QTableWidgetItem(rec.phone_number)
-                    self.important_list.setItem(row, 1, phone_item)
-                    
-                    contact_item = QTableWidgetItem(contact_name)
-                    self.important_list.setItem(row, 2, contact_item)
-                    
-                    duration_item = QTableWidgetItem(duration_str)
-                    self.important_list.setItem(row, 3, duration_item)
-                    
-                elif rec.classification == '不重要':
-                    row = self.unimportant_list.rowCount()
-                    self.unimportant_list.insertRow(row)
-                    
-                    time_item = QTableWidgetItem(rec.call_time.strftime('%Y-%m-%d %H:%M:%S'))
-                    self.unimportant_list.setItem(row, 0, time_item)
-                    
-                    phone_item = QTableWidgetItem(rec.phone_number)
-                    self.unimportant_list.setItem(row, 1, phone_item)
-                    
-                    contact_item = QTableWidgetItem(contact_name)
-                    self.unimportant_list.setItem(row, 2, contact_item)
-                    
-                    duration_item = QTableWidgetItem(duration_str)
-                    self.unimportant_list.setItem(row, 3, duration_item)
-        
-        # 重新应用搜索高亮
-        if self.search_input.text().strip():
-            self.perform_search(self.search_input.text())
+    def import_number_database(self):
+        # 导入号码前缀库（运营商号段、骚扰号码等），按最长前缀匹配分类
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择号码库文件", "", "号码库 (*.csv *.db *.sqlite *.sqlite3)")
+        if not file_path:
+            return
+        try:
+            count = self.number_classifier.load_database(file_path)
+        except Exception as e:
+            QMessageBox.warning(self, "导入失败", f"无法读取号码库：\n{str(e)}")
+            return
+        # 重新分类
+        pending = []
+        changed_recordings = self.recording_manager.classify_recordings(self.contact_importer.contacts, self.number_classifier, pending=pending)
+        self.recording_manager.save_to_cache(changed_recordings)
+        self.recording_model.recordings_changed(changed_recordings)
+        self.reapply_search()
+        self.probe_classify_durations(pending)
+        QMessageBox.information(self, "导入完成", f"已导入 {count} 条号码前缀")
+
+    def selected_recordings(self, view, model_indexes=None):
+        # 视图中选中行对应的录音：每行带有录音 ID，直接查索引
+        if model_indexes is None:
+            model_indexes = view.selectionModel().selectedRows()
+        recordings = (self.recording_manager.get_recording(index.data(ID_ROLE)) for index in model_indexes)
+        return [rec for rec in recordings if rec is not None]
 
     def get_contact_name(self, phone):
         if phone in self.contact_importer.contacts:
@@ -368,30 +1089,50 @@ class MainWindow(QMainWindow):
 
     def play_recording(self, item):
         # 获取录音路径
-        row = self.recording_list.currentRow()
-        if row >= 0:
-            rec = self.recording_manager.recordings[row]
-            self.current_recording = rec
+        index = self.recording_list.currentIndex()
+        if index.isValid():
+            self.play_recording_file(self.selected_recordings(self.recording_list, [index])[0])
 
-            try:
-                # 检查文件是否存在
-                if not os.path.exists(rec.file_path):
-                    QMessageBox.warning(self, "播放失败", f"音频文件不存在：\n{rec.file_path}")
-                    return
+    def play_recording_file(self, rec):
+        self.current_recording = rec
+        try:
+            # 检查文件是否存在
+            if not os.path.exists(rec.file_path):
+                QMessageBox.warning(self, "播放失败", f"音频文件不存在：\n{rec.file_path}")
+                return
 
-                # 设置媒体
-                media_url = QUrl.fromLocalFile(rec.file_path)
-                self.media_player.setMedia(QMediaContent(media_url))
+            # 设置媒体
+            from PyQt5.QtMultimedia import QMediaContent
+            media_url = QUrl.fromLocalFile(rec.file_path)
+            self.ensure_media_player().setMedia(QMediaContent(media_url))
 
-                # 开始播放
-                self.media_player.play()
-                self.play_pause_btn.setText('⏸️')
+            # 开始播放
+            self.media_player.play()
+            self.play_pause_btn.setText('⏸️')
+
+            # 更新播放信息
+            contact_name = self.get_contact_name(rec.phone_number)
+            self.current_playing_label.setText(f"当前播放：{rec.call_time.strftime('%Y-%m-%d %H:%M:%S')} | {rec.phone_number} | {contact_name}")
+
+        except Exception as e:
+            QMessageBox.warning(self, "播放失败", f"播放过程中发生错误：\n{str(e)}\n\n文件：{rec.file_path}")
 
-            except Exception as e:
-                QMessageBox.warning(self, "播放失败", f"播放过程中发生错误：\n{str(e)}\n\n文件：{rec.file_path}")
+    def ensure_media_player(self):
+        # QtMultimedia 及其后端插件加载较慢，启动时不导入
+        if self.media_player is None:
+            from PyQt5.QtMultimedia import QMediaPlayer
+            self.media_player = QMediaPlayer()
+            self.media_player.positionChanged.connect(self.update_position)
+            self.media_player.durationChanged.connect(self.update_duration)
+            self.media_player.stateChanged.connect(self.update_playing_status)
+            self.media_player.error.connect(self.handle_media_error)
+        return self.media_player
 
     def play_pause(self):
-        if self.media_player.state() == QMediaPlayer.PlayingState:
+        if self.media_player is None:
+            # 还没有播放过录音
+            return
+        if self.media_player.state() == self.media_player.PlayingState:
             self.media_player.pause()
             self.play_pause_btn.setText('▶️')
         else:
@@ -403,16 +1144,21 @@ class MainWindow(QMainWindow):
                 self.current_playing_label.setText(f"当前播放：{self.current_recording.call_time.strftime('%Y-%m-%d %H:%M:%S')} | {self.current_recording.phone_number} | {contact_name}")
 
     def rewind(self):
+        if self.media_player is None:
+            return
         current_pos = self.media_player.position()
         self.media_player.setPosition(max(0, current_pos - 10000))  # 10秒
 
     def fast_forward(self):
+        if self.media_player is None:
+            return
         current_pos = self.media_player.position()
         duration = self.media_player.duration()
         self.media_player.setPosition(min(duration, current_pos + 10000))  # 10秒
 
     def set_position(self, position):
-        self.media_player.setPosition(position)
+        if self.media_player is not None:
+            self.media_player.setPosition(position)
 
     def update_position(self, position):
         self.position_slider.setValue(position)
@@ -423,7 +1169,7 @@ class MainWindow(QMainWindow):
         self.total_time_label.setText(self.format_time(duration))
 
     def update_playing_status(self, state):
-        if state == QMediaPlayer.StoppedState:
+        if state == self.media_player.StoppedState:
             self.current_playing_label.setText("当前播放：无")
             self.play_pause_btn.setText('▶️')
 
@@ -445,134 +1191,154 @@ class MainWindow(QMainWindow):
             return f"{minutes:02d}:{seconds:02d}"
 
     def export_results(self):
-        # 导出为JSON
-        import json
-        results = []
-        for rec in self.recording_manager.recordings:
-            results.append({
-                'file_path': rec.file_path,
-                'phone_number': rec.phone_number,
-                'call_time': rec.call_time.isoformat(),
-                'duration': rec.duration,
-                'classification': rec.classification
-            })
-        with open('recording_results.json', 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-
-    def confirm_classification(self, classification):
-        # 获取当前选中的rows
-        sender = self.sender()
-        selected_rows = set()
-        if sender == self.important_list:
-            selected_rows = set(index.row() for index in self.important_list.selectionModel().selectedRows())
-        elif sender == self.unimportant_list:
-            selected_rows = set(index.row() for index in self.unimportant_list.selectionModel().selectedRows())
-        
-        for row in selected_rows:
-            # 从表格获取数据
-            if sender == self.important_list:
-                time_str = self.important_list.item(row, 0).text()
-                phone = self.important_list.item(row, 1).text()
-                contact_name = self.important_list.item(row, 2).text()
-            elif sender == self.unimportant_list:
-                time_str = self.unimportant_list.item(row, 0).text()
-                phone = self.unimportant_list.item(row, 1).text()
-                contact_name = self.unimportant_list.item(row, 2).text()
-            
-            # 找到对应的recording
-            for rec in self.recording_manager.recordings:
-                if not rec.confirmed and rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    rec.confirmed = True
+        # 导出为 NDJSON/CSV/SQLite（按扩展名），在后台线程逐条写出
+        if self.export_worker and self.export_worker.isRunning():
+            return
+        default_dir = self.recording_manager.folder_path or os.getcwd()
+        dialog = ExportDialog(os.path.join(default_dir, 'recording_results.ndjson'), self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        file_path, classifications, start_time, end_time = dialog.options()
+        if not file_path:
+            return
+        if classifications is not None and not classifications:
+            QMessageBox.information(self, "导出结果", "请至少选择一个分类")
+            return
+
+        self.export_results_btn.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.export_worker = ExportWorker(self.recording_manager, file_path, classifications, start_time, end_time)
+        self.export_worker.progress.connect(self.progress_bar.setValue)
+        self.export_worker.finished.connect(lambda count: self.on_export_finished(file_path, count))
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.start()
+
+    def on_export_finished(self, file_path, count):
+        self.export_results_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        QMessageBox.information(self, "导出完成", f"已导出 {count} 条录音到：\n{file_path}")
+
+    def on_export_failed(self, message):
+        self.export_results_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        QMessageBox.warning(self, "导出失败", f"无法写入导出文件：\n{message}")
+
+    def find_duplicates(self):
+        # 后台按大小、首尾哈希、完整哈希逐步筛选内容相同的录音
+        if self.duplicate_worker and self.duplicate_worker.isRunning():
+            return
+        if not self.recording_manager.recordings:
+            QMessageBox.information(self, "查找重复", "请先导入录音文件夹")
+            return
+        self.find_duplicates_btn.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.duplicate_worker = DuplicateWorker(self.recording_manager, self.hash_cache)
+        self.duplicate_worker.progress.connect(self.progress_bar.setValue)
+        self.duplicate_worker.finished.connect(self.on_duplicates_found)
+        self.duplicate_worker.start()
+
+    def on_duplicates_found(self, groups):
+        self.find_duplicates_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        # 查找期间已被删除或移除的录音不再显示
+        groups = [[rec for rec in group if self.recording_manager.get_recording(rec.id) is rec] for group in groups]
+        groups = [group for group in groups if len(group) > 1]
+        if not groups:
+            QMessageBox.information(self, "查找重复", "没有找到内容相同的录音")
+            return
+        dialog = DuplicatesDialog(groups, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        self.move_to_delete_list(dialog.checked_recordings())
+
+    def analyze_recordings(self):
+        # 分析尚待人工确认的录音，几乎没有声音的归入不重要；已分析过且文件未变化的直接用缓存
+        if self.analysis_worker and self.analysis_worker.isRunning():
+            return
+        recordings = [rec for rec in self.recording_manager.recordings
+                      if not rec.confirmed and rec.features is None and rec.classification == '待确认']
+        if not recordings:
+            QMessageBox.information(self, "分析内容", "没有需要分析的录音")
+            return
+        self.analyze_btn.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.analysis_worker = AnalysisWorker(recordings)
+        self.analysis_worker.progress.connect(self.progress_bar.setValue)
+        self.analysis_worker.finished.connect(self.on_analysis_finished)
+        self.analysis_worker.failed.connect(self.on_analysis_failed)
+        self.analysis_worker.start()
+
+    def on_analysis_finished(self, results, undecodable):
+        self.analyze_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        analyzed_recordings = []
+        for rec, features in results:
+            if self.recording_manager.get_recording(rec.id) is rec:
+                rec.features = features
+                analyzed_recordings.append(rec)
+        self.recording_manager.save_features(analyzed_recordings)
+        # 时长尚未读取的录音等探测完成后再按规则分类
+        pending = []
+        changed_recordings = self.recording_manager.classify_recordings(
+            self.contact_importer.contacts, self.number_classifier, analyzed_recordings, pending=pending)
+        if pending:
+            self.probe_classify_durations(pending)
+        self.recording_manager.save_to_cache(changed_recordings)
+        self.recording_model.recordings_changed(changed_recordings)
+        empty_count = sum(1 for rec in analyzed_recordings if is_empty_call(rec.features))
+        msg = f"已分析 {len(analyzed_recordings)} 条录音，其中 {empty_count} 条几乎没有声音"
+        if undecodable:
+            msg += f"\n另有 {undecodable} 条无法解码（非 WAV 格式需要安装 ffmpeg）"
+        QMessageBox.information(self, "分析完成", msg)
+
+    def on_analysis_failed(self, message):
+        self.analyze_btn.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        QMessageBox.warning(self, "分析失败", f"无法分析录音内容：\n{message}")
+
+    def confirm_classification(self, classification, view):
+        # 将选中的录音确认分类并移至待删除区
+        self.move_to_delete_list(self.selected_recordings(view), classification)
+
+    def move_to_delete_list(self, recordings, classification=None):
+        # 不指定分类时保留录音原来的分类
+        changed_recordings = []
+        for rec in recordings:
+            if not rec.confirmed:
+                rec.confirmed = True
+                if classification is not None:
                     rec.classification = classification
-                    break
-            
-            # 添加到待删除区
-            delete_row = self.delete_list.rowCount()
-            self.delete_list.insertRow(delete_row)
-            
-            time_item = QTableWidgetItem(time_str)
-            self.delete_list.setItem(delete_row, 0, time_item)
-            
-            phone_item = QTableWidgetItem(phone)
-            self.delete_list.setItem(delete_row, 1, phone_item)
-            
-            contact_item = QTableWidgetItem(contact_name)
-            self.delete_list.setItem(delete_row, 2, contact_item)
-            
-            # 查找时长
-            duration_str = "00:00:00"
-            for rec in self.recording_manager.recordings:
-                if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-                    break
-            
-            duration_item = QTableWidgetItem(duration_str)
-            self.delete_list.setItem(delete_row, 3, duration_item)
-            
-            classification_item = QTableWidgetItem(classification)
-            self.delete_list.setItem(delete_row, 4, classification_item)
-            
-            # 从原列表移除（需要反向删除以保持索引正确）
-        
-        # 重新填充原列表以移除选中的行
-        self.update_classification_lists()
-        
-        # 更新录音列表
-        self.update_recording_list()
+                changed_recordings.append(rec)
+
+        # 保存确认状态，代理模型按行自动移动到待删除区
+        self.recording_manager.save_to_cache(changed_recordings)
+        self.recording_model.recordings_changed(changed_recordings)
 
     def undo_delete(self):
         # 从待删除区移出
-        row = self.delete_list.currentRow()
-        if row < 0:
+        index = self.delete_list.currentIndex()
+        if not index.isValid():
             return
-            
-        time_str = self.delete_list.item(row, 0).text()
-        phone = self.delete_list.item(row, 1).text()
-        contact_name = self.delete_list.item(row, 2).text()
-        classification = self.delete_list.item(row, 4).text()
-        
-        # 找到recording
-        for rec in self.recording_manager.recordings:
-            if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
+        self.restore_from_delete_list(self.selected_recordings(self.delete_list, [index]))
+
+    def restore_from_delete_list(self, recordings):
+        # 移回原分类区，分类保持确认时的选择
+        changed_recordings = []
+        for rec in recordings:
+            if rec.confirmed:
                 rec.confirmed = False
-                rec.classification = classification
-                break
-        
-        # 移回分类列表
-        duration_str = "00:00:00"
-        for rec in self.recording_manager.recordings:
-            if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-                break
-        
-        if classification == '重要':
-            important_row = self.important_list.rowCount()
-            self.important_list.insertRow(important_row)
-            
-            self.important_list.setItem(important_row, 0, QTableWidgetItem(time_str))
-            self.important_list.setItem(important_row, 1, QTableWidgetItem(phone))
-            self.important_list.setItem(important_row, 2, QTableWidgetItem(contact_name))
-            self.important_list.setItem(important_row, 3, QTableWidgetItem(duration_str))
-            
-        elif classification == '不重要':
-            unimportant_row = self.unimportant_list.rowCount()
-            self.unimportant_list.insertRow(unimportant_row)
-            
-            self.unimportant_list.setItem(unimportant_row, 0, QTableWidgetItem(time_str))
-            self.unimportant_list.setItem(unimportant_row, 1, QTableWidgetItem(phone))
-            self.unimportant_list.setItem(unimportant_row, 2, QTableWidgetItem(contact_name))
-            self.unimportant_list.setItem(unimportant_row, 3, QTableWidgetItem(duration_str))
-        
-        # 从待删除区移除
-        self.delete_list.removeRow(row)
-        
-        # 更新录音列表
-        self.update_recording_list()
+                changed_recordings.append(rec)
+
+        self.recording_manager.save_to_cache(changed_recordings)
+        self.recording_model.recordings_changed(changed_recordings)
 
     def show_context_menu(self, position):
         # 右键菜单，支持单选和多选操作
         sender = self.sender()
-        if isinstance(sender, QTableWidget):
+        if isinstance(sender, QTableView):
             selected_rows = sender.selectionModel().selectedRows()
             if not selected_rows:
                 return
@@ -610,50 +1376,11 @@ class MainWindow(QMainWindow):
             
             menu.exec_(sender.mapToGlobal(position))
 
-    def play_recording_from_context(self, table_widget, model_index):
+    def play_recording_from_context(self, view, model_index):
         # 从右键菜单播放录音
-        row = model_index.row()
-        
-        if table_widget == self.recording_list:
-            # 录音列表：时间 | 号码 | 联系人 | 时长 | 分类
-            time_str = table_widget.item(row, 0).text()
-            phone = table_widget.item(row, 1).text()
-        elif table_widget in [self.important_list, self.unimportant_list]:
-            # 分类区：时间 | 号码 | 联系人 | 时长
-            time_str = table_widget.item(row, 0).text()
-            phone = table_widget.item(row, 1).text()
-        elif table_widget == self.delete_list:
-            # 待删除区：时间 | 号码 | 联系人 | 时长 | 分类
-            time_str = table_widget.item(row, 0).text()
-            phone = table_widget.item(row, 1).text()
-        else:
-            return
-            
-        # 查找并播放录音
-        for rec in self.recording_manager.recordings:
-            if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                self.current_recording = rec
-                try:
-                    # 检查文件是否存在
-                    if not os.path.exists(rec.file_path):
-                        QMessageBox.warning(self, "播放失败", f"音频文件不存在：\n{rec.file_path}")
-                        return
-
-                    # 设置媒体
-                    media_url = QUrl.fromLocalFile(rec.file_path)
-                    self.media_player.setMedia(QMediaContent(media_url))
-
-                    # 开始播放
-                    self.media_player.play()
-                    self.play_pause_btn.setText('⏸️')
-
-                    # 更新播放信息
-                    contact_name = self.get_contact_name(rec.phone_number)
-                    self.current_playing_label.setText(f"当前播放：{rec.call_time.strftime('%Y-%m-%d %H:%M:%S')} | {rec.phone_number} | {contact_name}")
-
-                except Exception as e:
-                    QMessageBox.warning(self, "播放失败", f"播放过程中发生错误：\n{str(e)}\n\n文件：{rec.file_path}")
-                break
+        recordings = self.selected_recordings(view, [model_index])
+        if recordings:
+            self.play_recording_file(recordings[0])
 
     def play_selected_recordings(self, table_widget, selected_rows):
         # 播放第一个选中的录音，并取消多选
@@ -669,181 +1396,70 @@ class MainWindow(QMainWindow):
             classification = '重要'
         elif sender == self.unimportant_list:
             classification = '不重要'
-            
-        for model_index in selected_rows:
-            row = model_index.row()
-            # 从表格获取数据
-            if sender == self.important_list:
-                time_str = self.important_list.item(row, 0).text()
-                phone = self.important_list.item(row, 1).text()
-                contact_name = self.important_list.item(row, 2).text()
-            elif sender == self.unimportant_list:
-                time_str = self.unimportant_list.item(row, 0).text()
-                phone = self.unimportant_list.item(row, 1).text()
-                contact_name = self.unimportant_list.item(row, 2).text()
-            
-            # 找到对应的recording
-            for rec in self.recording_manager.recordings:
-                if not rec.confirmed and rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    rec.confirmed = True
-                    rec.classification = classification
-                    break
-            
-            # 添加到待删除区
-            delete_row = self.delete_list.rowCount()
-            self.delete_list.insertRow(delete_row)
-            
-            self.delete_list.setItem(delete_row, 0, QTableWidgetItem(time_str))
-            self.delete_list.setItem(delete_row, 1, QTableWidgetItem(phone))
-            self.delete_list.setItem(delete_row, 2, QTableWidgetItem(contact_name))
-            
-            # 查找时长
-            duration_str = "00:00:00"
-            for rec in self.recording_manager.recordings:
-                if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-                    break
-            
-            self.delete_list.setItem(delete_row, 3, QTableWidgetItem(duration_str))
-            self.delete_list.setItem(delete_row, 4, QTableWidgetItem(classification))
-        
-        # 重新填充原列表以移除选中的行
-        self.update_classification_lists()
-        
-        # 更新录音列表
-        self.update_recording_list()
+        self.move_to_delete_list(self.selected_recordings(sender, selected_rows), classification)
 
     def batch_delete_selected(self, selected_rows):
         # 批量删除选中的录音
-        for model_index in selected_rows:
-            row = model_index.row()
-            time_str = self.delete_list.item(row, 0).text()
-            phone = self.delete_list.item(row, 1).text()
-            
-            # 找到recording并删除文件
-            for rec in self.recording_manager.recordings:
-                if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    try:
-                        os.remove(rec.file_path)
-                    except:
-                        pass  # 文件可能已删除
-                    break
-        
-        # 重新更新所有列表
-        self.recording_manager.recordings = [rec for rec in self.recording_manager.recordings if os.path.exists(rec.file_path)]
-        self.update_recording_list()
-        self.update_classification_lists()
-        self.update_delete_list()
+        self.start_delete(self.selected_recordings(self.delete_list, selected_rows))
 
     def batch_undo_selection(self, selected_rows):
         # 批量撤销选择操作，将录音从待删除区移回原分类区
-        for model_index in selected_rows:
-            # 直接处理每个选中的行
-            row = model_index.row()
-            time_str = self.delete_list.item(row, 0).text()
-            phone = self.delete_list.item(row, 1).text()
-            contact_name = self.delete_list.item(row, 2).text()
-            classification = self.delete_list.item(row, 4).text()
-            
-            # 找到recording
-            for rec in self.recording_manager.recordings:
-                if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    rec.confirmed = False
-                    rec.classification = classification
-                    break
-            
-            # 移回分类列表
-            duration_str = "00:00:00"
-            for rec in self.recording_manager.recordings:
-                if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-                    break
-            
-            if classification == '重要':
-                important_row = self.important_list.rowCount()
-                self.important_list.insertRow(important_row)
-                
-                self.important_list.setItem(important_row, 0, QTableWidgetItem(time_str))
-                self.important_list.setItem(important_row, 1, QTableWidgetItem(phone))
-                self.important_list.setItem(important_row, 2, QTableWidgetItem(contact_name))
-                self.important_list.setItem(important_row, 3, QTableWidgetItem(duration_str))
-                
-            elif classification == '不重要':
-                unimportant_row = self.unimportant_list.rowCount()
-                self.unimportant_list.insertRow(unimportant_row)
-                
-                self.unimportant_list.setItem(unimportant_row, 0, QTableWidgetItem(time_str))
-                self.unimportant_list.setItem(unimportant_row, 1, QTableWidgetItem(phone))
-                self.unimportant_list.setItem(unimportant_row, 2, QTableWidgetItem(contact_name))
-                self.unimportant_list.setItem(unimportant_row, 3, QTableWidgetItem(duration_str))
-        
-        # 重新填充待删除区以移除选中的行
-        self.update_delete_list()
-        
-    def update_delete_list(self):
-        # 更新待删除区列表
-        self.delete_list.setRowCount(0)
-        for rec in self.recording_manager.recordings:
-            if rec.confirmed:
-                row = self.delete_list.rowCount()
-                self.delete_list.insertRow(row)
-                
-                time_item = QTableWidgetItem(rec.call_time.strftime('%Y-%m-%d %H:%M:%S'))
-                self.delete_list.setItem(row, 0, time_item)
-                
-                phone_item = QTableWidgetItem(rec.phone_number)
-                self.delete_list.setItem(row, 1, phone_item)
-                
-                contact_item = QTableWidgetItem(self.get_contact_name(rec.phone_number))
-                self.delete_list.setItem(row, 2, contact_item)
-                
-                duration_str = f"{int(rec.duration // 3600):02d}:{int((rec.duration % 3600) // 60):02d}:{int(rec.duration % 60):02d}"
-                duration_item = QTableWidgetItem(duration_str)
-                self.delete_list.setItem(row, 3, duration_item)
-                
-                classification_item = QTableWidgetItem(rec.classification)
-                self.delete_list.setItem(row, 4, classification_item)
+        self.restore_from_delete_list(self.selected_recordings(self.delete_list, selected_rows))
 
     def confirm_delete(self):
         # 如果没有选中任何项，则默认删除待删除区中的所有项目
         selected_rows = self.delete_list.selectionModel().selectedRows()
         if not selected_rows:
             # 删除所有行
-            selected_rows = [self.delete_list.model().index(row, 0) for row in range(self.delete_list.rowCount())]
+            selected_rows = [self.delete_proxy.index(row, 0) for row in range(self.delete_proxy.rowCount())]
 
-        failed_deletions = []
-        for model_index in selected_rows:
-            row = model_index.row()
-            time_str = self.delete_list.item(row, 0).text()
-            phone = self.delete_list.item(row, 1).text()
-            
-            # 找到recording并删除文件
-            for rec in self.recording_manager.recordings:
-                if rec.phone_number == phone and rec.call_time.strftime('%Y-%m-%d %H:%M:%S') == time_str:
-                    # 如果正在播放此文件，先停止播放以避免 Windows 文件锁定
-                    try:
-                        if self.current_recording and os.path.abspath(rec.file_path) == os.path.abspath(self.current_recording.file_path):
-                            if self.media_player.state() == QMediaPlayer.PlayingState:
-                                self.media_player.stop()
-                                self.play_pause_btn.setText('▶️')
-                    except Exception:
-                        pass
+        self.start_delete(self.selected_recordings(self.delete_list, selected_rows), show_result=bool(selected_rows))
 
-                    try:
-                        os.remove(rec.file_path)
-                    except Exception as e:
-                        # 记录删除失败以便提示用户
-                        failed_deletions.append((rec.file_path, str(e)))
-                    break
-        
-        # 重新更新所有列表
-        self.recording_manager.recordings = [rec for rec in self.recording_manager.recordings if os.path.exists(rec.file_path)]
-        self.update_recording_list()
-        self.update_classification_lists()
-        self.update_delete_list()
+    def start_delete(self, recordings, show_result=False):
+        # 在后台线程分批并行删除文件，界面逐批移除对应的行
+        if not recordings or (self.delete_worker and self.delete_worker.isRunning()):
+            return
+        # 如果正在播放其中的文件，先停止播放以避免 Windows 文件锁定
+        try:
+            if self.current_recording and any(rec.id == self.current_recording.id for rec in recordings):
+                if self.media_player is not None and self.media_player.state() == self.media_player.PlayingState:
+                    self.media_player.stop()
+                    self.play_pause_btn.setText('▶️')
+        except Exception:
+            pass
+
+        self.confirm_delete_btn.setEnabled(False)
+        self.cancel_delete_btn.setVisible(True)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        # 移入录音文件夹下的回收站（重命名），可在回收站中恢复
+        self.delete_worker = DeleteWorker(recordings, self.current_trash())
+        self.delete_worker.progress.connect(self.progress_bar.setValue)
+        self.delete_worker.deleted.connect(self.on_recordings_deleted)
+        self.delete_worker.finished.connect(lambda failed, cancelled: self.on_delete_finished(failed, cancelled, show_result))
+        self.delete_worker.start()
+
+    def cancel_delete(self):
+        if self.delete_worker and self.delete_worker.isRunning():
+            self.delete_worker.cancel()
+
+    def on_recordings_deleted(self, recordings):
+        # 只移除已删除的录音（按 ID），不必逐个检查其余文件是否存在
+        removed_recordings = self.recording_manager.remove_recordings(recordings)
+        removed_paths = [rec.file_path for rec in removed_recordings]
+        self.recording_manager.remove_from_cache(removed_paths)
+        self.hash_cache.remove(removed_paths)
+        self.recording_model.remove_recordings(removed_recordings)
+
+    def on_delete_finished(self, failed_deletions, cancelled, show_result):
+        self.confirm_delete_btn.setEnabled(True)
+        self.cancel_delete_btn.setVisible(False)
+        self.progress_bar.setVisible(False)
 
         # 提示删除结果
-        if failed_deletions:
+        if cancelled:
+            QMessageBox.information(self, "删除已取消", "已停止删除，尚未删除的录音仍保留在待删除区")
+        elif failed_deletions:
             # 汇总若干失败项，提示用户其中一些无法删除（常见原因：被占用、权限）
             msg = "以下文件删除失败：\n"
             for fp, err in failed_deletions[:10]:
@@ -852,61 +1468,64 @@ class MainWindow(QMainWindow):
                 msg += f"... 另外 {len(failed_deletions)-10} 项失败。\n"
             msg += "请确保这些文件没有被其他程序占用（如正在播放），或手动删除。"
             QMessageBox.warning(self, "删除部分失败", msg)
-        else:
-            if selected_rows:
-                QMessageBox.information(self, "删除完成", "已删除选中的录音（或从待删除区移除）")
+        elif show_result:
+            QMessageBox.information(self, "删除完成", "已将选中的录音移入回收站（或从待删除区移除）")
+
+    def current_trash(self):
+        if not self.recording_manager.folder_path:
+            return None
+        return RecordingTrash(self.recording_manager.folder_path)
+
+    def show_trash(self):
+        trash = self.current_trash()
+        if trash is None:
+            QMessageBox.information(self, "回收站", "请先导入录音文件夹")
+            return
+        dialog = TrashDialog(trash, self)
+        dialog.restored.connect(self.on_trash_restored)
+        dialog.exec_()
+
+    def on_trash_restored(self, file_paths):
+        # 恢复的文件回到原文件夹，只增量扫描这些文件夹
+        self.rescan_directories(sorted(set(os.path.dirname(path) for path in file_paths)))
+
+    def purge_old_trash(self):
+        # 后台彻底删除回收站中超过保留天数的录音
+        trash = self.current_trash()
+        if trash is None or not trash.exists() or (self.purge_worker and self.purge_worker.isRunning()):
+            return
+        self.purge_worker = TrashPurgeWorker(trash)
+        self.purge_worker.start()
 
     def perform_search(self, text):
         # 即时搜索功能
         search_text = text.lower().strip()
         
-        # 清除之前的搜索状态
-        self.clear_search_highlights()
-        
         if not search_text:
+            # 清除之前的搜索状态
+            self.clear_search_highlights()
             return
             
-        # 在三个列表中搜索匹配项
-        search_tables = [self.important_list, self.unimportant_list, self.delete_list]
-        
-        for table_widget in search_tables:
-            for row in range(table_widget.rowCount()):
-                phone = table_widget.item(row, 1).text() if table_widget.item(row, 1) else ""
-                contact = table_widget.item(row, 2).text() if table_widget.item(row, 2) else ""
-                
-                # 检查是否匹配（号码或联系人）
-                if search_text in phone.lower() or search_text in contact.lower():
-                    # 高亮匹配行（黄色背景）
-                    for col in range(table_widget.columnCount()):
-                        item = table_widget.item(row, col)
-                        if item:
-                            item.setBackground(Qt.yellow)
-                    self.search_highlighted_items.add((table_widget, row))
+        # 通过索引查找号码或联系人匹配的录音，只高亮三个分区（重要、不重要、待删除）中的录音
+        highlighted_ids = []
+        for recording_id in self.recording_manager.search(search_text):
+            rec = self.recording_manager.get_recording(recording_id)
+            if rec.confirmed or rec.classification in ('重要', '不重要'):
+                highlighted_ids.append(recording_id)
+        self.recording_model.set_search_state(highlighted_ids, [])
+
+    def reapply_search(self):
+        # 重新应用搜索高亮
+        if self.search_input.text().strip():
+            self.perform_search(self.search_input.text())
 
     def confirm_search(self):
         # 回车键确认搜索，将匹配项字体变为红色
-        for table_widget, row in self.search_highlighted_items:
-            if row < table_widget.rowCount():
-                for col in range(table_widget.columnCount()):
-                    item = table_widget.item(row, col)
-                    if item:
-                        item.setForeground(Qt.red)
-                self.search_confirmed_items.add((table_widget, row))
+        self.recording_model.confirm_search()
 
     def clear_search_highlights(self):
         # 清除所有搜索高亮和确认状态
-        all_tables = [self.important_list, self.unimportant_list, self.delete_list]
-        
-        for table_widget in all_tables:
-            for row in range(table_widget.rowCount()):
-                for col in range(table_widget.columnCount()):
-                    item = table_widget.item(row, col)
-                    if item:
-                        item.setBackground(Qt.white)  # 恢复默认背景
-                        item.setForeground(Qt.black)  # 恢复默认字体颜色
-        
-        self.search_highlighted_items.clear()
-        self.search_confirmed_items.clear()
+        self.recording_model.set_search_state([], [])
 
     def show_help(self):
         # 显示使用说明弹窗
@@ -915,8 +1534,16 @@ class MainWindow(QMainWindow):
 
 基本功能：
 1. 导入录音：选择包含录音文件的文件夹，工具会自动扫描并导入支持格式的音频文件（.m4a, .mp3, .amr, .wav）
+   号码和通话时间从文件名读取，支持系统默认、MIUI、华为、三星、ACR、Cube ACR 等应用的命名格式
 2. 导入通讯录：导入VCF格式的通讯录文件，用于匹配电话号码和联系人姓名
+   导入号码库：导入CSV（每行"前缀,分类"）或SQLite格式的号码前缀库，按最长前缀识别号码类型
 3. 系统自动分类：根据号码特征和通讯录信息，自动将录音分为"重要"和"不重要"两类
+4. 重新扫描：只处理文件夹中新增、修改或删除的文件，已确认的录音保持不变
+5. 监视文件夹：开启后，文件夹中新同步的录音会自动导入、分类并显示在列表中
+6. 导出结果：按分类和通话日期筛选，导出为 NDJSON、CSV 或 SQLite 文件
+7. 查找重复：找出不同文件夹中内容完全相同的录音，可将多余的副本一次移到待删除区
+8. 分析内容：分析待确认录音的声音，空白或只有底噪的录音自动归入"不重要"（非 WAV 格式需要安装 ffmpeg）
+9. 扫描设置：用通配符指定只导入或排除的文件和文件夹，并可限制子文件夹层数，在下次导入或重新扫描时生效
 
 操作说明：
 • 双击分类区录音：将录音移动到待删除区
@@ -934,8 +1561,10 @@ class MainWindow(QMainWindow):
 • 支持快进、快退、进度控制
 
 注意事项：
-• 删除操作不可逆，请谨慎操作
+• 删除的录音先移入录音文件夹下的回收站，可在"回收站"中恢复或彻底删除，超过 30 天自动彻底删除
 • 如果录音文件正在播放，删除时会自动停止播放
+• 分类和待删除区的整理进度自动保存，下次启动时直接恢复
+• 录音时长在后台读取，读取完成前显示为 --:--:--，需按时长判断的录音读取后自动分类
 • 支持多选操作，提高批量处理效率
 
 快捷键：
@@ -946,6 +1575,9 @@ class MainWindow(QMainWindow):
         QMessageBox.information(self, "使用说明", help_text.strip())
 
 if __name__ == '__main__':
+    # 打包后使用多进程解析时需要
+    multiprocessing.freeze_support()
+
     # 选择并设置应用图标（使用指定的 128.ico）
     def _find_best_icon():
         ico_dir = os.path.join(os.path.dirname(__file__), 'ico')
@@ -10,7 +10,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=['matplotlib', 'numpy', 'scipy', 'pandas'],
+    excludes=['matplotlib', 'scipy', 'pandas', 'pydub', 'requests'],
     noarchive=False,
     optimize=1,
 )
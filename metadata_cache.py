@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音元信息缓存
+以 SQLite 持久化录音元信息及内容分析结果，按 路径+大小+修改时间 判断文件是否变化
+"""
+
+import sqlite3
+
+from app_paths import get_data_path
+from sqlite_store import SQLiteStore
+from audio_analysis import AudioFeatures
+
+class MetadataCache(SQLiteStore):
+    TABLES = (
+        '''
+        CREATE TABLE IF NOT EXISTS recordings (
+            file_path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            file_mtime REAL NOT NULL,
+            phone_number TEXT NOT NULL,
+            call_time TEXT NOT NULL,
+            duration REAL NOT NULL,
+            classification TEXT NOT NULL,
+            confirmed INTEGER NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS audio_features (
+            file_path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            file_mtime REAL NOT NULL,
+            voice_ratio REAL NOT NULL,
+            silence_ratio REAL NOT NULL,
+            mean_db REAL NOT NULL,
+            peak_db REAL NOT NULL
+        )
+        ''',
+    )
+
+    def __init__(self, db_path=None):
+        # 缓存不可用时退化为每次完整解析
+        super().__init__(db_path or get_data_path('recording_cache.db'))
+
+    def load_entries(self):
+        # 一次性读出全部缓存：path -> (size, mtime, phone, call_time, duration, classification, confirmed)
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(
+                    'SELECT file_path, file_size, file_mtime, phone_number, call_time, '
+                    'duration, classification, confirmed FROM recordings'
+                ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {row[0]: row[1:] for row in rows}
+
+    def store(self, recordings):
+        # 写入或更新录音的元信息及分类/确认状态
+        rows = [
+            (rec.file_path, rec.file_size, rec.file_mtime, rec.phone_number,
+             rec.call_time.isoformat(), rec.stored_duration, rec.classification, int(rec.confirmed))
+            for rec in recordings
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany('INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        except sqlite3.Error:
+            pass  # 缓存写入失败不影响正常使用
+
+    def load_features(self):
+        # 内容分析结果：path -> (size, mtime, AudioFeatures)
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(
+                    'SELECT file_path, file_size, file_mtime, voice_ratio, silence_ratio, mean_db, peak_db '
+                    'FROM audio_features'
+                ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {row[0]: (row[1], row[2], AudioFeatures(*row[3:])) for row in rows}
+
+    def store_features(self, recordings):
+        rows = [
+            (rec.file_path, rec.file_size, rec.file_mtime) + tuple(rec.features)
+            for rec in recordings if rec.features is not None
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany('INSERT OR REPLACE INTO audio_features VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        except sqlite3.Error:
+            pass
+
+    def remove(self, file_paths):
+        # 删除已不存在文件的缓存记录
+        rows = [(path,) for path in file_paths]
+        if not rows:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany('DELETE FROM recordings WHERE file_path = ?', rows)
+                conn.executemany('DELETE FROM audio_features WHERE file_path = ?', rows)
+        except sqlite3.Error:
+            pass
\ No newline at end of file
@@ -5,8 +5,11 @@
 基于本地数据库识别号码类型
 """
 
+import csv
+import sqlite3
+
 class NumberClassifier:
-    def __init__(self):
+    def __init__(self, database_path=None):
         # 本地号码数据库
         self.number_db = {
             '快递': ['95338', '95546', '4008', '4009'],
@@ -15,11 +18,54 @@ class NumberClassifier:
             '银行': ['955', '400'],
             '服务': ['400', '800']
         }
-
-    def classify_number(self, phone_number):
-        # 简化版：检查前缀
+        # 前缀表：prefix -> category，按最长前缀匹配
+        self.prefixes = {}
+        self.prefix_lengths = []  # 已有前缀的长度，从长到短
         for category, prefixes in self.number_db.items():
             for prefix in prefixes:
-                if phone_number.startswith(prefix):
+                # 同一前缀出现在多个分类时保留先出现的
+                self.add_prefix(prefix, category, overwrite=False)
+        if database_path:
+            self.load_database(database_path)
+
+    def add_prefix(self, prefix, category, overwrite=True):
+        if not prefix or (not overwrite and prefix in self.prefixes):
+            return
+        self.prefixes[prefix] = category
+        if len(prefix) not in self.prefix_lengths:
+            self.prefix_lengths.append(len(prefix))
+            self.prefix_lengths.sort(reverse=True)
+
+    def load_database(self, database_path):
+        # 加载号码前缀库（.csv 每行 "前缀,分类"；.db/.sqlite 为 prefixes(prefix, category) 表），返回加载条数
+        if database_path.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+            conn = sqlite3.connect(database_path)
+            try:
+                rows = conn.execute('SELECT prefix, category FROM prefixes').fetchall()
+            finally:
+                conn.close()
+        else:
+            with open(database_path, 'r', encoding='utf-8-sig', newline='') as f:
+                rows = [row[:2] for row in csv.reader(f) if len(row) >= 2]
+
+        count = 0
+        for prefix, category in rows:
+            prefix = ''.join(ch for ch in str(prefix) if ch.isdigit())
+            category = str(category).strip()
+            if prefix and category:  # 跳过表头等无效行
+                self.add_prefix(prefix, category)
+                count += 1
+        return count
+
+    def classify_number(self, phone_number):
+        # 最长前缀匹配：从最长的前缀长度开始查表
+        for length in self.prefix_lengths:
+            if length <= len(phone_number):
+                category = self.prefixes.get(phone_number[:length])
+                if category is not None:
                     return category
-        return '未知'
\ No newline at end of file
+        return '未知'
+
+    def classify_many(self, phone_numbers):
+        # 批量分类，相同号码只查一次，返回 phone -> category
+        return {phone_number: self.classify_number(phone_number) for phone_number in set(phone_numbers)}
\ No newline at end of file
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+号码规范化
+把各种写法的号码统一成同一个键（去掉国家码、长途前缀、IP 拨号前缀和分机号），
+通讯录与录音两侧在导入时各规范化一次，之后按键精确匹配
+"""
+
+import re
+
+# 分机号及拨号暂停符之后的部分不参与匹配
+EXTENSION_PATTERN = re.compile(r'(?:ext\.?|x|转|分机|[,;#pw])', re.IGNORECASE)
+# IP 长途拨号前缀，如 17951 13800138000
+IP_DIAL_PREFIXES = ('17951', '17911', '12593', '17909', '10193')
+MOBILE_PATTERN = re.compile(r'1[3-9]\d{9}$')
+
+def national_number(digits):
+    # 国内号码：手机号原样返回，固话补上长途前缀 0
+    if MOBILE_PATTERN.match(digits) or digits.startswith(('400', '800', '95', '96', '0')):
+        return digits
+    return '0' + digits
+
+def normalize_phone(phone):
+    # 返回规范化后的号码；无法识别出数字时返回空字符串
+    phone = EXTENSION_PATTERN.split(phone.strip(), 1)[0]
+    international = phone.startswith('+')
+    digits = ''.join(ch for ch in phone if ch.isdigit())
+    if not digits:
+        return ''
+
+    if not international and digits.startswith('00'):
+        # 00 国际冠字
+        international = True
+        digits = digits[2:]
+    if international:
+        if digits.startswith('86'):
+            return national_number(digits[2:])
+        # 境外号码保留国家码
+        return '+' + digits
+
+    # 省略了 + 的国家码：86 + 11 位手机号
+    if len(digits) == 13 and digits.startswith('86') and MOBILE_PATTERN.match(digits[2:]):
+        return digits[2:]
+    # 手机号前误加长途前缀 0
+    if len(digits) == 12 and digits.startswith('0') and MOBILE_PATTERN.match(digits[1:]):
+        return digits[1:]
+    # IP 拨号前缀
+    if len(digits) == 16 and digits.startswith(IP_DIAL_PREFIXES) and MOBILE_PATTERN.match(digits[5:]):
+        return digits[5:]
+    return digits
\ No newline at end of file
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结果导出
+逐条写出录音分类结果，支持 NDJSON、CSV 和 SQLite，不在内存中构造完整列表
+"""
+
+import csv
+import json
+import os
+import sqlite3
+
+EXPORT_FIELDS = ['file_path', 'phone_number', 'call_time', 'duration', 'classification']
+EXPORT_BATCH_SIZE = 1000  # SQLite 每批写入的行数
+
+FORMAT_NDJSON = 'ndjson'
+FORMAT_CSV = 'csv'
+FORMAT_SQLITE = 'sqlite'
+
+def detect_format(file_path):
+    # 按扩展名判断导出格式，默认 NDJSON
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        return FORMAT_CSV
+    if extension in ('.db', '.sqlite', '.sqlite3'):
+        return FORMAT_SQLITE
+    return FORMAT_NDJSON
+
+def export_row(rec):
+    # 不在导出时读取音频文件头，尚未读取的时长导出为空
+    duration = rec.stored_duration if rec.duration_known else None
+    return (rec.file_path, rec.phone_number, rec.call_time.isoformat(), duration, rec.classification)
+
+def write_ndjson(file_path, rows):
+    count = 0
+    with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+def write_csv(file_path, rows):
+    count = 0
+    # 带 BOM，Excel 打开中文不乱码
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def write_sqlite(file_path, rows):
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    count = 0
+    conn = sqlite3.connect(file_path)
+    try:
+        with conn:
+            conn.execute('''
+                CREATE TABLE recordings (
+                    file_path TEXT PRIMARY KEY,
+                    phone_number TEXT NOT NULL,
+                    call_time TEXT NOT NULL,
+                    duration REAL,
+                    classification TEXT NOT NULL
+                )
+            ''')
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= EXPORT_BATCH_SIZE:
+                    conn.executemany('INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?)', batch)
+                    count += len(batch)
+                    batch = []
+            conn.executemany('INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?)', batch)
+            count += len(batch)
+    finally:
+        conn.close()
+    return count
+
+WRITERS = {
+    FORMAT_NDJSON: write_ndjson,
+    FORMAT_CSV: write_csv,
+    FORMAT_SQLITE: write_sqlite,
+}
+
+def export_recordings(recordings, file_path, export_format=None):
+    # 逐条导出录音（可为生成器），返回写出的条数
+    export_format = export_format or detect_format(file_path)
+    return WRITERS[export_format](file_path, (export_row(rec) for rec in recordings))
\ No newline at end of file
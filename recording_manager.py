@@ -6,110 +6,498 @@
 """
 
 import os
-import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime
-from mutagen import File as MutagenFile
-from mutagen.mp3 import MP3
-from mutagen.mp4 import MP4
-from pydub import AudioSegment
-import requests
-import json
 import wave
 
+from search_index import SearchIndex
+from recording_store import RecordingStore, CLASSIFICATIONS, classification_code, to_epoch, from_epoch, split_path
+from audio_duration import amr_duration, mp4_duration
+from phone_normalizer import normalize_phone
+from folder_scanner import FolderScanner
+from filename_schemes import filename_parser
+from audio_analysis import is_empty_call
+
+# 解析录音元信息的并发方式
+BACKEND_THREAD = 'thread'
+BACKEND_PROCESS = 'process'
+
+# 持久化时表示时长尚未读取
+DURATION_UNKNOWN = -1.0
+
 class Recording:
-    def __init__(self, file_path):
+    # 大量录音常驻内存，不用 __dict__：目录前缀共享，时间存为整数，分类存为编码，对外仍是原来的属性
+    __slots__ = ('id', 'directory', 'file_name', 'file_size', 'file_mtime', '_phone_number',
+                 'call_timestamp', '_duration', '_classification', 'confirmed', 'features')
+
+    def __init__(self, file_path, file_size=None, file_mtime=None):
         self.file_path = file_path
-        self.phone_number = self.extract_phone_number()
-        self.call_time = self.extract_call_time()
-        self.duration = self.get_duration()
+        if file_size is None or file_mtime is None:
+            try:
+                stat = os.stat(file_path)
+                file_size, file_mtime = stat.st_size, stat.st_mtime
+            except OSError:
+                file_size, file_mtime = 0, 0.0
+        self.id = None  # 由 RecordingManager 加入时分配
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self.parse_file_name()
+        self._duration = None  # 时长按需读取，通常由后台探测填充
         self.classification = '待确认'  # 重要、不重要、待确认
         self.confirmed = False
+        self.features = None  # 内容分析结果（AudioFeatures），分析前为 None
+
+    @classmethod
+    def from_cache(cls, file_path, file_size, file_mtime, phone_number, call_time, duration, classification, confirmed):
+        # 从缓存还原，不再解析文件名和音频文件头；旧缓存中的号码可能未规范化
+        phone_number = normalize_phone(phone_number) or '未知'
+        return cls.from_metadata((file_path, file_size, file_mtime, phone_number,
+                                  datetime.fromisoformat(call_time), duration, classification, confirmed))
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        # 由 to_metadata() 产生的元组还原
+        recording = cls.__new__(cls)
+        recording.id = None
+        (file_path, recording.file_size, recording.file_mtime, phone_number,
+         call_time, duration, classification, confirmed) = metadata
+        recording.directory, recording.file_name = split_path(file_path)
+        recording._phone_number = sys.intern(phone_number)
+        recording.call_timestamp = to_epoch(call_time)
+        recording._duration = None if duration is None or duration < 0 else duration
+        recording._classification = classification_code(classification)
+        recording.confirmed = bool(confirmed)
+        recording.features = None
+        return recording
+
+    def to_metadata(self):
+        # 紧凑元组，用于跨进程传递
+        return (self.file_path, self.file_size, self.file_mtime, self.phone_number,
+                self.call_time, self.stored_duration, self.classification, self.confirmed)
+
+    @property
+    def file_path(self):
+        return self.directory + self.file_name
+
+    @file_path.setter
+    def file_path(self, value):
+        self.directory, self.file_name = split_path(value)
+
+    @property
+    def phone_number(self):
+        return self._phone_number
+
+    @phone_number.setter
+    def phone_number(self, value):
+        # 同一号码的录音共用一个字符串
+        self._phone_number = sys.intern(value)
+
+    @property
+    def call_time(self):
+        return from_epoch(self.call_timestamp)
+
+    @call_time.setter
+    def call_time(self, value):
+        self.call_timestamp = to_epoch(value)
+
+    @property
+    def classification(self):
+        return CLASSIFICATIONS[self._classification]
+
+    @classification.setter
+    def classification(self, value):
+        self._classification = classification_code(value)
+
+    @property
+    def duration(self):
+        # 首次访问时读取文件头并缓存；界面线程应先检查 duration_known，避免在界面线程读文件
+        if self._duration is None:
+            self._duration = self.get_duration()
+        return self._duration
 
-    def extract_phone_number(self):
-        # 从文件名提取电话号码
-        # 假设文件名格式如：录音_13800138000_20231101_120000.m4a
-        filename = os.path.basename(self.file_path)
-        match = re.search(r'(\d{11}|\d{7,10})', filename)
-        return match.group(1) if match else '未知'
-
-    def extract_call_time(self):
-        # 从文件名或文件mtime提取时间
-        filename = os.path.basename(self.file_path)
-        # 尝试从文件名提取，如 _20231101_120000
-        match = re.search(r'_(\d{8})_(\d{6})', filename)
-        if match:
-            date_str = match.group(1)
-            time_str = match.group(2)
-            return datetime.strptime(f"{date_str}{time_str}", "%Y%m%d%H%M%S")
+    @duration.setter
+    def duration(self, value):
+        self._duration = value
+
+    @property
+    def duration_known(self):
+        return self._duration is not None
+
+    @property
+    def stored_duration(self):
+        # 用于缓存和会话存储，尚未读取时为 DURATION_UNKNOWN
+        return DURATION_UNKNOWN if self._duration is None else self._duration
+
+    def parse_file_name(self):
+        # 按 filename_schemes 中的格式从文件名提取号码和通话时间，号码经 normalize_phone 规范化
+        # 文件名中没有时间时使用文件修改时间
+        phone_number, call_timestamp = filename_parser.parse(self.directory, self.file_name)
+        self.phone_number = (normalize_phone(phone_number) or '未知') if phone_number else '未知'
+        if call_timestamp is None:
+            self.call_time = datetime.fromtimestamp(self.file_mtime)
         else:
-            # 使用文件修改时间
-            mtime = os.path.getmtime(self.file_path)
-            return datetime.fromtimestamp(mtime)
+            self.call_timestamp = call_timestamp
 
     def get_duration(self):
+        return probe_duration(self.file_path)
+
+def probe_duration(file_path):
+    # 读取音频文件头获取时长（秒），失败时返回 0
+    try:
+        # 对于WAV文件，使用wave模块直接读取
+        if file_path.lower().endswith('.wav'):
+            with wave.open(file_path, 'rb') as wf:
+                frames = wf.getnframes()
+                rate = wf.getframerate()
+                if rate > 0:
+                    return frames / float(rate)
+        
+        # 根据文件扩展名使用对应的mutagen模块
+        ext = file_path.lower().split('.')[-1]
+        
+        if ext == 'amr':
+            # mutagen 不支持 AMR，直接按帧头计算
+            duration = amr_duration(file_path)
+            if duration is not None:
+                return duration
+        elif ext == 'mp3':
+            # mutagen 在第一次用到时才导入，不拖慢启动
+            from mutagen.mp3 import MP3
+            audio = MP3(file_path)
+            return audio.info.length
+        elif ext in ['m4a', 'mp4']:
+            # 只读取 moov 原子；解析不了时再交给 mutagen
+            duration = mp4_duration(file_path)
+            if duration is not None:
+                return duration
+            from mutagen.mp4 import MP4
+            audio = MP4(file_path)
+            return audio.info.length
+        else:
+            # 对于其他格式，尝试通用mutagen
+            from mutagen import File as MutagenFile
+            audio_info = MutagenFile(file_path)
+            if audio_info and hasattr(audio_info, 'info') and hasattr(audio_info.info, 'length'):
+                return float(audio_info.info.length)
+        
+        # 如果都失败，返回0
+        return 0
+    except:
+        return 0
+
+def load_recording(file_path, cached_entries=None, file_size=None, file_mtime=None):
+    # 文件未变化（大小和修改时间一致）时从缓存还原，否则完整解析
+    if file_size is None or file_mtime is None:
         try:
-            # 对于WAV文件，使用wave模块直接读取
-            if self.file_path.lower().endswith('.wav'):
-                with wave.open(self.file_path, 'rb') as wf:
-                    frames = wf.getnframes()
-                    rate = wf.getframerate()
-                    if rate > 0:
-                        return frames / float(rate)
-            
-            # 根据文件扩展名使用对应的mutagen模块
-            ext = self.file_path.lower().split('.')[-1]
-            
-            if ext == 'mp3':
-                audio = MP3(self.file_path)
-                return audio.info.length
-            elif ext in ['m4a', 'mp4']:
-                audio = MP4(self.file_path)
-                return audio.info.length
-            else:
-                # 对于其他格式，尝试通用mutagen
-                audio_info = MutagenFile(self.file_path)
-                if audio_info and hasattr(audio_info, 'info') and hasattr(audio_info.info, 'length'):
-                    return float(audio_info.info.length)
-            
-            # 如果都失败，返回0
-            return 0
-        except:
-            return 0
+            stat = os.stat(file_path)
+            file_size, file_mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            file_size, file_mtime = 0, 0.0
+    if cached_entries:
+        entry = cached_entries.get(file_path)
+        if entry and entry[0] == file_size and entry[1] == file_mtime:
+            return Recording.from_cache(file_path, *entry)
+    return Recording(file_path, file_size, file_mtime)
+
+def extract_metadata(file_paths, cached_entries=None, file_stats=None):
+    # 进程池任务：解析一批文件，只返回元组而不是完整的 Recording 对象
+    # file_stats 为扫描时取得的 path -> (size, mtime)，有则不再 stat
+    file_stats = file_stats or {}
+    return [load_recording(file_path, cached_entries, *file_stats.get(file_path, (None, None))).to_metadata()
+            for file_path in file_paths]
 
 class RecordingManager:
-    def __init__(self):
-        self.recordings = []
+    def __init__(self, metadata_cache=None, session_store=None):
+        self.metadata_cache = metadata_cache  # 可选的 MetadataCache
+        self.session_store = session_store  # 可选的 SessionStore，记录录音列表和分类状态的变化
+        self.folder_path = None  # 最近一次导入的文件夹
+        # 扫描设置：包含/排除的通配符和最大深度（None 表示不限）
+        self.include_patterns = []
+        self.exclude_patterns = []
+        self.max_depth = None
+        # 录音列表及按 ID、路径、号码的索引
+        self.store = RecordingStore()
+        # 号码和联系人姓名的搜索索引
+        self.search_index = SearchIndex()
+
+    @property
+    def recordings(self):
+        return self.store.recordings
+
+    @property
+    def by_phone(self):
+        return self.store.by_phone
+
+    def _index(self, recordings):
+        for phone_number in self.store.add(recordings):
+            self.search_index.add_phone(phone_number)
+
+    def _unindex(self, recordings):
+        for phone_number in self.store.remove(recordings):
+            self.search_index.remove_phone(phone_number)
+
+    def _replace_recordings(self, recordings):
+        for phone_number in self.store.by_phone:
+            self.search_index.remove_phone(phone_number)
+        for phone_number in self.store.replace(recordings):
+            self.search_index.add_phone(phone_number)
+
+    def set_recordings(self, recordings):
+        self._replace_recordings(recordings)
+        if self.session_store is not None:
+            self.session_store.reset(self.recordings)
+
+    def add_recordings(self, recordings):
+        self._index(recordings)
+        self.recordings.extend(recordings)
+        if self.session_store is not None:
+            self.session_store.record_changes(recordings)
+
+    def remove_recordings(self, recordings):
+        # 按 ID 集合移除，返回实际移除的录音
+        removed = [rec for rec in recordings if self.store.get(rec.id) is rec]
+        if removed:
+            removed_ids = set(rec.id for rec in removed)
+            self._unindex(removed)
+            self.store.recordings = [rec for rec in self.recordings if rec.id not in removed_ids]
+            if self.session_store is not None:
+                self.session_store.record_removals([rec.file_path for rec in removed])
+        return removed
+
+    def restore_session(self):
+        # 从会话存储恢复录音列表及分类/确认状态，不读取音频文件；返回恢复的录音
+        if self.session_store is None:
+            return []
+        recordings = [
+            Recording.from_metadata(row[:4] + (datetime.fromisoformat(row[4]),) + row[5:])
+            for row in self.session_store.load()
+        ]
+        if not recordings:
+            return []
+        self._replace_recordings(recordings)
+        self.sort_recordings()
+        self.attach_features(recordings)
+        self.folder_path = self.session_store.get_value('folder_path')
+        return recordings
+
+    def get_recording(self, recording_id):
+        return self.store.get(recording_id)
+
+    def set_contacts(self, contacts):
+        # 通讯录变化时更新搜索索引中的联系人姓名
+        self.search_index.set_contacts(contacts)
+
+    def search(self, text):
+        # 返回号码或联系人姓名包含 text 的录音 ID 集合
+        recording_ids = set()
+        for phone_number in self.search_index.search(text):
+            recording_ids.update(self.by_phone.get(phone_number, ()))
+        return recording_ids
+
+    def load_cached_entries(self):
+        if self.metadata_cache is None:
+            return None
+        return self.metadata_cache.load_entries()
+
+    def load_feature_entries(self):
+        if self.metadata_cache is None:
+            return {}
+        return self.metadata_cache.load_features()
+
+    def attach_features(self, recordings, feature_entries=None):
+        # 从缓存填入文件未变化的录音的内容分析结果
+        if feature_entries is None:
+            feature_entries = self.load_feature_entries()
+        if not feature_entries:
+            return
+        for rec in recordings:
+            entry = feature_entries.get(rec.file_path)
+            if entry and entry[0] == rec.file_size and entry[1] == rec.file_mtime:
+                rec.features = entry[2]
+
+    def save_features(self, recordings):
+        if self.metadata_cache is None:
+            return
+        self.metadata_cache.store_features(recordings)
+
+    def create_recording(self, file_path, cached_entries=None, file_size=None, file_mtime=None):
+        return load_recording(file_path, cached_entries, file_size, file_mtime)
+
+    def iter_recordings(self, file_paths, cached_entries=None, backend=BACKEND_THREAD, chunk_size=256, file_stats=None):
+        # 并发解析，按完成顺序逐个产出录音；file_stats 为 scan_folder 的结果，用于省去每个文件的 stat
+        total = len(file_paths)
+        if total == 0:
+            return
+        cpu_count = os.cpu_count() or 1
+        file_stats = file_stats or {}
+
+        if backend == BACKEND_PROCESS:
+            # 多进程：按块发送路径，避开 GIL；每块只附带相关的缓存条目
+            chunks = [file_paths[i:i + chunk_size] for i in range(0, total, chunk_size)]
+            with ProcessPoolExecutor(max_workers=min(cpu_count, len(chunks))) as executor:
+                futures = []
+                for chunk in chunks:
+                    chunk_entries = None
+                    if cached_entries:
+                        chunk_entries = {path: cached_entries[path] for path in chunk if path in cached_entries}
+                    chunk_stats = {path: file_stats[path] for path in chunk if path in file_stats}
+                    futures.append(executor.submit(extract_metadata, chunk, chunk_entries, chunk_stats))
+                for future in as_completed(futures):
+                    for metadata in future.result():
+                        yield Recording.from_metadata(metadata)
+            return
+
+        # 使用线程池，线程数为CPU核心数的2倍
+        with ThreadPoolExecutor(max_workers=min(cpu_count * 2, total)) as executor:
+            futures = [executor.submit(load_recording, file_path, cached_entries, *file_stats.get(file_path, (None, None)))
+                       for file_path in file_paths]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def save_to_cache(self, recordings=None):
+        # 保存元信息及分类/确认状态，默认保存全部录音；同时记入会话日志
+        if recordings is None:
+            recordings = self.recordings
+        if self.session_store is not None:
+            self.session_store.record_changes(recordings)
+        if self.metadata_cache is None:
+            return
+        self.metadata_cache.store(recordings)
+
+    def remove_from_cache(self, file_paths):
+        if self.metadata_cache is None:
+            return
+        self.metadata_cache.remove(file_paths)
 
     def load_recordings(self, folder_path):
-        self.recordings = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith(('.m4a', '.mp3', '.amr', '.wav')):
-                    file_path = os.path.join(root, file)
-                    recording = Recording(file_path)
-                    self.recordings.append(recording)
+        self.folder_path = folder_path
+        cached_entries = self.load_cached_entries()
+        recordings = [
+            self.create_recording(file_path, cached_entries, file_size, file_mtime)
+            for file_path, (file_size, file_mtime) in self.scan_folder(folder_path).items()
+        ]
+        self.attach_features(recordings)
+        self.set_recordings(recordings)
+        self.sort_recordings()
+
+    def filter_recordings(self, recordings=None, classifications=None, start_time=None, end_time=None):
+        # 逐条产出符合条件的录音：分类在 classifications 中，通话时间在 [start_time, end_time) 内
+        if recordings is None:
+            recordings = self.recordings
+        start = to_epoch(start_time) if start_time is not None else None
+        end = to_epoch(end_time) if end_time is not None else None
+        for rec in recordings:
+            if classifications is not None and rec.classification not in classifications:
+                continue
+            if start is not None and rec.call_timestamp < start:
+                continue
+            if end is not None and rec.call_timestamp >= end:
+                continue
+            yield rec
+
+    def sort_recordings(self):
         # 按时间倒序排序
-        self.recordings.sort(key=lambda x: x.call_time, reverse=True)
-
-    def classify_recordings(self, contacts, number_classifier):
-        for recording in self.recordings:
-            # 基于通讯录
-            if recording.phone_number in contacts:
-                contact = contacts[recording.phone_number]
-                if contact['group'] in ['family', 'friend', 'work']:
-                    recording.classification = '重要'
-                else:
-                    recording.classification = '重要'  # 普通联系人仍重要
-            else:
-                # 基于号码标记
-                number_type = number_classifier.classify_number(recording.phone_number)
-                if number_type in ['快递', '外卖', '推销']:
-                    recording.classification = '不重要'
-                elif number_type == '服务':
-                    recording.classification = '待确认'
+        self.recordings.sort(key=lambda x: x.call_timestamp, reverse=True)
+
+    def set_scan_options(self, include_patterns=None, exclude_patterns=None, max_depth=None):
+        self.include_patterns = list(include_patterns or [])
+        self.exclude_patterns = list(exclude_patterns or [])
+        self.max_depth = max_depth
+
+    def folder_scanner(self, folder_path):
+        # 按当前扫描设置过滤文件和文件夹的 FolderScanner
+        return FolderScanner(folder_path, self.include_patterns, self.exclude_patterns, self.max_depth)
+
+    def scan_folder(self, folder_path, directories=None):
+        # 扫描文件夹，返回 path -> (size, mtime)；指定 directories 时只扫描这些文件夹（不递归）
+        return self.folder_scanner(folder_path).scan(directories)
+
+    def diff_folder(self, folder_path, directories=None):
+        # 与内存中的录音对比，返回 (新增, 删除, 修改) 三个路径列表
+        return self.diff_files(self.scan_folder(folder_path, directories), self.known_files(directories))
+
+    def known_files(self, directories=None):
+        # 内存中录音的 path -> (size, mtime) 快照；在界面线程取得后交给后台线程比较，
+        # 后台线程不直接遍历可能被界面线程修改的 RecordingStore
+        return {path: (rec.file_size, rec.file_mtime) for path, rec in self.store.paths(directories).items()}
+
+    def diff_files(self, files, known):
+        # files 为 scan_folder 的结果，known 为扫描相同文件夹的 known_files 快照
+        added = [path for path in files if path not in known]
+        removed = [path for path in known if path not in files]
+        modified = [path for path, stat in files.items() if path in known and known[path] != stat]
+        return added, removed, modified
+
+    def apply_changes(self, new_recordings, removed_paths):
+        # 只应用增量：移除已删除/已修改的旧录音，加入新解析的录音，未变化录音的状态保持不变
+        stale_paths = set(removed_paths)
+        stale_paths.update(rec.file_path for rec in new_recordings)
+        stale_recordings = [rec for rec in map(self.store.get_by_path, stale_paths) if rec is not None]
+        removed_recordings = self.remove_recordings(stale_recordings)
+        self.add_recordings(new_recordings)
+        self.sort_recordings()
+        self.remove_from_cache(removed_paths)
+        return removed_recordings
+
+    def classify_phone(self, phone_number, contacts, number_type):
+        # 号码级规则：返回固定分类；返回 None 表示需按录音时长和内容判断
+        # 基于通讯录：家人、朋友、同事及普通联系人均为重要
+        if phone_number in contacts:
+            return '重要'
+        # 基于号码标记
+        if number_type in ['快递', '外卖', '推销']:
+            return '不重要'
+        elif number_type == '服务':
+            return '待确认'
+        return None
+
+    def classify_recordings(self, contacts, number_classifier, recordings=None, phone_numbers=None, pending=None):
+        # 按号码分组批量分类：每个不同号码只判断一次，再应用到该号码的全部录音
+        # 默认对全部录音分类，也可只对指定录音或指定号码的录音分类；返回分类有变化的录音
+        # 传入 pending 列表时，需要时长但时长尚未读取的录音加入 pending 并保持原分类，待探测后再分类
+        if recordings is not None:
+            groups = {}
+            for recording in recordings:
+                groups.setdefault(recording.phone_number, []).append(recording)
+        elif phone_numbers is not None:
+            groups = {phone: self.by_phone[phone].values() for phone in phone_numbers if phone in self.by_phone}
+        else:
+            groups = {phone: same_phone.values() for phone, same_phone in self.by_phone.items()}
+
+        number_types = number_classifier.classify_many(phone for phone in groups if phone not in contacts)
+        changed_recordings = []
+        for phone_number, group in groups.items():
+            fixed = self.classify_phone(phone_number, contacts, number_types.get(phone_number))
+            for recording in group:
+                # 已确认的录音保持用户选择
+                if recording.confirmed:
+                    continue
+                if fixed is not None:
+                    classification = fixed
+                elif pending is not None and not recording.duration_known:
+                    pending.append(recording)
+                    continue
                 else:
-                    # 规则判断
-                    if recording.duration < 10:
-                        recording.classification = '不重要'
-                    else:
-                        recording.classification = '待确认'
\ No newline at end of file
+                    classification = self.classify_content(recording)
+                if recording.classification != classification:
+                    recording.classification = classification
+                    changed_recordings.append(recording)
+        return changed_recordings
+
+    def classify_content(self, recording):
+        # 录音级规则：过短或经内容分析几乎没有声音的录音不重要；未分析的录音只看时长
+        if recording.duration < 10:
+            return '不重要'
+        if recording.features is not None and is_empty_call(recording.features):
+            return '不重要'
+        return '待确认'
+
+    def apply_contact_changes(self, contacts, changed_phones, number_classifier, pending=None):
+        # 通讯录变化后只重新分类受影响号码的录音，返回这些录音（联系人列也需刷新）
+        self.set_contacts(contacts)
+        self.classify_recordings(contacts, number_classifier, phone_numbers=changed_phones, pending=pending)
+        affected_recordings = []
+        for phone in changed_phones:
+            affected_recordings.extend(self.by_phone.get(phone, {}).values())
+        return affected_recordings
\ No newline at end of file
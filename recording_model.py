@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音表格模型
+所有表格共用一个数据模型，各分区通过过滤代理模型显示
+"""
+
+from PyQt5.QtCore import Qt, QObject, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QTimer, pyqtSignal
+
+COLUMN_HEADERS = ['时间', '号码', '联系人', '时长', '分类']
+DURATION_COLUMN = 3
+CLASSIFICATION_COLUMN = 4
+SORT_ROLE = Qt.UserRole + 1
+ID_ROLE = Qt.UserRole + 2  # 每行携带录音 ID
+
+DURATION_PLACEHOLDER = '--:--:--'  # 时长尚未读取
+
+def format_duration(duration):
+    return f"{int(duration // 3600):02d}:{int((duration % 3600) // 60):02d}:{int(duration % 60):02d}"
+
+def contiguous_ranges(rows):
+    # 把行号合并为连续区间 [(first, last), ...]，按升序
+    ranges = []
+    for row in sorted(rows):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [(first, last) for first, last in ranges]
+
+class RecordingTableModel(QAbstractTableModel):
+    recordings_about_to_be_removed = pyqtSignal(list)  # 即将移除的录音 ID，代理模型据此一次性删除行
+
+    def __init__(self, get_contact_name, parent=None):
+        super().__init__(parent)
+        self.get_contact_name = get_contact_name
+        self.recordings = []
+        self.row_index = {}  # 录音 ID -> 行号
+        # 搜索状态（录音 ID 集合）
+        self.highlighted = set()  # 黄色背景
+        self.search_confirmed = set()  # 红色字体
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.recordings)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        rec = self.recordings[index.row()]
+        column = index.column()
+        if role == SORT_ROLE:
+            # 排序时每次比较都会调用，直接返回数值键，不格式化文本
+            if column == 0:
+                return rec.call_timestamp
+            elif column == 3:
+                return float(rec.stored_duration)
+            elif column == 2:
+                return self.get_contact_name(rec.phone_number)
+            elif column == 1:
+                return rec.phone_number
+            return rec.classification
+        elif role == Qt.DisplayRole:
+            if column == 0:
+                return rec.call_time.strftime('%Y-%m-%d %H:%M:%S')
+            elif column == 1:
+                return rec.phone_number
+            elif column == 2:
+                return self.get_contact_name(rec.phone_number)
+            elif column == 3:
+                # 不在界面线程读取文件头，未知时长由后台探测后刷新
+                return format_duration(rec.duration) if rec.duration_known else DURATION_PLACEHOLDER
+            elif column == 4:
+                return rec.classification
+        elif role == ID_ROLE:
+            return rec.id
+        elif role == Qt.BackgroundRole:
+            if rec.id in self.highlighted:
+                return Qt.yellow
+        elif role == Qt.ForegroundRole:
+            if rec.id in self.search_confirmed:
+                return Qt.red
+        return None
+
+    def sort_key(self, column):
+        # 各列的 Python 排序键，与 SORT_ROLE 一致
+        if column == 0:
+            return lambda rec: rec.call_timestamp
+        elif column == 1:
+            return lambda rec: rec.phone_number
+        elif column == 2:
+            return lambda rec: self.get_contact_name(rec.phone_number)
+        elif column == 3:
+            return lambda rec: float(rec.stored_duration)
+        return lambda rec: rec.classification
+
+    def reset_recordings(self, recordings):
+        self.beginResetModel()
+        self.recordings = list(recordings)
+        self.row_index = {rec.id: row for row, rec in enumerate(self.recordings)}
+        self.highlighted.clear()
+        self.search_confirmed.clear()
+        self.endResetModel()
+
+    def append_recordings(self, recordings):
+        if not recordings:
+            return
+        first = len(self.recordings)
+        self.beginInsertRows(QModelIndex(), first, first + len(recordings) - 1)
+        for row, rec in enumerate(recordings, first):
+            self.recordings.append(rec)
+            self.row_index[rec.id] = row
+        self.endInsertRows()
+
+    def remove_recordings(self, recordings):
+        rows = [self.row_index[rec.id] for rec in recordings if rec.id in self.row_index]
+        if not rows:
+            return
+        self.recordings_about_to_be_removed.emit([self.recordings[row].id for row in rows])
+        # 从后往前按连续区间删除，前面的行号不受影响
+        for first, last in reversed(contiguous_ranges(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for rec in self.recordings[first:last + 1]:
+                self.highlighted.discard(rec.id)
+                self.search_confirmed.discard(rec.id)
+            del self.recordings[first:last + 1]
+            self.endRemoveRows()
+        self.row_index = {rec.id: row for row, rec in enumerate(self.recordings)}
+
+    def recordings_changed(self, recordings, first_column=0, last_column=None, roles=[]):
+        # 通知视图这些录音的数据（分类、确认状态等）已变化；只变了几列时只刷新这几列
+        rows = [self.row_index[rec.id] for rec in recordings if rec.id in self.row_index]
+        if last_column is None:
+            last_column = self.columnCount() - 1
+        for first, last in contiguous_ranges(rows):
+            self.dataChanged.emit(self.index(first, first_column), self.index(last, last_column), roles)
+
+    def set_search_state(self, highlighted_ids, confirmed_ids):
+        # 只刷新匹配状态发生变化的行
+        highlighted_ids = set(highlighted_ids)
+        confirmed_ids = set(confirmed_ids)
+        changed_ids = (self.highlighted ^ highlighted_ids) | (self.search_confirmed ^ confirmed_ids)
+        self.highlighted = highlighted_ids
+        self.search_confirmed = confirmed_ids
+        rows = [self.row_index[recording_id] for recording_id in changed_ids if recording_id in self.row_index]
+        last_column = self.columnCount() - 1
+        for first, last in contiguous_ranges(rows):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_column), [Qt.BackgroundRole, Qt.ForegroundRole])
+
+    def confirm_search(self):
+        # 高亮的匹配项字体变为红色
+        self.set_search_state(self.highlighted, self.search_confirmed | self.highlighted)
+
+class RecordingFilterProxyModel(QAbstractProxyModel):
+    # 按录音 ID 记录每个代理行，过滤和排序都在 Python 中按键完成，
+    # 不必像 QSortFilterProxyModel 那样每次比较都回调 data()
+    def __init__(self, accept_recording=None, column_count=None, show_search=True, parent=None):
+        super().__init__(parent)
+        self.accept_recording = accept_recording  # 过滤条件，None 表示显示全部
+        self.column_count = column_count  # 只显示前几列
+        self.show_search = show_search  # 是否显示搜索高亮
+        self.sort_column = -1  # -1 表示保持源模型顺序
+        self.sort_order = Qt.AscendingOrder
+        self.recording_ids = []  # 代理行 -> 录音 ID
+        self.proxy_rows = {}  # 录音 ID -> 代理行
+        self.resort_pending = False
+
+    def setSourceModel(self, source_model):
+        self.beginResetModel()
+        super().setSourceModel(source_model)
+        source_model.modelAboutToBeReset.connect(self.beginResetModel)
+        source_model.modelReset.connect(self.on_source_reset)
+        source_model.rowsInserted.connect(self.on_rows_inserted)
+        source_model.recordings_about_to_be_removed.connect(self.remove_ids)
+        source_model.dataChanged.connect(self.on_data_changed)
+        self.rebuild()
+        self.endResetModel()
+
+    def accepts(self, rec):
+        return self.accept_recording is None or self.accept_recording(rec)
+
+    def sorted_ids(self, recording_ids):
+        source_model = self.sourceModel()
+        if self.sort_column < 0:
+            return sorted(recording_ids, key=source_model.row_index.__getitem__)
+        key = source_model.sort_key(self.sort_column)
+        recordings = source_model.recordings
+        row_index = source_model.row_index
+        return sorted(recording_ids, key=lambda recording_id: key(recordings[row_index[recording_id]]),
+                      reverse=self.sort_order == Qt.DescendingOrder)
+
+    def update_proxy_rows(self):
+        self.proxy_rows = {recording_id: row for row, recording_id in enumerate(self.recording_ids)}
+
+    def rebuild(self):
+        recordings = self.sourceModel().recordings
+        self.recording_ids = self.sorted_ids([rec.id for rec in recordings if self.accepts(rec)])
+        self.update_proxy_rows()
+
+    def resort(self):
+        # 重新排序，选中项等持久索引跟随移动
+        self.resort_pending = False
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_positions = [(self.recording_ids[index.row()], index.column()) for index in old_indexes]
+        self.recording_ids = self.sorted_ids(self.recording_ids)
+        self.update_proxy_rows()
+        new_indexes = [self.index(self.proxy_rows[recording_id], column) for recording_id, column in old_positions]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def schedule_resort(self):
+        # 同一轮事件中的多次变化只排序一次
+        if self.sort_column >= 0 and not self.resort_pending:
+            self.resort_pending = True
+            QTimer.singleShot(0, self.resort_if_pending)
+
+    def resort_if_pending(self):
+        if self.resort_pending:
+            self.resort()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        if self.sourceModel() is not None:
+            self.resort()
+
+    def on_source_reset(self):
+        self.resort_pending = False
+        self.rebuild()
+        self.endResetModel()
+
+    def insert_ids(self, recording_ids):
+        # 先追加到末尾，排序时再移动到正确位置
+        if not recording_ids:
+            return
+        first = len(self.recording_ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(recording_ids) - 1)
+        for row, recording_id in enumerate(recording_ids, first):
+            self.recording_ids.append(recording_id)
+            self.proxy_rows[recording_id] = row
+        self.endInsertRows()
+        self.schedule_resort()
+
+    def remove_ids(self, recording_ids):
+        rows = [self.proxy_rows[recording_id] for recording_id in recording_ids if recording_id in self.proxy_rows]
+        if not rows:
+            return
+        # 从后往前按连续区间删除，前面的行号不受影响
+        for first, last in reversed(contiguous_ranges(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.recording_ids[first:last + 1]
+            self.endRemoveRows()
+        self.update_proxy_rows()
+
+    def on_rows_inserted(self, parent, first, last):
+        recordings = self.sourceModel().recordings
+        self.insert_ids([rec.id for rec in recordings[first:last + 1] if self.accepts(rec)])
+
+    def on_data_changed(self, top_left, bottom_right, roles=[]):
+        # 数据变化可能改变是否显示（如分类、确认状态）；只有排序列的显示数据变化时才重新排序
+        recordings = self.sourceModel().recordings
+        inserted_ids = []
+        removed_ids = []
+        changed_rows = []
+        for rec in recordings[top_left.row():bottom_right.row() + 1]:
+            accepted = self.accepts(rec)
+            row = self.proxy_rows.get(rec.id)
+            if row is None:
+                if accepted:
+                    inserted_ids.append(rec.id)
+            elif not accepted:
+                removed_ids.append(rec.id)
+            else:
+                changed_rows.append(row)
+        first_column = top_left.column()
+        last_column = min(bottom_right.column(), self.columnCount() - 1)
+        if first_column <= last_column:
+            for first, last in contiguous_ranges(changed_rows):
+                self.dataChanged.emit(self.index(first, first_column), self.index(last, last_column), roles)
+        self.remove_ids(removed_ids)
+        self.insert_ids(inserted_ids)  # 新显示的行在这里排序
+        if changed_rows and first_column <= self.sort_column <= bottom_right.column() \
+                and (not roles or Qt.DisplayRole in roles or SORT_ROLE in roles):
+            self.schedule_resort()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self.recording_ids)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return QObject.parent(self)  # QObject.parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.recording_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        column_count = self.sourceModel().columnCount()
+        return column_count if self.column_count is None else min(column_count, self.column_count)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        source_model = self.sourceModel()
+        source_row = source_model.row_index[self.recording_ids[proxy_index.row()]]
+        return source_model.index(source_row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        rec = self.sourceModel().recordings[source_index.row()]
+        row = self.proxy_rows.get(rec.id)
+        if row is None:
+            return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        if role == Qt.DisplayRole:
+            return section + 1
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not self.show_search and role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            return None
+        return super().data(index, role)
\ No newline at end of file
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音存储
+紧凑保存大量录音：目录前缀共享、时间存为整数、分类存为编码，并维护按 ID、路径、号码的索引
+"""
+
+import itertools
+import os
+import sys
+from datetime import datetime, timedelta
+
+# 通话时间存为相对 EPOCH 的微秒数（本地时间，不带时区）
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# 路径分隔符（Windows 下两种都可能出现）
+PATH_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+ALT_SEPARATOR = os.altsep or os.sep
+
+# 分类编码；遇到新的分类名时追加
+CLASSIFICATIONS = ['待确认', '重要', '不重要']
+CLASSIFICATION_CODES = {name: code for code, name in enumerate(CLASSIFICATIONS)}
+
+def to_epoch(value):
+    return (value - EPOCH) // MICROSECOND
+
+def from_epoch(value):
+    return EPOCH + timedelta(microseconds=value)
+
+def classification_code(name):
+    code = CLASSIFICATION_CODES.get(name)
+    if code is None:
+        code = CLASSIFICATION_CODES[name] = len(CLASSIFICATIONS)
+        CLASSIFICATIONS.append(name)
+    return code
+
+def split_path(file_path):
+    # 拆成（共享的目录前缀，文件名）；前缀含末尾分隔符，两段直接拼接即为原路径
+    cut = max(file_path.rfind(os.sep), file_path.rfind(ALT_SEPARATOR)) + 1
+    return sys.intern(file_path[:cut]), file_path[cut:]
+
+class RecordingStore:
+    def __init__(self):
+        self.recordings = []
+        self.by_id = {}
+        self.by_directory = {}  # 目录前缀 -> {文件名: recording}，文件名与录音共用同一个字符串
+        self.by_phone = {}  # phone -> {id: recording}
+        self._next_id = itertools.count(1)
+
+    def __len__(self):
+        return len(self.recordings)
+
+    def add(self, recordings):
+        # 加入索引并分配 ID，返回新出现的号码
+        new_phones = []
+        for rec in recordings:
+            if rec.id is None:
+                rec.id = next(self._next_id)
+            self.by_id[rec.id] = rec
+            same_directory = self.by_directory.get(rec.directory)
+            if same_directory is None:
+                same_directory = self.by_directory[rec.directory] = {}
+            same_directory[rec.file_name] = rec
+            same_phone = self.by_phone.get(rec.phone_number)
+            if same_phone is None:
+                same_phone = self.by_phone[rec.phone_number] = {}
+                new_phones.append(rec.phone_number)
+            same_phone[rec.id] = rec
+        return new_phones
+
+    def remove(self, recordings):
+        # 从索引中移除（不改动 recordings 列表），返回不再有录音的号码
+        removed_phones = []
+        for rec in recordings:
+            self.by_id.pop(rec.id, None)
+            same_directory = self.by_directory.get(rec.directory)
+            if same_directory is not None and same_directory.get(rec.file_name) is rec:
+                del same_directory[rec.file_name]
+                if not same_directory:
+                    del self.by_directory[rec.directory]
+            same_phone = self.by_phone.get(rec.phone_number)
+            if same_phone is not None:
+                same_phone.pop(rec.id, None)
+                if not same_phone:
+                    del self.by_phone[rec.phone_number]
+                    removed_phones.append(rec.phone_number)
+        return removed_phones
+
+    def replace(self, recordings):
+        # 整体替换，返回新的号码
+        self.recordings = list(recordings)
+        self.by_id = {}
+        self.by_directory = {}
+        self.by_phone = {}
+        return self.add(self.recordings)
+
+    def get(self, recording_id):
+        return self.by_id.get(recording_id)
+
+    def get_by_path(self, file_path):
+        directory, file_name = split_path(file_path)
+        return self.by_directory.get(directory, {}).get(file_name)
+
+    def paths(self, directories=None):
+        # path -> recording；指定 directories 时只包含这些文件夹（不递归）中的录音
+        if directories is None:
+            groups = self.by_directory.items()
+        else:
+            groups = []
+            for directory in set(directories):
+                # 目录前缀保留原路径中的分隔符，每种分隔符都查一次
+                directory = directory.rstrip(''.join(PATH_SEPARATORS))
+                for prefix in set(directory + sep for sep in PATH_SEPARATORS):
+                    if prefix in self.by_directory:
+                        groups.append((prefix, self.by_directory[prefix]))
+        return {directory + file_name: rec for directory, same_directory in groups for file_name, rec in same_directory.items()}
\ No newline at end of file
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录音回收站
+删除的录音先重命名到录音文件夹下的回收站目录（同一文件系统，无需复制），
+清单记录原路径和删除时间，支持批量恢复、彻底删除和按保留天数自动清理
+"""
+
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+
+from sqlite_store import SQLiteStore
+
+TRASH_DIR_NAME = '.recording_trash'
+MANIFEST_NAME = 'manifest.db'
+RETENTION_DAYS = 30  # 回收站中超过这么多天的录音自动彻底删除
+
+class RecordingTrash(SQLiteStore):
+    TABLES = (
+        '''
+        CREATE TABLE IF NOT EXISTS trash (
+            trash_name TEXT PRIMARY KEY,
+            original_path TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            trashed_at REAL NOT NULL
+        )
+        ''',
+    )
+    WAL = False  # 清单放在录音文件夹中，可能位于不支持 WAL 的网络或同步盘上
+
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.trash_dir = os.path.join(folder_path, TRASH_DIR_NAME)
+        self.manifest_path = os.path.join(self.trash_dir, MANIFEST_NAME)
+        # 第一次写入时才创建回收站目录和清单
+        super().__init__(self.manifest_path, create=False)
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(self.trash_dir, exist_ok=True)
+        return super()._connect()
+
+    def exists(self):
+        return os.path.isfile(self.manifest_path)
+
+    def move_file(self, file_path):
+        # 把一个文件移入回收站，返回清单条目；可在多个线程中并行调用
+        os.makedirs(self.trash_dir, exist_ok=True)
+        file_size = os.path.getsize(file_path)
+        trash_name = f'{uuid.uuid4().hex}_{os.path.basename(file_path)}'
+        target = os.path.join(self.trash_dir, trash_name)
+        try:
+            os.rename(file_path, target)
+        except OSError:
+            if not os.path.exists(file_path):
+                raise
+            # 子文件夹挂载在其他文件系统上时退化为复制后删除
+            shutil.move(file_path, target)
+        return (trash_name, file_path, file_size, time.time())
+
+    def record(self, entries):
+        # 批量写入清单
+        if not entries:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO trash VALUES (?, ?, ?, ?)', entries)
+
+    def list_entries(self):
+        # [(trash_name, original_path, file_size, trashed_at)]，按删除时间倒序
+        if not self.exists():
+            return []
+        try:
+            with self._lock, self._connect() as conn:
+                return conn.execute(
+                    'SELECT trash_name, original_path, file_size, trashed_at FROM trash ORDER BY trashed_at DESC'
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def restore(self, trash_names):
+        # 批量恢复到原路径，返回 (已恢复的原路径, [(原路径, 原因)])
+        restored = []
+        failures = []
+        done_names = []
+        with self._lock, self._connect() as conn:
+            for trash_name in trash_names:
+                row = conn.execute('SELECT original_path FROM trash WHERE trash_name = ?', (trash_name,)).fetchone()
+                if row is None:
+                    continue
+                original_path = row[0]
+                source = os.path.join(self.trash_dir, trash_name)
+                if os.path.exists(original_path):
+                    failures.append((original_path, '原位置已有同名文件'))
+                    continue
+                try:
+                    os.makedirs(os.path.dirname(original_path), exist_ok=True)
+                    os.rename(source, original_path)
+                except OSError as e:
+                    if os.path.exists(source):
+                        failures.append((original_path, str(e)))
+                        continue
+                    # 回收站中的文件已不存在，只清理清单
+                else:
+                    restored.append(original_path)
+                done_names.append((trash_name,))
+            conn.executemany('DELETE FROM trash WHERE trash_name = ?', done_names)
+        return restored, failures
+
+    def purge(self, trash_names):
+        # 批量彻底删除，返回 (删除数量, [(原路径, 原因)])
+        purged = 0
+        failures = []
+        done_names = []
+        with self._lock, self._connect() as conn:
+            for trash_name in trash_names:
+                row = conn.execute('SELECT original_path FROM trash WHERE trash_name = ?', (trash_name,)).fetchone()
+                if row is None:
+                    continue
+                try:
+                    os.remove(os.path.join(self.trash_dir, trash_name))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    failures.append((row[0], str(e)))
+                    continue
+                purged += 1
+                done_names.append((trash_name,))
+            conn.executemany('DELETE FROM trash WHERE trash_name = ?', done_names)
+        return purged, failures
+
+    def purge_older_than(self, days=RETENTION_DAYS):
+        # 彻底删除在回收站中超过 days 天的录音
+        if not self.exists():
+            return 0, []
+        cutoff = time.time() - days * 86400
+        with self._lock, self._connect() as conn:
+            names = [row[0] for row in conn.execute('SELECT trash_name FROM trash WHERE trashed_at < ?', (cutoff,))]
+        return self.purge(names)
\ No newline at end of file
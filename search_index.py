@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索索引
+对号码和联系人姓名建立 n-gram 索引，支持子串搜索
+"""
+
+class SearchIndex:
+    def __init__(self, max_gram=3):
+        self.max_gram = max_gram
+        self.terms = {}  # 词条（号码或小写姓名）-> 对应的号码集合
+        self.grams = {}  # n-gram -> 包含它的词条集合
+        self.name_terms = {}  # phone -> 已索引的小写姓名
+        # 连续输入时复用上一次的结果
+        self._last_query = None
+        self._last_terms = None
+
+    def _grams(self, term):
+        grams = set()
+        for n in range(1, self.max_gram + 1):
+            for i in range(len(term) - n + 1):
+                grams.add(term[i:i + n])
+        return grams
+
+    def _add_term(self, term, phone):
+        phones = self.terms.get(term)
+        if phones is None:
+            phones = self.terms[term] = set()
+            for gram in self._grams(term):
+                self.grams.setdefault(gram, set()).add(term)
+        phones.add(phone)
+        self._last_query = None
+
+    def _remove_term(self, term, phone):
+        phones = self.terms.get(term)
+        if not phones:
+            return
+        phones.discard(phone)
+        if not phones:
+            del self.terms[term]
+            for gram in self._grams(term):
+                same_gram = self.grams.get(gram)
+                if same_gram is not None:
+                    same_gram.discard(term)
+                    if not same_gram:
+                        del self.grams[gram]
+        self._last_query = None
+
+    def add_phone(self, phone):
+        self._add_term(phone.lower(), phone)
+
+    def remove_phone(self, phone):
+        self._remove_term(phone.lower(), phone)
+
+    def set_contacts(self, contacts):
+        # 只更新姓名有变化的号码
+        names = {phone: info['name'].lower() for phone, info in contacts.items() if info.get('name')}
+        for phone, term in list(self.name_terms.items()):
+            if names.get(phone) != term:
+                self._remove_term(term, phone)
+                del self.name_terms[phone]
+        for phone, term in names.items():
+            if self.name_terms.get(phone) != term:
+                self._add_term(term, phone)
+                self.name_terms[phone] = term
+
+    def search(self, text):
+        # 返回号码或联系人姓名包含 text 的号码集合
+        query = text.lower().strip()
+        if not query:
+            return set()
+
+        if self._last_query is not None and self._last_query in query:
+            # 新查询包含上一次的查询，结果只会更少
+            candidates = self._last_terms
+        elif len(query) <= self.max_gram:
+            # 查询本身就是一个 n-gram，倒排表即为结果，无需逐个校验
+            candidates = None
+            terms = self.grams.get(query, set())
+        else:
+            posting_lists = sorted(
+                (self.grams.get(query[i:i + self.max_gram], set()) for i in range(len(query) - self.max_gram + 1)),
+                key=len,
+            )
+            candidates = set(posting_lists[0])
+            for posting_list in posting_lists[1:]:
+                if not candidates:
+                    break
+                candidates &= posting_list
+
+        if candidates is not None:
+            terms = {term for term in candidates if query in term}
+        self._last_query = query
+        self._last_terms = terms
+
+        phones = set()
+        for term in terms:
+            phones |= self.terms[term]
+        return phones
\ No newline at end of file
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话存储
+以 SQLite（WAL）保存当前会话的录音列表及分类/确认状态：每次变化追加到日志，
+定期合并到快照；下次启动直接从快照和日志恢复，不读取音频文件
+"""
+
+import sqlite3
+
+from app_paths import get_data_path
+from sqlite_store import SQLiteStore
+
+OP_UPSERT = 'upsert'
+OP_REMOVE = 'remove'
+
+RECORDING_COLUMNS = ('file_path, file_size, file_mtime, phone_number, call_time, '
+                     'duration, classification, confirmed')
+
+def recording_row(rec):
+    return (rec.file_path, rec.file_size, rec.file_mtime, rec.phone_number,
+            rec.call_time.isoformat(), rec.stored_duration, rec.classification, int(rec.confirmed))
+
+class SessionStore(SQLiteStore):
+    TABLES = (
+        'CREATE TABLE IF NOT EXISTS session_info (key TEXT PRIMARY KEY, value TEXT)',
+        '''
+        CREATE TABLE IF NOT EXISTS snapshot (
+            file_path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            file_mtime REAL NOT NULL,
+            phone_number TEXT NOT NULL,
+            call_time TEXT NOT NULL,
+            duration REAL NOT NULL,
+            classification TEXT NOT NULL,
+            confirmed INTEGER NOT NULL
+        )
+        ''',
+        # 追加日志：upsert 带完整一行，remove 只带路径
+        '''
+        CREATE TABLE IF NOT EXISTS journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            op TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_size INTEGER,
+            file_mtime REAL,
+            phone_number TEXT,
+            call_time TEXT,
+            duration REAL,
+            classification TEXT,
+            confirmed INTEGER
+        )
+        ''',
+    )
+
+    def __init__(self, db_path=None):
+        super().__init__(db_path or get_data_path('session.db'))
+        self.pending_entries = 0  # 尚未合并到快照的日志条数
+        try:
+            with self._lock, self._connect() as conn:
+                self.pending_entries = conn.execute('SELECT COUNT(*) FROM journal').fetchone()[0]
+        except sqlite3.Error:
+            pass  # 会话不可用时退化为不保存进度
+
+    def get_value(self, key):
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute('SELECT value FROM session_info WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set_value(self, key, value):
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute('INSERT OR REPLACE INTO session_info VALUES (?, ?)', (key, value))
+        except sqlite3.Error:
+            pass
+
+    def reset(self, recordings):
+        # 整体替换会话录音（新导入文件夹），直接写成快照并清空日志
+        rows = [recording_row(rec) for rec in recordings]
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute('DELETE FROM journal')
+                conn.execute('DELETE FROM snapshot')
+                conn.executemany('INSERT OR REPLACE INTO snapshot VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self.pending_entries = 0
+        except sqlite3.Error:
+            pass
+
+    def record_changes(self, recordings):
+        # 记录新增的录音或分类/确认状态的变化
+        rows = [(OP_UPSERT,) + recording_row(rec) for rec in recordings]
+        self._append(rows, 'INSERT INTO journal (op, ' + RECORDING_COLUMNS + ') VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)')
+
+    def record_removals(self, file_paths):
+        rows = [(OP_REMOVE, file_path) for file_path in file_paths]
+        self._append(rows, 'INSERT INTO journal (op, file_path) VALUES (?, ?)')
+
+    def _append(self, rows, sql):
+        if not rows:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany(sql, rows)
+                self.pending_entries += len(rows)
+        except sqlite3.Error:
+            pass  # 写入失败不影响正常使用
+
+    def _latest_journal_entries(self, conn):
+        # 每个路径只取最后一条日志：(upsert 的行, remove 的路径)
+        upserts = []
+        removals = []
+        for row in conn.execute(
+            'SELECT op, ' + RECORDING_COLUMNS + ', MAX(seq) FROM journal GROUP BY file_path'
+        ):
+            if row[0] == OP_UPSERT:
+                upserts.append(row[1:-1])
+            else:
+                removals.append((row[1],))
+        return upserts, removals
+
+    def checkpoint(self):
+        # 把日志合并到快照并清空日志
+        if not self.pending_entries:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                upserts, removals = self._latest_journal_entries(conn)
+                conn.executemany('DELETE FROM snapshot WHERE file_path = ?', removals)
+                conn.executemany('INSERT OR REPLACE INTO snapshot VALUES (?, ?, ?, ?, ?, ?, ?, ?)', upserts)
+                conn.execute('DELETE FROM journal')
+                self.pending_entries = 0
+        except sqlite3.Error:
+            pass
+
+    def load(self):
+        # 快照加上日志中的变化，返回 [(file_path, size, mtime, phone, call_time, duration, classification, confirmed)]
+        try:
+            with self._lock, self._connect() as conn:
+                snapshot_rows = conn.execute('SELECT ' + RECORDING_COLUMNS + ' FROM snapshot').fetchall()
+                upserts, removals = self._latest_journal_entries(conn)
+        except sqlite3.Error:
+            return []
+        if not upserts and not removals:
+            return snapshot_rows
+        rows = {row[0]: row for row in snapshot_rows}
+        for (file_path,) in removals:
+            rows.pop(file_path, None)
+        for row in upserts:
+            rows[row[0]] = row
+        return list(rows.values())
\ No newline at end of file
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 存储基类
+各缓存共用的连接方式：每次操作使用独立连接并由锁串行化，默认开启 WAL，第一次连接时建表
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+class SQLiteStore:
+    TABLES = ()  # 子类的建表语句
+    WAL = True
+
+    def __init__(self, db_path, create=True):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+        if create:
+            try:
+                with self._lock, self._connect():
+                    pass
+            except sqlite3.Error:
+                pass  # 数据库不可用时各操作返回空结果，调用方退化为不缓存
+
+    @contextmanager
+    def _connect(self):
+        # 每次操作使用独立连接，导入线程和界面线程均可安全调用
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                if not self._initialized:
+                    if self.WAL:
+                        conn.execute('PRAGMA journal_mode=WAL')
+                    for statement in self.TABLES:
+                        conn.execute(statement)
+                    self._initialized = True
+                yield conn
+        finally:
+            conn.close()
\ No newline at end of file